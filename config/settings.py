@@ -23,6 +23,39 @@ REQUEST_TIMEOUT = 60  # 请求超时时间（秒）
 REQUEST_DELAY = 2  # 请求间隔时间（秒）
 REQUEST_RETRY = 3  # 请求重试次数
 
+# 按主机限速配置（令牌桶，网站可在 websites.py 中通过 rate_limit 单独配置）
+RATE_LIMIT_ENABLED = True  # 是否启用按主机限速
+RATE_LIMIT_DEFAULT_RATE = 2.0  # 默认每个主机每秒请求数
+RATE_LIMIT_DEFAULT_BURST = 4  # 默认每个主机允许的突发请求数
+
+# 主机健康配置（滚动错误率熔断、Retry-After、全局重试预算）
+HOST_HEALTH_WINDOW = 20  # 统计错误率的最近请求数
+HOST_HEALTH_MIN_REQUESTS = 4  # 触发熔断所需的最少请求数
+HOST_HEALTH_ERROR_RATE = 0.75  # 触发熔断的错误率
+HOST_CIRCUIT_COOLDOWN = 120  # 熔断冷却时间（秒），连续熔断时加倍
+RETRY_AFTER_MAX = 60  # 最长遵守的 Retry-After 等待时间（秒），超过则快速失败
+RETRY_BUDGET = 40  # 每次运行的全局重试次数上限
+
+# 连接池配置
+HTTP_POOL_CONNECTIONS = 32  # 缓存的主机连接池数量
+HTTP_POOL_MAXSIZE = 16  # 每个主机连接池的最大连接数
+
+# 代理探测配置（每次运行每组代理只探测一次）
+PROXY_PROBE_URL = "https://httpbin.org/ip"  # 用于获取出口IP的探测地址
+PROXY_PROBE_TIMEOUT = 10  # 探测超时时间（秒）
+
+# 并发收集配置
+COLLECT_CONCURRENT = True  # 阶段1是否并发收集各网站链接
+COLLECT_MAX_WORKERS = 6  # 阶段1全局最大并发数
+COLLECT_PER_HOST_LIMIT = 1  # 阶段1同一主机最大并发数
+SUBSCRIPTION_CONCURRENT = True  # 阶段2是否并发获取订阅内容
+SUBSCRIPTION_FETCH_WORKERS = 8  # 阶段2订阅获取最大并发数
+SUBSCRIPTION_PER_HOST_LIMIT = 2  # 阶段2同一主机最大并发请求数
+SUBSCRIPTION_PARSE_WORKERS = os.cpu_count() or 2  # 阶段2订阅解码解析线程数
+COLLECT_PIPELINE = True  # 流水线模式：网站链接收集完成后立即解析其订阅，不等待全部网站
+SUBSCRIPTION_MAX_BYTES = 10 * 1024 * 1024  # 单个订阅下载大小上限（字节），网站可用 max_subscription_bytes 单独配置
+SUBSCRIPTION_SNIFF_BYTES = 4096  # 下载开头用于判断内容格式的字节数
+
 # 文件路径配置
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")
@@ -49,8 +82,18 @@ USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 SUPPORTED_PROTOCOLS = ["vmess", "vless", "trojan", "hysteria", "hysteria2", "ss", "ssr"]
 MIN_NODE_LENGTH = 20  # 节点最小长度
 
-# 数据库配置（如果需要）
+# 数据库配置（节点索引，相对路径以项目根目录为基准）
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///nodes.db")
+NODE_INDEX_ENABLED = True  # 是否记录节点索引（来源、出现时间和测试结果）
+NODE_INDEX_RETENTION = 30 * 24 * 3600  # 节点未再出现的最长保留时间（秒）
+
+# 增量测速配置（基于节点索引中的历史测试结果，通过 --incremental 启用）
+SPEEDTEST_REVALIDATE_WINDOW = 24 * 3600  # 在该时间内通过测试的节点只做TCP复验（秒）
+SPEEDTEST_FAILURE_THRESHOLD = 2  # 连续失败达到该次数后开始退避
+SPEEDTEST_BACKOFF_BASE = 24 * 3600  # 首次退避时间（秒），每多失败一次加倍
+SPEEDTEST_BACKOFF_MAX = 7 * 24 * 3600  # 退避时间上限（秒）
+SPEEDTEST_REVALIDATE_WORKERS = 32  # TCP复验并发数
+SPEEDTEST_REVALIDATE_TIMEOUT = 3  # TCP复验单个连接的超时时间（秒）
 
 # API配置（如果需要）
 API_ENABLED = False
@@ -63,3 +106,44 @@ DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 # 性能配置
 BATCH_SIZE = 100  # 批处理大小
 CACHE_TTL = 3600  # 缓存时间（秒）
+
+# HTTP条件请求缓存配置（ETag / Last-Modified）
+HTTP_CACHE_ENABLED = True  # 是否启用HTTP条件请求缓存
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")  # 缓存目录
+HTTP_CACHE_TTL = 7 * 24 * 3600  # 缓存条目未被校验的最长保留时间（秒）
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 缓存总大小上限（字节），超出按LRU淘汰
+
+# 订阅内容解析缓存配置（按内容哈希复用解析结果）
+PARSE_CACHE_ENABLED = True  # 是否启用解析缓存
+PARSE_CACHE_DIR = os.path.join(DATA_DIR, "parse_cache")  # 缓存目录
+PARSE_CACHE_TTL = 7 * 24 * 3600  # 条目未被访问的最长保留时间（秒）
+PARSE_CACHE_MAX_ENTRIES = 2000  # 最大缓存条目数，超出按LRU淘汰
+
+# 失效订阅链接缓存配置（跨运行记录失败的订阅链接，过期前直接跳过）
+DEAD_LINK_CACHE_ENABLED = True  # 是否启用失效链接缓存
+DEAD_LINK_CACHE_FILE = os.path.join(DATA_DIR, "dead_links.json")  # 缓存文件
+DEAD_LINK_BASE_TTL = 6 * 3600  # 首次失败后的跳过时间（秒），每多失败一次加倍
+DEAD_LINK_MAX_TTL = 7 * 24 * 3600  # 跳过时间上限（秒）
+DEAD_LINK_RETENTION = 30 * 24 * 3600  # 过期后仍未再次失败的记录保留时间（秒）
+
+# 节点域名解析配置（测速前批量解析，跳过无法解析的节点）
+DNS_CACHE_ENABLED = True  # 是否持久化解析结果
+DNS_CACHE_FILE = os.path.join(DATA_DIR, "dns_cache.json")  # 缓存文件
+DNS_CACHE_TTL = 30 * 60  # 解析成功结果的缓存时间（秒）
+DNS_NEGATIVE_TTL = 10 * 60  # 域名不存在（NXDOMAIN）结果的缓存时间（秒）
+DNS_RESOLVE_WORKERS = 32  # 并发解析线程数
+DNS_RESOLVE_TIMEOUT = 5  # 批量解析单个域名的等待上限（秒）
+
+# Clash订阅转换配置（节点较多时按块分发到进程池并行解析）
+CLASH_CONVERT_WORKERS = 0  # 进程数，0表示按CPU核数，1表示串行
+CLASH_CONVERT_CHUNK_SIZE = 500  # 每块节点数
+CLASH_CONVERT_PARALLEL_THRESHOLD = 2000  # 节点数达到该值才启用进程池
+CLASH_PROXY_CACHE_ENABLED = True  # 是否缓存节点URI的转换结果
+CLASH_PROXY_CACHE_FILE = os.path.join(DATA_DIR, "clash_proxy_cache.json")  # 缓存文件
+CLASH_PROXY_CACHE_RETENTION = 7 * 24 * 3600  # 节点未再出现的最长保留时间（秒）
+
+# 浏览器池配置（BROWSER_ONLY_SITES 使用）
+BROWSER_MAX_PAGES = 4  # 同一浏览器中同时打开的最大页面数
+# 快速加载：拦截非文档资源，DOMContentLoaded后返回，未找到链接时回退到networkidle
+BROWSER_FAST_LOAD = os.getenv("BROWSER_FAST_LOAD", "True").lower() == "true"
+BROWSER_SELECTOR_TIMEOUT = 5000  # 快速加载后等待订阅链接选择器的超时时间（毫秒），超时即回退
@@ -5,12 +5,15 @@
 """
 
 # 目标网站列表 - 配置驱动的插件架构
+# 可选 "rate_limit": {"rate": 每秒请求数, "burst": 突发请求数}，
+# 只限制对该网站主机的请求速度，未配置时使用 RATE_LIMIT_DEFAULT_RATE / RATE_LIMIT_DEFAULT_BURST
 WEBSITES = {
     "freeclashnode": {
         "name": "FreeClashNode",
         "url": "https://www.freeclashnode.com/free-node/",
         "enabled": True,
         "collector_key": "freeclashnode",  # 对应收集器插件的关键字
+        "rate_limit": {"rate": 0.5, "burst": 1},  # 同一主机限速（原随机延迟1-3秒）
         "selectors": [".post-title a", "h2 a", ".entry-title a", "article h2 a"],
         "patterns": [
             r"node\.freeclashnode\.com/uploads/\d{4}/\d{2}/[^\\s\\<]*\.(?:txt|yaml|json)"
@@ -173,6 +176,7 @@ WEBSITES = {
         "url": "https://clashgithub.com/",
         "enabled": True,
         "collector_key": "clashgithub",  # 对应收集器插件的关键字
+        "rate_limit": {"rate": 0.67, "burst": 1},  # 同一主机限速（原随机延迟1-2秒）
         "selectors": [
             "h3 a",
             ".post-title a",
@@ -199,6 +203,7 @@ WEBSITES = {
         "url": "https://oneclash.cc/freenode",
         "enabled": True,
         "collector_key": "oneclash",  # 对应收集器插件的关键字
+        "rate_limit": {"rate": 0.67, "burst": 1},  # 同一主机限速（原随机延迟1-2秒）
         "selectors": [
             ".post-title a",
             "h2 a",
@@ -220,6 +225,7 @@ WEBSITES = {
         "url": "https://www.freev2raynode.com/free-node-subscription/",
         "enabled": True,
         "collector_key": "freev2raynode",  # 对应收集器插件的关键字
+        "rate_limit": {"rate": 0.67, "burst": 1},  # 同一主机限速（原随机延迟1-2秒）
         "selectors": [".post-title a", "h2 a", ".entry-title a", "article h2 a"],
         "patterns": [
             r'https?://[^\s\'"]*\.txt[^\s\'"]*',
@@ -234,6 +240,7 @@ WEBSITES = {
         "url": "https://www.85la.com/internet-access/free-network-nodes",
         "enabled": True,
         "collector_key": "la",  # 对应收集器插件的关键字
+        "rate_limit": {"rate": 0.67, "burst": 1},  # 同一主机限速（原随机延迟1-2秒）
         "selectors": [
             ".post-title a",
             "h2 a",
@@ -348,6 +355,8 @@ BASE64_PATTERNS = [
 # 当前配置：
 # - 浏览器直连：freeclashnode, mibei77, clashnodev2ray, wanzhuanmi, cfmem, telegeam, clashnodecc
 # - 代理访问：proxyqueen, datiya, clashgithub, oneclash, freev2raynode, eighty_five_la
+# 浏览器快速加载时，首页等待网站配置中的 "selectors" 出现；
+# 文章页可在网站配置中设置可选的 "wait_selector"（CSS选择器）作为加载完成标志
 BROWSER_ONLY_SITES = [
     "freeclashnode",
     "mibei77",
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+节点扫描器基准测试
+在 data/raw 中的网页和 result 中的节点列表上，对比逐个协议 re.findall 与 NodeScanner 单次扫描的耗时，
+并校验两者输出完全一致
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# 获取项目根目录（脚本在scripts/下，所以需要往上两级）
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.websites import NODE_PATTERNS
+from src.utils.node_scanner import NodeScanner
+
+# 与 SubscriptionParser 中的节点模式一致
+PARSER_PATTERNS = [
+    r'vmess://[^\s<>"]+',
+    r'vless://[^\s<>"]+',
+    r'trojan://[^\s<>"]+',
+    r'ss://[^\s<>"]+',
+    r'ssr://[^\s<>"]+',
+    r'hysteria://[^\s<>"]+',
+    r'hysteria2://[^\s<>"]+',
+    r'socks5://[^\s<>"]+',
+    r'reality://[^\s<>"]+',
+]
+
+
+def load_corpus():
+    """加载网页和订阅内容语料"""
+    corpus = {"网页": [], "订阅": []}
+
+    for path in sorted((PROJECT_ROOT / "data" / "raw").glob("*.html")):
+        corpus["网页"].append(path.read_text(encoding="utf-8", errors="ignore"))
+
+    for path in sorted((PROJECT_ROOT / "result").rglob("*.txt")):
+        corpus["订阅"].append(path.read_text(encoding="utf-8", errors="ignore"))
+
+    return corpus
+
+
+def findall_all(patterns, text):
+    """原实现：逐个协议 findall"""
+    nodes = []
+    for pattern in patterns:
+        nodes.extend(re.findall(pattern, text, re.IGNORECASE))
+    return nodes
+
+
+def measure(func, documents, rounds):
+    """返回多轮中最快一轮的耗时（秒）"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in documents:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="节点扫描器基准测试")
+    parser.add_argument("--rounds", type=int, default=5, help="每项测试的轮数（取最快一轮）")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    pattern_sets = {"NODE_PATTERNS": NODE_PATTERNS, "解析器模式": PARSER_PATTERNS}
+
+    print(f"{'语料':<6}{'文档数':>8}{'大小(KB)':>12}{'模式':>16}{'findall(ms)':>14}{'扫描器(ms)':>14}{'加速':>8}")
+    for corpus_name, documents in corpus.items():
+        if not documents:
+            print(f"{corpus_name}: 没有可用的语料，跳过")
+            continue
+
+        size_kb = sum(len(text) for text in documents) / 1024
+        for set_name, patterns in pattern_sets.items():
+            scanner = NodeScanner.from_patterns(patterns)
+
+            # 校验输出一致
+            for text in documents:
+                if scanner.scan(text) != findall_all(patterns, text):
+                    print(f"❌ {corpus_name}/{set_name}: 扫描结果与 findall 不一致")
+                    sys.exit(1)
+
+            legacy = measure(lambda text: findall_all(patterns, text), documents, args.rounds)
+            scanned = measure(scanner.scan, documents, args.rounds)
+            print(
+                f"{corpus_name:<6}{len(documents):>8}{size_kb:>12.0f}{set_name:>16}"
+                f"{legacy * 1000:>14.1f}{scanned * 1000:>14.1f}{legacy / scanned:>7.1f}x"
+            )
+
+    print("✓ 输出一致")
+
+
+if __name__ == "__main__":
+    main()
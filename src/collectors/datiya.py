@@ -132,9 +132,9 @@ class DatiyaCollector(BaseCollector):
         """从Datiya的YAML格式提取节点"""
         nodes = []
         try:
-            import yaml
+            from src.utils import yaml_io
 
-            yaml_data = yaml.safe_load(content)
+            yaml_data = yaml_io.load(content)
 
             if "proxies" in yaml_data:
                 proxies = yaml_data["proxies"]
@@ -6,8 +6,6 @@ FreeClashNode 爬虫
 
 import re
 import base64
-import time
-import random
 from datetime import datetime
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
@@ -77,14 +75,6 @@ class FreeClashNodeCollector(BaseCollector):
             self.logger.error(f"获取最新文章URL失败: {e}")
             return None
 
-    def _make_request(self, url, method="GET", **kwargs):
-        """重写请求方法，添加随机延迟"""
-        # 添加随机延迟以模拟人类行为
-        time.sleep(random.uniform(1, 3))
-
-        # 调用父类方法
-        return super()._make_request(url, method, **kwargs)
-
     def find_subscription_links(self, content):
         """重写订阅链接查找方法，处理特殊的污染格式"""
         links = []
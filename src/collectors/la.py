@@ -5,8 +5,6 @@
 """
 
 import re
-import time
-import random
 from datetime import datetime
 from bs4 import BeautifulSoup
 from src.core.base_collector import BaseCollector
@@ -34,14 +32,6 @@ class LaCollector(BaseCollector):
             }
         )
 
-    def _make_request(self, url, method="GET", **kwargs):
-        """重写请求方法，添加随机延迟"""
-        # 添加随机延迟以模拟人类行为
-        time.sleep(random.uniform(1, 2))
-
-        # 调用父类方法
-        return super()._make_request(url, method, **kwargs)
-
     def _get_latest_article_url(self):
         """获取最新文章URL - 实现抽象方法"""
         return self.get_latest_article_url()
@@ -4,17 +4,11 @@
 OneClash 爬虫
 """
 
-import re
-import time
-import random
 from datetime import datetime
 from bs4 import BeautifulSoup
 from src.core.base_collector import BaseCollector
-from config.websites import (
-    SUBSCRIPTION_PATTERNS,
-    SUBSCRIPTION_KEYWORDS,
-    UNIVERSAL_SELECTORS,
-)
+from src.core.link_rules import get_link_rules
+from config.websites import UNIVERSAL_SELECTORS
 
 
 class OneClashCollector(BaseCollector):
@@ -34,14 +28,6 @@ class OneClashCollector(BaseCollector):
             }
         )
 
-    def _make_request(self, url, method="GET", **kwargs):
-        """重写请求方法，添加随机延迟"""
-        # 添加随机延迟以模拟人类行为
-        time.sleep(random.uniform(1, 2))
-
-        # 调用父类方法
-        return super()._make_request(url, method, **kwargs)
-
     def _get_latest_article_url(self):
         """获取最新文章URL - 实现抽象方法"""
         return self.get_latest_article_url()
@@ -129,37 +115,10 @@ class OneClashCollector(BaseCollector):
 
     def find_subscription_links(self, content):
         """查找订阅链接"""
-        links = []
-
-        # 使用特定网站的模式
-        patterns = self.site_config.get("patterns", [])
-        for pattern in patterns:
-            try:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                links.extend(matches)
-            except Exception as e:
-                self.logger.warning(f"模式匹配失败: {pattern} - {str(e)}")
-
-        # 使用通用订阅模式
-        for pattern in SUBSCRIPTION_PATTERNS:
-            try:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        links.extend(match)
-                    else:
-                        links.append(match)
-            except Exception as e:
-                self.logger.warning(f"通用模式匹配失败: {pattern} - {str(e)}")
-
-        # 在关键词附近查找
-        for keyword in SUBSCRIPTION_KEYWORDS:
-            try:
-                pattern = rf"{keyword}[^:]*[:：]\s*(https?://[^\s\n\r]+)"
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                links.extend(matches)
-            except:
-                pass
+        # 网站模式、通用订阅模式和关键词模式均已预编译
+        links = get_link_rules().find_candidate_links(
+            content, self.site_config.get("patterns", [])
+        )
 
         # 清理和去重
         cleaned_links = []
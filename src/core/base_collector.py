@@ -19,11 +19,31 @@ import urllib3
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-from playwright.sync_api import sync_playwright
-
 from config.settings import *
 from config.websites import *
+from src.core.browser_pool import get_browser_pool
+from src.core.content_sniffer import sniff_subscription
+from src.core.dead_link_cache import classify_failure, get_dead_link_cache
+from src.core.host_health import get_host_health
+from src.core.http_client import get_http_client
+from src.core.link_rules import get_link_rules
+from src.core.parse_cache import get_parse_cache
+from src.core.proxy_probe import get_proxy_probe
+from src.core.rate_limiter import get_rate_limiter
+from src.core.subscription_decoder import (
+    FORMAT_BASE64,
+    FORMAT_CLASH,
+    FORMAT_PLAIN,
+    FORMAT_URL_ENCODED,
+    SubscriptionDecoder,
+    decode_base64_text,
+)
 from src.utils.logger import get_logger
+from src.utils.node import Node
+from src.utils.node_scanner import NodeScanner
+
+# 标准节点模式的预编译扫描器（一次扫描匹配所有协议）
+NODE_SCANNER = NodeScanner.from_patterns(NODE_PATTERNS)
 
 
 class BaseCollector(ABC):
@@ -39,107 +59,40 @@ class BaseCollector(ABC):
         # 设置日志
         self.logger = get_logger(f"collector.{self.site_name}")
 
-        # 创建会话
-        self.session = requests.Session()
-
-        # 添加更真实的请求头以绕过反爬虫
-        # 在GitHub Actions环境中使用随机真实的User-Agent和更完整的请求头
-        import os
-        import random
-
-        real_user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        ]
-
-        if os.getenv("GITHUB_ACTIONS") == "true":
-            browser_ua = random.choice(real_user_agents)
-        else:
-            browser_ua = USER_AGENT
-
-        self.session.headers.update(
+        # 按嗅探格式分发的订阅解码器
+        self.subscription_decoder = SubscriptionDecoder(
             {
-                "User-Agent": browser_ua,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "none",
-                "Sec-Fetch-User": "?1",
-                "Cache-Control": "max-age=0",
-                "DNT": "1",
-                "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Windows"',
-                "sec-ch-ua-arch": '"x86"',
-                "sec-ch-ua-bitness": '"64"',
-                "sec-ch-ua-full-version": '"120.0.6099.109"',
-                "sec-ch-ua-full-version-list": '"Not_A Brand";v="8.0.0.0", "Chromium";v="120.0.6099.109", "Google Chrome";v="120.0.6099.109"',
-                "sec-ch-ua-model": '""',
-                "sec-ch-ua-platform-version": '"15.0.0"',
-            }
+                FORMAT_CLASH: self._extract_yaml_json_nodes,
+                FORMAT_BASE64: self._decode_base64_nodes,
+                FORMAT_URL_ENCODED: self._decode_url_encoded_nodes,
+                FORMAT_PLAIN: self._extract_nodes_from_text,
+            },
+            name=self.site_name,
         )
 
-        if os.getenv("GITHUB_ACTIONS") == "true":
-            import time
-            import random
-
-            time.sleep(random.uniform(2, 4))
+        # 创建会话（共享进程级连接池，请求头与代理策略由HTTP客户端统一设置）
+        site_key = self.site_config.get("collector_key", self.site_config.get("name"))
+        self.session = get_http_client().create_session(site_key)
 
-        # 禁用SSL验证（与代理使用保持一致）
-        self.session.verify = False
+        # 按主机限速（网站配置中的 rate_limit，未配置时使用默认值）
+        get_rate_limiter().configure_host(self.base_url, site_config.get("rate_limit"))
 
         # 配置代理（如果系统有设置代理）
-        import os
         from config.websites import BROWSER_ONLY_SITES
 
-        http_proxy = os.getenv("http_proxy") or os.getenv("HTTP_PROXY")
-        https_proxy = os.getenv("https_proxy") or os.getenv("HTTPS_PROXY")
-
         # 检查是否需要禁用代理（使用浏览器直连访问）
-        site_key = self.site_config.get("collector_key", self.site_config.get("name"))
         if site_key in BROWSER_ONLY_SITES:
             self.logger.info(f"⚠️ {self.site_name} 使用浏览器直连访问（禁用代理）")
-            http_proxy = None
-            https_proxy = None
 
-        # 设置session代理
+        http_proxy = self.session.proxies.get("http")
+        https_proxy = self.session.proxies.get("https")
+
         if http_proxy or https_proxy:
-            self.session.proxies = {
-                "http": http_proxy,
-                "https": https_proxy,
-            }
             self.logger.info(
                 f"✅ 已设置代理 - HTTP: {http_proxy}, HTTPS: {https_proxy}"
             )
-            # 验证代理设置
-            self.logger.info(f"当前session代理设置: {self.session.proxies}")
-
-            # 测试代理连接
-            try:
-                test_response = self.session.get(
-                    "https://httpbin.org/ip", timeout=10, verify=False
-                )
-                if test_response.status_code == 200:
-                    ip_info = test_response.json()
-                    self.logger.info(
-                        f"✅ 代理连接测试成功，当前IP: {ip_info.get('origin', 'unknown')}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"⚠️ 代理连接测试失败，状态码: {test_response.status_code}"
-                    )
-            except Exception as e:
-                self.logger.warning(f"⚠️ 代理连接测试异常: {str(e)}")
+            # 代理连通性在后台探测，同一组代理每次运行只探测一次
+            get_proxy_probe().check_async(self.session.proxies)
         else:
             self.logger.info("❌ 未检测到代理环境变量，将使用直连")
 
@@ -155,26 +108,38 @@ class BaseCollector(ABC):
         self.raw_data = ""
 
     def _make_request(self, url, method="GET", **kwargs):
-        """带重试机制的请求方法，支持代理失败时自动切换到直接连接"""
+        """带重试机制的请求方法，支持代理失败时自动切换到直接连接
+
+        重试间隔由主机健康跟踪器决定（遵守 Retry-After，否则指数退避），
+        主机熔断或本次运行的重试预算用尽时不再重试。
+        """
         last_exception = None
         using_proxy = bool(
             self.session.proxies.get("http") or self.session.proxies.get("https")
         )
-
-        import time
-        import random
+        health = get_host_health()
+        stream = kwargs.get("stream", False)
 
         for attempt in range(self.retry_count + 1):
             try:
-                if os.getenv("GITHUB_ACTIONS") == "true" and attempt > 0:
-                    time.sleep(random.uniform(1, 3))
-
-                response = self.session.request(
-                    method, url, timeout=self.timeout, verify=False, **kwargs
+                # GET请求走条件请求缓存，内容未变化时只需一次往返
+                response = get_http_client().request(
+                    self.session,
+                    method,
+                    url,
+                    timeout=self.timeout,
+                    verify=False,
+                    **kwargs,
                 )
-                response.raise_for_status()
-
-                if using_proxy and len(response.text) < 1000:
+                try:
+                    response.raise_for_status()
+                except Exception:
+                    # 释放流式响应占用的连接，避免重试期间连接池被耗尽
+                    response.close()
+                    raise
+
+                # 流式请求由调用方分块读取，不在这里读取完整内容
+                if using_proxy and not stream and len(response.text) < 1000:
                     self.logger.warning(
                         f"返回内容过短（{len(response.text)}字节），可能被拦截: {url}"
                     )
@@ -191,8 +156,6 @@ class BaseCollector(ABC):
                 self.logger.warning(
                     f"请求超时 (尝试 {attempt + 1}/{self.retry_count + 1}): {url}"
                 )
-                if attempt < self.retry_count:
-                    time.sleep(2**attempt)  # 指数退避
 
             except requests.exceptions.ConnectionError as e:
                 last_exception = e
@@ -207,21 +170,21 @@ class BaseCollector(ABC):
                     using_proxy = False
                     continue
 
-                if attempt < self.retry_count:
-                    time.sleep(2**attempt)
-
             except requests.exceptions.RequestException as e:
                 last_exception = e
                 self.logger.warning(
                     f"请求错误 (尝试 {attempt + 1}/{self.retry_count + 1}): {url}"
                 )
-                if attempt < self.retry_count:
-                    time.sleep(1)
+
+            if attempt >= self.retry_count:
+                break
+            if not health.try_consume_retry(url):
+                self.logger.warning(f"主机熔断或重试预算用尽，放弃重试: {url}")
+                break
+            time.sleep(health.get_retry_delay(url, attempt))
 
         # 所有重试都失败
-        self.logger.error(
-            f"请求失败，已重试 {self.retry_count + 1} 次: {last_exception}"
-        )
+        self.logger.error(f"请求失败，已尝试 {attempt + 1} 次: {last_exception}")
         raise last_exception
 
     def collect(self):
@@ -288,27 +251,13 @@ class BaseCollector(ABC):
 
             if site_key in BROWSER_ONLY_SITES:
                 self.logger.info(f"使用浏览器访问文章页面: {article_url}")
-                # 临时禁用代理
-                original_proxies = self.session.proxies
-                self.session.proxies = {"http": None, "https": None}
-
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(
-                        headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"]
-                    )
-                    context = browser.new_context(
-                        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        viewport={"width": 1920, "height": 1080},
-                        locale="zh-CN",
-                    )
-                    page = context.new_page()
-                    # 增加超时时间到 60 秒
-                    page.goto(article_url, wait_until="networkidle", timeout=60000)
-                    content = page.content()
-                    browser.close()
-
-                # 恢复代理设置
-                self.session.proxies = original_proxies
+                # 浏览器直连访问（不使用会话代理），共享进程级浏览器池
+                content, _ = self._load_with_browser(
+                    article_url,
+                    timeout=60000,
+                    wait_selector=self.site_config.get("wait_selector"),
+                    extract=self.find_subscription_links,
+                )
             else:
                 response = self._make_request(article_url)
                 content = response.text
@@ -447,42 +396,55 @@ class BaseCollector(ABC):
     def _fetch_with_playwright(self, target_date=None):
         """使用Playwright浏览器自动化获取页面内容（禁用代理）"""
         try:
-            self.logger.info(f"启动浏览器访问: {self.base_url} (禁用代理)")
-
-            # 临时禁用代理
-            original_proxies = self.session.proxies
-            self.session.proxies = {"http": None, "https": None}
-            self.logger.debug("临时禁用代理")
-
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"]
-                )
-                context = browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={"width": 1920, "height": 1080},
-                    locale="zh-CN",
-                )
-                page = context.new_page()
-                page.goto(self.base_url, wait_until="networkidle", timeout=30000)
-                content = page.content()
-                browser.close()
-
-            # 恢复代理设置
-            self.session.proxies = original_proxies
-            self.logger.debug("恢复代理设置")
-
-            soup = BeautifulSoup(content, "html.parser")
-            article_url = self._find_article_from_soup(soup, target_date)
+            self.logger.info(f"使用浏览器访问: {self.base_url} (禁用代理)")
+
+            _, article_url = self._load_with_browser(
+                self.base_url,
+                timeout=30000,
+                wait_selector=", ".join(self.site_config.get("selectors", [])) or None,
+                extract=lambda content: self._find_article_from_soup(
+                    BeautifulSoup(content, "html.parser"), target_date
+                ),
+            )
             return article_url
 
         except Exception as e:
             self.logger.error(f"Playwright访问失败: {str(e)}")
-            # 恢复代理设置（即使失败也要恢复）
-            if "original_proxies" in dir():
-                self.session.proxies = original_proxies
             return None
 
+    def _load_with_browser(self, url, timeout, wait_selector=None, extract=None):
+        """
+        使用浏览器池加载页面
+
+        启用快速加载时先拦截非文档资源并在DOMContentLoaded（或选择器出现）后返回，
+        未提取到目标内容时再使用 networkidle 完整加载一次。
+
+        Args:
+            url: 页面URL
+            timeout: 页面加载超时时间（毫秒）
+            wait_selector: 快速加载时等待出现的CSS选择器
+            extract: 从页面内容提取目标的函数，结果为空时触发完整加载
+
+        Returns:
+            (页面内容, 提取结果)
+        """
+        pool = get_browser_pool()
+
+        if BROWSER_FAST_LOAD:
+            try:
+                content = pool.fetch(
+                    url, timeout=timeout, fast=True, wait_selector=wait_selector
+                )
+                result = extract(content) if extract else content
+                if result:
+                    return content, result
+                self.logger.info(f"快速加载未找到目标内容，完整加载页面: {url}")
+            except Exception as e:
+                self.logger.info(f"快速加载失败，完整加载页面: {url} - {str(e)}")
+
+        content = pool.fetch(url, wait_until="networkidle", timeout=timeout)
+        return content, extract(content) if extract else content
+
     def extract_nodes_from_article(self, article_url):
         """从文章中提取节点"""
         try:
@@ -503,7 +465,6 @@ class BaseCollector(ABC):
                 self.logger.info(f"找到订阅链接: {link}")
                 sub_nodes = self.get_nodes_from_subscription(link)
                 nodes.extend(sub_nodes)
-                time.sleep(self.delay)  # 避免请求过快
 
             # 直接从页面提取节点
             direct_nodes = self.extract_direct_nodes(content)
@@ -520,37 +481,10 @@ class BaseCollector(ABC):
 
     def find_subscription_links(self, content):
         """查找订阅链接"""
-        links = []
-
-        # 使用特定网站的模式
-        patterns = self.site_config.get("patterns", [])
-        for pattern in patterns:
-            try:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                links.extend(matches)
-            except Exception as e:
-                self.logger.warning(f"模式匹配失败: {pattern} - {str(e)}")
-
-        # 使用通用订阅模式
-        for pattern in SUBSCRIPTION_PATTERNS:
-            try:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        links.extend(match)
-                    else:
-                        links.append(match)
-            except Exception as e:
-                self.logger.warning(f"通用模式匹配失败: {pattern} - {str(e)}")
-
-        # 在关键词附近查找
-        for keyword in SUBSCRIPTION_KEYWORDS:
-            try:
-                pattern = rf"{keyword}[^:]*[:：]\s*(https?://[^\s\n\r]+)"
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                links.extend(matches)
-            except:
-                pass
+        # 网站模式、通用订阅模式和关键词模式均已预编译
+        links = get_link_rules().find_candidate_links(
+            content, self.site_config.get("patterns", [])
+        )
 
         # 清理和去重
         cleaned_links = []
@@ -577,117 +511,108 @@ class BaseCollector(ABC):
 
     def get_nodes_from_subscription(self, subscription_url):
         """从订阅链接获取节点 - 支持多种编码格式"""
+        dead_links = get_dead_link_cache()
+        if dead_links.should_skip(subscription_url):
+            return []
+
         try:
             self.logger.info(f"获取订阅内容: {subscription_url}")
-            response = self._make_request(subscription_url)
-
-            content = response.text.strip()
+            response = self._make_request(subscription_url, stream=True)
+
+            # 分块读取：超过大小上限或开头不像订阅内容时提前中止
+            content = get_http_client().read_text(
+                subscription_url,
+                response,
+                max_bytes=self.site_config.get(
+                    "max_subscription_bytes", SUBSCRIPTION_MAX_BYTES
+                ),
+                validate=sniff_subscription,
+            ).strip()
 
             # 检查内容是否为空
             if not content:
                 self.logger.warning(f"订阅链接返回空内容: {subscription_url}")
+                dead_links.record_failure(subscription_url, "empty")
                 return []
 
             if len(content) < 10:  # 太短不可能是有效节点
                 self.logger.warning(
                     f"订阅链接内容过短 ({len(content)} 字符): {subscription_url}"
                 )
+                dead_links.record_failure(subscription_url, "too_short")
                 return []
 
-            # 尝试多种解析方式
-            all_nodes = []
+            # 内容相同时直接复用缓存的解析结果
+            unique_nodes = get_parse_cache().get_or_parse(
+                "collector", content, self._parse_subscription_body
+            )
 
-            # 方式1: 直接从原始内容提取
-            nodes = self._extract_nodes_from_text(content)
-            if nodes:
-                self.logger.info(f"直接解析获取到 {len(nodes)} 个节点")
-                all_nodes.extend(nodes)
+            self.logger.info(f"从订阅链接获取到 {len(unique_nodes)} 个节点")
+            if unique_nodes:
+                dead_links.record_success(subscription_url)
+            else:
+                dead_links.record_failure(subscription_url, "no_nodes")
+            return unique_nodes
 
-            # 方式2: 尝试Base64解码
-            try:
-                # 补齐base64 padding
-                padded_content = content + "=" * (-len(content) % 4)
-                decoded_content = base64.b64decode(padded_content).decode(
-                    "utf-8", errors="ignore"
-                )
-                nodes = self._extract_nodes_from_text(decoded_content)
-                if nodes:
-                    self.logger.info(f"Base64解码后获取到 {len(nodes)} 个节点")
-                    all_nodes.extend(nodes)
-            except:
-                # 不是Base64格式，跳过
-                pass
+        except Exception as e:
+            self.logger.error(f"获取订阅链接失败: {str(e)}")
+            dead_links.record_failure(subscription_url, classify_failure(e))
+            return []
 
-            # 方式3: 尝试URL解码
-            try:
-                from urllib.parse import unquote
-
-                url_decoded = unquote(content)
-                if url_decoded != content:  # 确实发生了解码
-                    nodes = self._extract_nodes_from_text(url_decoded)
-                    if nodes:
-                        self.logger.info(f"URL解码后获取到 {len(nodes)} 个节点")
-                        all_nodes.extend(nodes)
-            except:
-                pass
+    def _parse_subscription_body(self, content):
+        """嗅探订阅格式后只用对应的解码方式提取节点，失败时再回退到其他方式"""
+        all_nodes = self.subscription_decoder.decode(content)
 
-            # 方式4: 逐行分割后提取（处理某些特殊格式）
-            lines = content.split("\n")
-            for line in lines:
-                line = line.strip()
-                if not line or len(line) < 10:
-                    continue
+        # 去重
+        unique_nodes = list(set(all_nodes))
 
-                # 尝试从单行提取节点
-                nodes = self._extract_nodes_from_text(line)
-                all_nodes.extend(nodes)
+        # 过滤长度
+        unique_nodes = [node for node in unique_nodes if len(node) >= MIN_NODE_LENGTH]
 
-                # 尝试Base64解码单行
-                try:
-                    padded_line = line + "=" * (-len(line) % 4)
-                    decoded_line = base64.b64decode(padded_line).decode(
-                        "utf-8", errors="ignore"
-                    )
-                    nodes = self._extract_nodes_from_text(decoded_line)
-                    all_nodes.extend(nodes)
-                except:
-                    pass
+        self.logger.debug(
+            f"订阅内容解析获取到 {len(unique_nodes)} 个节点 (原始: {len(all_nodes)})"
+        )
+        return unique_nodes
 
-            # 方式5: 尝试解析 YAML/JSON 格式（Clash配置）
-            yaml_nodes = self._extract_yaml_json_nodes(content)
-            if yaml_nodes:
-                self.logger.info(f"YAML/JSON格式解析获取到 {len(yaml_nodes)} 个节点")
-                all_nodes.extend(yaml_nodes)
+    def _decode_base64_nodes(self, content):
+        """Base64解码后提取节点（每行单独编码时逐行解码）"""
+        lines = [line.strip() for line in content.split("\n") if line.strip()]
 
-            # 去重
-            unique_nodes = list(set(all_nodes))
+        # 整体编码后按固定宽度换行时，除最后一行外长度相同且中间没有padding
+        line_encoded = len(lines) > 1 and (
+            len({len(line) for line in lines[:-1]}) > 1
+            or any(line.endswith("=") for line in lines[:-1])
+        )
+        if not line_encoded:
+            return self._extract_nodes_from_text(decode_base64_text(content))
 
-            # 过滤长度
-            unique_nodes = [
-                node for node in unique_nodes if len(node) >= MIN_NODE_LENGTH
-            ]
+        # 部分订阅每行单独编码
+        nodes = []
+        for line in lines:
+            if len(line) < 10:
+                continue
+            try:
+                nodes.extend(self._extract_nodes_from_text(decode_base64_text(line)))
+            except Exception:
+                pass
+        return nodes
 
-            self.logger.info(
-                f"从订阅链接获取到 {len(unique_nodes)} 个节点 (原始: {len(all_nodes)})"
-            )
-            return unique_nodes
+    def _decode_url_encoded_nodes(self, content):
+        """URL解码后提取节点"""
+        from urllib.parse import unquote
 
-        except Exception as e:
-            self.logger.error(f"获取订阅链接失败: {str(e)}")
+        url_decoded = unquote(content)
+        if url_decoded == content:  # 没有发生解码
             return []
+        return self._extract_nodes_from_text(url_decoded)
 
     def _extract_nodes_from_text(self, text):
         """从文本中提取节点"""
         nodes = []
-        for pattern in NODE_PATTERNS:
-            try:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    node = match.strip()
-                    if node and len(node) >= MIN_NODE_LENGTH:
-                        nodes.append(node)
-            except Exception as e:
-                self.logger.warning(f"节点模式匹配失败: {pattern} - {str(e)}")
+        for match in NODE_SCANNER.scan(text):
+            node = match.strip()
+            if node and len(node) >= MIN_NODE_LENGTH:
+                nodes.append(node)
         return nodes
 
     def _extract_yaml_json_nodes(self, content):
@@ -695,7 +620,8 @@ class BaseCollector(ABC):
         nodes = []
         try:
             import json
-            import yaml
+
+            from src.utils import yaml_io
 
             # 首先尝试作为完整JSON解析
             try:
@@ -733,7 +659,7 @@ class BaseCollector(ABC):
             # 尝试作为YAML解析
             try:
                 self.logger.info("开始尝试YAML解析...")
-                yaml_data = yaml.safe_load(content.strip())
+                yaml_data = yaml_io.load(content.strip())
                 self.logger.info(f"YAML解析成功，数据类型: {type(yaml_data)}")
 
                 # 处理Clash配置文件格式（包含proxies字段的完整配置）
@@ -835,223 +761,16 @@ class BaseCollector(ABC):
     def _convert_clash_proxy_to_node(self, proxy):
         """将 Clash proxy 对象转换为 V2Ray 节点 URI 格式"""
         try:
-            proxy_type = proxy.get("type", "").lower()
-
-            if proxy_type == "vless":
-                return self._convert_vless_to_uri(proxy)
-            elif proxy_type == "vmess":
-                return self._convert_vmess_to_uri(proxy)
-            elif proxy_type == "trojan":
-                return self._convert_trojan_to_uri(proxy)
-            elif proxy_type == "ss":
-                return self._convert_ss_to_uri(proxy)
-            elif proxy_type in ["hysteria", "hysteria2"]:
-                return self._convert_hysteria_to_uri(proxy)
-            else:
-                self.logger.debug(f"不支持的代理类型: {proxy_type}")
+            node = Node.from_clash(proxy)
+            if node is None:
+                self.logger.debug(f"不支持的代理类型: {proxy.get('type', '')}")
                 return None
+            return node.to_uri()
 
         except Exception as e:
             self.logger.warning(f"代理转换失败: {str(e)}")
             return None
 
-    def _convert_vless_to_uri(self, proxy):
-        """转换 VLESS 配置为 URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            uuid = proxy.get("uuid", "")
-            name = proxy.get("name", "")
-            tls = proxy.get("tls", False)
-            servername = proxy.get("servername", "")
-            network = proxy.get("network", "tcp")
-            security = proxy.get("security", "")
-            encryption = proxy.get("encryption", "none")
-            client_fingerprint = proxy.get("client-fingerprint", "")
-
-            # 构建 URI
-            uri = f"vless://{uuid}@{server}:{port}"
-
-            # 构建查询参数
-            params = []
-            if network:
-                params.append(f"type={network}")
-            if security:
-                params.append(f"security={security}")
-            if encryption:
-                params.append(f"encryption={encryption}")
-            if tls:
-                params.append("security=tls")
-            if servername:
-                params.append(f"sni={servername}")
-            if client_fingerprint:
-                params.append(f"fp={client_fingerprint}")
-
-            # WebSocket 参数
-            if network == "ws" or network == "grpc":
-                ws_opts = proxy.get("ws-opts", {})
-                if ws_opts:
-                    headers = ws_opts.get("headers", {})
-                    host = headers.get("Host", "")
-                    if host:
-                        params.append(f"host={host}")
-
-                    path = ws_opts.get("path", "")
-                    if path:
-                        params.append(f"path={path}")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            # 添加名称
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.warning(f"VLESS 转换失败: {str(e)}")
-            return None
-
-    def _convert_vmess_to_uri(self, proxy):
-        """转换 VMess 配置为 URI（Base64 编码）"""
-        try:
-            import base64
-            import json
-
-            vmess_config = {
-                "v": "2",
-                "ps": proxy.get("name", ""),
-                "add": proxy.get("server", ""),
-                "port": proxy.get("port", ""),
-                "id": proxy.get("uuid", proxy.get("id", "")),
-                "aid": proxy.get("alterId", 0),
-                "net": proxy.get("network", "tcp"),
-                "type": proxy.get("cipher", "auto"),
-                "host": proxy.get("servername", ""),
-                "path": proxy.get("path", ""),
-                "tls": "tls" if proxy.get("tls") else "",
-            }
-
-            config_json = json.dumps(vmess_config)
-            config_b64 = base64.b64encode(config_json.encode()).decode()
-            uri = f"vmess://{config_b64}"
-
-            name = proxy.get("name", "")
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.warning(f"VMess 转换失败: {str(e)}")
-            return None
-
-    def _convert_trojan_to_uri(self, proxy):
-        """转换 Trojan 配置为 URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            password = proxy.get("password", "")
-            name = proxy.get("name", "")
-            sni = proxy.get("sni", proxy.get("servername", ""))
-            security = proxy.get("skip-cert-verify", "")
-
-            uri = f"trojan://{password}@{server}:{port}"
-
-            params = []
-            if sni:
-                params.append(f"sni={sni}")
-            if security:
-                params.append("allowInsecure=1")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.warning(f"Trojan 转换失败: {str(e)}")
-            return None
-
-    def _convert_ss_to_uri(self, proxy):
-        """转换 Shadowsocks 配置为 URI"""
-        try:
-            import base64
-            from urllib.parse import quote
-
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            password = proxy.get("password", "")
-            method = proxy.get("cipher", proxy.get("method", "aes-256-gcm"))
-            plugin = proxy.get("plugin", "")
-            plugin_opts = proxy.get("plugin-opts", "")
-            name = proxy.get("name", "")
-
-            # 构建 userinfo: method:password
-            userinfo = f"{method}:{password}"
-            userinfo_b64 = base64.b64encode(userinfo.encode()).decode()
-
-            uri = f"ss://{userinfo_b64}@{server}:{port}"
-
-            # 添加插件参数
-            if plugin:
-                params = f"plugin={plugin}"
-                if plugin_opts:
-                    params += f";{plugin_opts}"
-                uri += f"?{params}"
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.warning(f"SS 转换失败: {str(e)}")
-            return None
-
-    def _convert_hysteria_to_uri(self, proxy):
-        """转换 Hysteria/Hysteria2 配置为 URI"""
-        try:
-            from urllib.parse import quote
-
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            password = proxy.get("password", proxy.get("auth", ""))
-            name = proxy.get("name", "")
-            protocol = proxy.get("type", "hysteria")
-            sni = proxy.get("sni", proxy.get("servername", ""))
-            insecure = proxy.get("skip-cert-verify", False)
-
-            # URL encode password
-            password_encoded = quote(password, safe="")
-
-            if protocol == "hysteria2":
-                uri = f"hysteria2://{password_encoded}@{server}:{port}"
-            else:
-                uri = f"hysteria://{password_encoded}@{server}:{port}"
-
-            params = []
-            if sni:
-                params.append(f"sni={sni}")
-            if insecure:
-                params.append("insecure=1")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.warning(f"Hysteria 转换失败: {str(e)}")
-            return None
-
     def get_v2ray_subscription_links(self, article_url):
         """获取V2Ray订阅链接"""
         try:
@@ -1125,16 +844,11 @@ class BaseCollector(ABC):
         """直接从页面内容提取节点"""
         nodes = []
 
-        # 使用标准节点模式
-        for pattern in NODE_PATTERNS:
-            try:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    node = match.strip()
-                    if len(node) >= MIN_NODE_LENGTH:
-                        nodes.append(node)
-            except Exception as e:
-                self.logger.warning(f"节点模式匹配失败: {pattern} - {str(e)}")
+        # 使用标准节点模式（一次扫描匹配所有协议）
+        for match in NODE_SCANNER.scan(content):
+            node = match.strip()
+            if len(node) >= MIN_NODE_LENGTH:
+                nodes.append(node)
 
         # 从代码块中提取
         for selector in CODE_BLOCK_SELECTORS:
@@ -1152,8 +866,6 @@ class BaseCollector(ABC):
                 matches = re.findall(pattern, content)
                 for match in matches:
                     try:
-                        import base64
-
                         decoded = base64.b64decode(match).decode(
                             "utf-8", errors="ignore"
                         )
@@ -1173,15 +885,10 @@ class BaseCollector(ABC):
         """解析文本中的节点信息"""
         nodes = []
 
-        for pattern in NODE_PATTERNS:
-            try:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    node = match.strip()
-                    if node and len(node) >= MIN_NODE_LENGTH:
-                        nodes.append(node)
-            except Exception as e:
-                self.logger.warning(f"节点解析失败: {pattern} - {str(e)}")
+        for match in NODE_SCANNER.scan(text):
+            node = match.strip()
+            if node and len(node) >= MIN_NODE_LENGTH:
+                nodes.append(node)
 
         # 修复被错误标记为ss://的VMess节点
         nodes = self._fix_misidentified_nodes(nodes)
@@ -1196,7 +903,6 @@ class BaseCollector(ABC):
             if node.startswith("ss://"):
                 # 尝试解码并检查是否为VMess节点
                 try:
-                    import base64
                     import json
 
                     # 去掉 ss://
@@ -1352,121 +1058,8 @@ class BaseCollector(ABC):
 
     def _is_valid_url(self, url):
         """验证URL是否有效"""
-        try:
-            url_pattern = re.compile(
-                r"^https?://"
-                r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"
-                r"localhost|"
-                r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
-                r"(?::\d+)?"
-                r"(?:/?|[/?]\S+)$",
-                re.IGNORECASE,
-            )
-            return url_pattern.match(url) is not None
-        except:
-            return False
+        return get_link_rules().is_valid_url(url)
 
     def _is_valid_subscription_link(self, url):
-        """验证是否为有效的V2Ray订阅链接"""
-        try:
-            # 导入排除模式
-            from config.websites import EXCLUDED_SUBSCRIPTION_PATTERNS
-
-            # 检查是否匹配排除模式
-            for pattern in EXCLUDED_SUBSCRIPTION_PATTERNS:
-                if re.match(pattern, url, re.IGNORECASE):
-                    self.logger.debug(f"链接被排除规则过滤: {url}")
-                    return False
-
-            # 必须以订阅文件扩展名结尾，排除网页文件
-            valid_extensions = [".txt", ".yaml", ".yml", ".json", ".sub"]
-            web_extensions = [".htm", ".html", ".php", ".asp", ".jsp"]
-
-            url_lower = url.lower()
-            has_valid_ext = any(url_lower.endswith(ext) for ext in valid_extensions)
-            has_web_ext = any(url_lower.endswith(ext) for ext in web_extensions)
-
-            if not has_valid_ext or has_web_ext:
-                return False
-
-            # 对于.yaml/.yml/.json文件，更宽松的验证（因为这些通常是结构化配置文件）
-            if url_lower.endswith((".yaml", ".yml", ".json")):
-                return True
-
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url)
-            path_part = parsed.path.lower()
-
-            # 首先排除明显的非V2Ray文件（基于文件名模式，只检查路径部分）
-            non_v2ray_patterns = [
-                r".*/[^/]*clash[^/]*\.txt$",  # 排除clash相关的txt文件
-                r".*/[^/]*sing.*box[^/]*\.txt$",  # 排除sing-box相关的txt文件
-                r".*/[^/]*config[^/]*\.txt$",  # 排除config相关的txt文件
-                # 注意：yaml和yml扩展名的文件现在是允许的
-            ]
-
-            for pattern in non_v2ray_patterns:
-                if re.match(pattern, url, re.IGNORECASE):
-                    return False
-
-            # 检查URL路径中是否包含V2Ray相关关键词
-            v2ray_keywords = [
-                "v2ray",
-                "sub",
-                "subscribe",
-                "node",
-                "link",
-                "vmess",
-                "vless",
-                "trojan",
-            ]
-            has_keyword = any(keyword in path_part for keyword in v2ray_keywords)
-
-            # 如果路径中没有关键词，检查域名
-            if not has_keyword:
-                domain = parsed.netloc.lower()
-                domain_keywords = ["v2ray", "node", "sub", "vmess", "vless", "trojan"]
-                has_domain_keyword = any(
-                    keyword in domain for keyword in domain_keywords
-                )
-
-                # 如果域名也没有关键词，则检查是否为常见的节点服务域名模式
-                if not has_domain_keyword:
-                    # 常见的节点服务域名模式
-                    common_patterns = [
-                        r".*\.mibei77\.com",
-                        r".*\.freeclashnode\.com",
-                        r".*node\..*",
-                        r".*sub\..*",
-                        r".*api\..*",
-                        r".*\..*\.txt$",  # 任何包含数字和字母的.txt文件
-                    ]
-
-                    for pattern in common_patterns:
-                        if re.match(pattern, url, re.IGNORECASE):
-                            return True
-
-                    # 如果都不匹配，则认为不是V2Ray订阅
-                    return False
-
-            # 排除明显的内容转换网站
-            excluded_domains = [
-                "subconverter",
-                "subx",
-                "sub.xeton",
-                "api.v1.mk",
-                "v1.mk",
-                "raw.git",
-                "githubusercontent.com",
-                "gitlab.com",
-            ]
-            for domain in excluded_domains:
-                if domain in parsed.netloc.lower():
-                    return False
-
-            return True
-
-        except Exception as e:
-            self.logger.warning(f"验证订阅链接时出错: {url} - {str(e)}")
-            return False
+        """验证是否为有效的V2Ray订阅链接（规则预编译，结果按URL缓存）"""
+        return get_link_rules().is_valid_subscription_link(url)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Playwright浏览器池
+每次运行只启动一次Chromium，每个页面使用独立的浏览器上下文，
+支持多个线程同时通过同一个浏览器加载页面
+"""
+
+import asyncio
+import atexit
+import threading
+from typing import Dict, List, Optional, Union
+
+from playwright.async_api import async_playwright
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+BROWSER_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+BROWSER_CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "viewport": {"width": 1920, "height": 1080},
+    "locale": "zh-CN",
+}
+
+# 快速加载模式下拦截的资源类型（只需要HTML来查找文章和订阅链接）
+BLOCKED_RESOURCE_TYPES = {
+    "image",
+    "media",
+    "font",
+    "stylesheet",
+    "texttrack",
+    "manifest",
+    "eventsource",
+    "websocket",
+    "other",
+}
+
+# 快速加载模式下拦截的广告和统计脚本域名
+BLOCKED_SCRIPT_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "hm.baidu.com",
+    "cnzz.com",
+    "51.la",
+)
+
+
+class BrowserPool:
+    """
+    进程级浏览器池
+
+    Playwright异步API运行在后台线程的事件循环中，调用方线程通过
+    run_coroutine_threadsafe 提交页面加载任务，同时打开的页面数受 BROWSER_MAX_PAGES 限制。
+    """
+
+    def __init__(self, max_pages: Optional[int] = None):
+        config = get_config().base
+        self.logger = get_logger("browser_pool")
+        self.max_pages = max(1, max_pages or config.BROWSER_MAX_PAGES)
+        self.selector_timeout = config.BROWSER_SELECTOR_TIMEOUT
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # 以下对象只在事件循环线程中访问
+        self._playwright = None
+        self._browser = None
+        self._page_semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+        self.launch_count = 0
+
+    def fetch(
+        self,
+        url: str,
+        wait_until: str = "networkidle",
+        timeout: int = 60000,
+        fast: bool = False,
+        wait_selector: Optional[str] = None,
+    ) -> str:
+        """
+        在独立的浏览器上下文中加载页面并返回HTML
+
+        Args:
+            url: 页面URL
+            wait_until: 页面加载完成的判断条件（快速加载模式下忽略）
+            timeout: 页面加载超时时间（毫秒）
+            fast: 快速加载模式，拦截非文档资源并在DOMContentLoaded后返回
+            wait_selector: 快速加载模式下额外等待出现的CSS选择器
+
+        Returns:
+            页面HTML内容
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch(url, wait_until, timeout, fast, wait_selector),
+            self._ensure_loop(),
+        )
+        return future.result()
+
+    def fetch_many(
+        self,
+        urls: List[str],
+        wait_until: str = "networkidle",
+        timeout: int = 60000,
+        fast: bool = False,
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        在同一个浏览器中并发加载多个页面
+
+        Args:
+            urls: 页面URL列表
+            wait_until: 页面加载完成的判断条件（快速加载模式下忽略）
+            timeout: 单个页面加载超时时间（毫秒）
+            fast: 快速加载模式，拦截非文档资源并在DOMContentLoaded后返回
+
+        Returns:
+            URL到页面HTML的映射，加载失败的URL对应异常对象
+        """
+        if not urls:
+            return {}
+
+        async def _gather():
+            return await asyncio.gather(
+                *(self._fetch(url, wait_until, timeout, fast) for url in urls),
+                return_exceptions=True,
+            )
+
+        future = asyncio.run_coroutine_threadsafe(_gather(), self._ensure_loop())
+        return dict(zip(urls, future.result()))
+
+    def close(self):
+        """关闭浏览器并停止后台事件循环"""
+        with self._start_lock:
+            if self._loop is None:
+                return
+
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(
+                    timeout=30
+                )
+            except Exception as e:
+                self.logger.debug(f"关闭浏览器失败: {str(e)}")
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """启动后台事件循环线程（只启动一次）"""
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop,), name="browser-pool", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop):
+        """后台线程入口"""
+        asyncio.set_event_loop(loop)
+        self._page_semaphore = asyncio.Semaphore(self.max_pages)
+        self._launch_lock = asyncio.Lock()
+        loop.run_forever()
+        loop.close()
+
+    async def _get_browser(self):
+        """获取浏览器实例，首次使用或浏览器断开时启动"""
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self.logger.info(f"🌐 启动浏览器 (最大并发页面: {self.max_pages})")
+            self._browser = await self._playwright.chromium.launch(
+                headless=True, args=BROWSER_LAUNCH_ARGS
+            )
+            self.launch_count += 1
+            return self._browser
+
+    async def _fetch(
+        self,
+        url: str,
+        wait_until: str,
+        timeout: int,
+        fast: bool = False,
+        wait_selector: Optional[str] = None,
+    ) -> str:
+        """加载单个页面（在事件循环线程中执行）"""
+        async with self._page_semaphore:
+            browser = await self._get_browser()
+            context = await browser.new_context(**BROWSER_CONTEXT_OPTIONS)
+            try:
+                if fast:
+                    await context.route("**/*", self._block_non_document)
+
+                page = await context.new_page()
+                await page.goto(
+                    url,
+                    wait_until="domcontentloaded" if fast else wait_until,
+                    timeout=timeout,
+                )
+
+                if fast and wait_selector:
+                    # 选择器等待使用独立的短超时，页面没有目标链接时尽快回退
+                    try:
+                        await page.wait_for_selector(
+                            wait_selector, timeout=min(self.selector_timeout, timeout)
+                        )
+                    except Exception:
+                        # 选择器未出现时返回当前内容，由调用方决定是否回退
+                        self.logger.debug(f"等待选择器超时: {wait_selector} ({url})")
+
+                return await page.content()
+            finally:
+                await context.close()
+
+    @staticmethod
+    async def _block_non_document(route):
+        """快速加载模式的请求拦截：只放行文档、脚本和数据请求"""
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        elif request.resource_type == "script" and any(
+            host in request.url for host in BLOCKED_SCRIPT_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _shutdown(self):
+        """关闭浏览器和Playwright（在事件循环线程中执行）"""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+# 全局单例实例
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """获取浏览器池单例实例（进程退出时自动关闭浏览器）"""
+    global _browser_pool
+    if _browser_pool is None:
+        with _browser_pool_lock:
+            if _browser_pool is None:
+                _browser_pool = BrowserPool()
+                atexit.register(_browser_pool.close)
+    return _browser_pool
@@ -8,17 +8,28 @@
 import sys
 import os
 import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.config_manager import get_config
+from src.core.dead_link_cache import classify_failure, get_dead_link_cache
+from src.core.exception_handler import CircuitOpenError
+from src.core.host_health import get_host_health
+from src.core.http_cache import get_http_cache
+from src.core.node_index import get_node_index
+from src.core.parse_cache import get_parse_cache
+from src.core.subscription_decoder import get_decoder_stats
 from src.collectors import get_collector_instance, run_collector
 from src.utils.logger import get_logger
+from src.utils.fingerprint import NodeDeduplicator, deduplicate_nodes
 from src.utils.file_handler import FileHandler
 
 
@@ -32,6 +43,10 @@ class CollectorManager:
         self.collectors = {}
         self.results = {}
 
+        # 单主机并发控制
+        self._host_semaphores: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+        self._host_semaphores_lock = threading.Lock()
+
     def initialize_collectors(self, sites: Optional[List[str]] = None):
         """初始化收集器"""
         self.logger.info("初始化收集器...")
@@ -93,106 +108,175 @@ class CollectorManager:
 
         return info
 
-    def collect_all_links(self) -> Dict[str, Dict]:
+    def collect_all_links(
+        self,
+        concurrent: Optional[bool] = None,
+        known_links: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, Dict]:
         """
         阶段1：收集所有网站的文章链接和订阅链接（带重试机制）
 
+        Args:
+            concurrent: 是否并发收集，为None时使用配置 COLLECT_CONCURRENT
+            known_links: 已知的链接收集结果（增量模式），这些网站不再抓取
+
         Returns:
             链接收集结果字典
         """
-        results = {}
+        if concurrent is None:
+            concurrent = self.config_manager.base.COLLECT_CONCURRENT
+
+        known_links = known_links or {}
+        pending_collectors = {
+            site_key: collector
+            for site_key, collector in self.collectors.items()
+            if site_key not in known_links
+        }
+
+        if not concurrent or len(pending_collectors) <= 1:
+            results = dict(known_links)
+            for site_key, collector in pending_collectors.items():
+                results[site_key] = self._collect_site_links_with_retry(collector)
+            return {site_key: results[site_key] for site_key in self.collectors}
+
+        max_workers = max(1, self.config_manager.base.COLLECT_MAX_WORKERS)
+        self.logger.info(
+            f"⚡ 并发收集 {len(pending_collectors)} 个网站的链接 "
+            f"(全局并发: {max_workers}, 单主机并发: {self.config_manager.base.COLLECT_PER_HOST_LIMIT})"
+        )
+
+        results = dict(known_links)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_site = {
+                executor.submit(self._collect_site_links_limited, collector): site_key
+                for site_key, collector in pending_collectors.items()
+            }
+            for future in as_completed(future_to_site):
+                site_key = future_to_site[future]
+                try:
+                    results[site_key] = future.result()
+                except Exception as e:
+                    collector = self.collectors[site_key]
+                    self.logger.error(f"❌ {collector.site_name} 链接收集异常: {str(e)}")
+                    results[site_key] = {
+                        "name": collector.site_name,
+                        "success": False,
+                        "error": str(e),
+                    }
+
+        # 保持与收集器初始化顺序一致
+        return {site_key: results[site_key] for site_key in self.collectors}
+
+    def _get_host_semaphore(
+        self, url: str, scope: str = "collect"
+    ) -> threading.BoundedSemaphore:
+        """获取指定URL主机对应的并发信号量
+
+        Args:
+            url: 请求URL
+            scope: 并发限制范围，"collect"为阶段1，"subscription"为阶段2
+        """
+        host = urlparse(url).netloc.lower()
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.get((scope, host))
+            if semaphore is None:
+                if scope == "subscription":
+                    limit = self.config_manager.base.SUBSCRIPTION_PER_HOST_LIMIT
+                else:
+                    limit = self.config_manager.base.COLLECT_PER_HOST_LIMIT
+                semaphore = threading.BoundedSemaphore(max(1, limit))
+                self._host_semaphores[(scope, host)] = semaphore
+            return semaphore
+
+    def _collect_site_links_limited(self, collector) -> Dict:
+        """在单主机并发限制下收集单个网站的链接"""
+        with self._get_host_semaphore(collector.base_url):
+            return self._collect_site_links_with_retry(collector)
+
+    def _collect_site_links_with_retry(self, collector) -> Dict:
+        """收集单个网站的文章链接和订阅链接（带重试机制）"""
         max_retries = 3
         retry_delay = 2  # 秒
+        last_error = None
 
-        for site_key, collector in self.collectors.items():
-            success = False
-            last_error = None
+        for attempt in range(max_retries):
+            try:
+                # 只在重试时显示尝试信息
+                if attempt > 0:
+                    self.logger.info(
+                        f"📄 重新收集 {collector.site_name} 的链接... (尝试 {attempt + 1}/{max_retries})"
+                    )
+                else:
+                    self.logger.info(f"📄 收集 {collector.site_name} 的链接...")
 
-            # 重试机制
-            for attempt in range(max_retries):
-                try:
-                    # 只在重试时显示尝试信息
-                    if attempt > 0:
-                        self.logger.info(
-                            f"📄 重新收集 {collector.site_name} 的链接... (尝试 {attempt + 1}/{max_retries})"
-                        )
-                    else:
-                        self.logger.info(f"📄 收集 {collector.site_name} 的链接...")
-
-                    # 只收集链接，不解析订阅内容
-                    links_info = collector.collect_links()
-
-                    if links_info and links_info.get("subscription_links"):
-                        results[site_key] = {
-                            "name": collector.site_name,
-                            "article_url": links_info.get("article_url"),
-                            "subscription_links": links_info.get(
-                                "subscription_links", []
-                            ),
-                            "raw_data": links_info.get("raw_data"),
-                            "success": True,
-                        }
-                        self.logger.info(
-                            f"✓ {collector.site_name} 找到 {len(links_info.get('subscription_links', []))} 个订阅链接"
-                        )
-                        success = True
-                        break
-                    else:
-                        # 如果没有找到订阅链接，也可能是正常情况（网站暂时没有更新）
-                        results[site_key] = {
-                            "name": collector.site_name,
-                            "article_url": links_info.get("article_url")
-                            if links_info
-                            else None,
-                            "subscription_links": [],
-                            "raw_data": links_info.get("raw_data")
-                            if links_info
-                            else None,
-                            "success": True,  # 成功访问但没有新内容
-                        }
-                        self.logger.info(
-                            f"✓ {collector.site_name} 访问成功但未找到新订阅链接"
-                        )
-                        success = True
-                        break
+                # 只收集链接，不解析订阅内容
+                links_info = collector.collect_links()
 
-                except Exception as e:
-                    last_error = str(e)
-                    self.logger.warning(
-                        f"❌ {collector.site_name} 链接收集失败 (尝试 {attempt + 1}/{max_retries}): {last_error}"
+                if links_info and links_info.get("subscription_links"):
+                    self.logger.info(
+                        f"✓ {collector.site_name} 找到 {len(links_info.get('subscription_links', []))} 个订阅链接"
                     )
+                    return {
+                        "name": collector.site_name,
+                        "article_url": links_info.get("article_url"),
+                        "subscription_links": links_info.get("subscription_links", []),
+                        "raw_data": links_info.get("raw_data"),
+                        "success": True,
+                    }
+
+                # 如果没有找到订阅链接，也可能是正常情况（网站暂时没有更新）
+                self.logger.info(f"✓ {collector.site_name} 访问成功但未找到新订阅链接")
+                return {
+                    "name": collector.site_name,
+                    "article_url": links_info.get("article_url") if links_info else None,
+                    "subscription_links": [],
+                    "raw_data": links_info.get("raw_data") if links_info else None,
+                    "success": True,  # 成功访问但没有新内容
+                }
 
-                    # 如果不是最后一次尝试，等待后重试
-                    if attempt < max_retries - 1:
-                        self.logger.info(f"⏳ {retry_delay}秒后重试...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # 指数退避
-                    else:
-                        # 最后一次失败，记录错误
-                        results[site_key] = {
-                            "name": collector.site_name,
-                            "success": False,
-                            "error": last_error,
-                        }
-                        self.logger.error(
-                            f"❌ {collector.site_name} 链接收集最终失败: {last_error}"
-                        )
+            except Exception as e:
+                last_error = str(e)
+                self.logger.warning(
+                    f"❌ {collector.site_name} 链接收集失败 (尝试 {attempt + 1}/{max_retries}): {last_error}"
+                )
 
-        return results
+                # 如果不是最后一次尝试，等待后重试（主机熔断或重试预算用尽时放弃）
+                if attempt < max_retries - 1:
+                    health = get_host_health()
+                    if not health.try_consume_retry(collector.base_url):
+                        self.logger.warning(
+                            f"⛔ {collector.site_name} 主机熔断或重试预算用尽，放弃重试"
+                        )
+                        break
+                    delay = health.get_retry_delay(
+                        collector.base_url, attempt, base_delay=retry_delay
+                    )
+                    self.logger.info(f"⏳ {delay:.1f}秒后重试...")
+                    time.sleep(delay)
+
+        # 最后一次失败，记录错误
+        self.logger.error(f"❌ {collector.site_name} 链接收集最终失败: {last_error}")
+        return {
+            "name": collector.site_name,
+            "success": False,
+            "error": last_error,
+        }
 
     def parse_all_subscriptions(
-        self, links_results: Dict[str, Dict]
+        self, links_results: Dict[str, Dict], concurrent: Optional[bool] = None
     ) -> Dict[str, Dict]:
         """
         阶段2：统一解析所有订阅链接
 
         Args:
             links_results: 阶段1的链接收集结果
+            concurrent: 是否并发获取订阅，为None时使用配置 SUBSCRIPTION_CONCURRENT
 
         Returns:
             最终的节点收集结果
         """
-        final_results = {}
+        if concurrent is None:
+            concurrent = self.config_manager.base.SUBSCRIPTION_CONCURRENT
 
         # 收集所有订阅链接进行统一解析
         all_subscription_links = []
@@ -212,48 +296,323 @@ class CollectorManager:
         )
 
         # 解析所有订阅链接（带容错机制）
+        if concurrent and len(all_subscription_links) > 1:
+            outcomes = self._parse_subscriptions_concurrently(all_subscription_links)
+        else:
+            outcomes = self._parse_subscriptions_serially(all_subscription_links)
+
+        self._log_parse_cache_stats()
+        self._log_decoder_stats()
+
+        return self._merge_subscription_outcomes(
+            links_results, all_subscription_links, outcomes
+        )
+
+    def _parse_subscriptions_serially(self, link_infos: List[Dict]) -> List:
+        """逐个获取并解析订阅链接，返回与输入顺序一致的结果列表"""
+        outcomes = []
+        for link_info in link_infos:
+            try:
+                self.logger.debug(
+                    f"解析 {link_info['site_name']}: {link_info['link'][:50]}..."
+                )
+                outcomes.append(
+                    self._parse_single_subscription_with_retry(link_info["link"])
+                )
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def _parse_subscriptions_concurrently(self, link_infos: List[Dict]) -> List:
+        """
+        并发获取订阅内容，并将解码解析交给独立的线程池
+
+        网络获取受全局并发数和单主机并发数限制，获取完成的内容立即提交到解析池，
+        慢速主机不会阻塞其他订阅的解析。
+
+        Returns:
+            与输入顺序一致的结果列表，元素为节点列表或异常
+        """
+        self.logger.info(
+            f"⚡ 并发获取 {len(link_infos)} 个订阅 (获取并发: {self.config_manager.base.SUBSCRIPTION_FETCH_WORKERS}, "
+            f"单主机并发: {self.config_manager.base.SUBSCRIPTION_PER_HOST_LIMIT}, 解析并发: {self.config_manager.base.SUBSCRIPTION_PARSE_WORKERS})"
+        )
+        _, _, outcomes = self._run_subscription_pipeline(link_infos=link_infos)
+        return outcomes
+
+    def _run_subscription_pipeline(
+        self,
+        link_infos: Optional[List[Dict]] = None,
+        collect_links: bool = False,
+        known_links: Optional[Dict[str, Dict]] = None,
+    ) -> Tuple[Dict[str, Dict], List[Dict], List]:
+        """
+        链接收集 → 订阅获取 → 订阅解析 流水线
+
+        三个阶段各自使用独立的线程池，任一任务完成后立即把后续任务提交到下一阶段。
+        collect_links 为True时同时运行阶段1，每个网站收集完成后其订阅链接立即进入获取队列，
+        慢速网站不会阻塞其他网站的订阅解析。
+
+        Args:
+            link_infos: 已收集的订阅链接信息（collect_links 为False时使用）
+            collect_links: 是否在流水线中收集各网站链接
+            known_links: 已知的链接收集结果（增量模式），这些网站不再抓取，直接获取订阅
+
+        Returns:
+            (链接收集结果, 订阅链接信息列表, 与链接信息顺序一致的解析结果列表)
+        """
+        from src.core.subscription_parser import get_subscription_parser
+
+        parser = get_subscription_parser()
+        base = self.config_manager.base
+
+        links_results: Dict[str, Dict] = {}
+        # 每个条目: [排序键, 链接信息, 解析结果]
+        entries: List[List] = []
+        for index, link_info in enumerate(link_infos or []):
+            entries.append([(0, index), link_info, []])
+
+        site_order = {site_key: pos for pos, site_key in enumerate(self.collectors)}
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, base.COLLECT_MAX_WORKERS), thread_name_prefix="collect"
+        ) as collect_pool, ThreadPoolExecutor(
+            max_workers=max(1, base.SUBSCRIPTION_FETCH_WORKERS),
+            thread_name_prefix="sub-fetch",
+        ) as fetch_pool, ThreadPoolExecutor(
+            max_workers=max(1, base.SUBSCRIPTION_PARSE_WORKERS),
+            thread_name_prefix="sub-parse",
+        ) as parse_pool:
+            # future -> (阶段, 网站关键字或条目)
+            pending = {}
+
+            def submit_fetch(entry):
+                future = fetch_pool.submit(
+                    self._fetch_subscription_limited, parser, entry[1]["link"]
+                )
+                pending[future] = ("fetch", entry)
+
+            def submit_site_links(site_key, site_data):
+                links_results[site_key] = site_data
+                if not site_data.get("success"):
+                    return
+                for pos, link in enumerate(site_data.get("subscription_links", [])):
+                    entry = [
+                        (site_order[site_key], pos),
+                        {
+                            "site_key": site_key,
+                            "link": link,
+                            "site_name": site_data["name"],
+                        },
+                        [],
+                    ]
+                    entries.append(entry)
+                    submit_fetch(entry)
+
+            for entry in entries:
+                submit_fetch(entry)
+
+            if collect_links:
+                for site_key, collector in self.collectors.items():
+                    if known_links and site_key in known_links:
+                        submit_site_links(site_key, known_links[site_key])
+                        continue
+                    future = collect_pool.submit(
+                        self._collect_site_links_limited, collector
+                    )
+                    pending[future] = ("collect", site_key)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, target = pending.pop(future)
+
+                    if stage == "collect":
+                        collector = self.collectors[target]
+                        try:
+                            site_data = future.result()
+                        except Exception as e:
+                            self.logger.error(
+                                f"❌ {collector.site_name} 链接收集异常: {str(e)}"
+                            )
+                            site_data = {
+                                "name": collector.site_name,
+                                "success": False,
+                                "error": str(e),
+                            }
+                        submit_site_links(target, site_data)
+
+                    elif stage == "fetch":
+                        try:
+                            content = future.result()
+                        except Exception as e:
+                            target[2] = e
+                            continue
+
+                        if content is not None:
+                            parse_future = parse_pool.submit(
+                                parser.parse_subscription_content,
+                                target[1]["link"],
+                                content,
+                            )
+                            pending[parse_future] = ("parse", target)
+
+                    else:
+                        try:
+                            target[2] = future.result()
+                        except Exception as e:
+                            target[2] = e
+
+        # 按网站顺序和链接顺序排列，结果与两阶段模式一致
+        entries.sort(key=lambda entry: entry[0])
+        if collect_links:
+            links_results = {
+                site_key: links_results[site_key] for site_key in self.collectors
+            }
+
+        return (
+            links_results,
+            [entry[1] for entry in entries],
+            [entry[2] for entry in entries],
+        )
+
+    def collect_and_parse_pipelined(
+        self, known_links: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Dict]:
+        """
+        流水线模式：链接收集与订阅解析重叠执行
+
+        每个网站的 collect_links() 返回后，其订阅链接立即交给获取/解析线程池，
+        总耗时接近最慢网站的耗时，而不是两个阶段耗时之和。
+
+        Args:
+            known_links: 已知的链接收集结果（增量模式），这些网站不再抓取
+
+        Returns:
+            与 parse_all_subscriptions 格式一致的最终结果字典
+        """
+        base = self.config_manager.base
+        self.logger.info(
+            f"⚡ 流水线收集 {len(self.collectors)} 个网站 (收集并发: {base.COLLECT_MAX_WORKERS}, "
+            f"获取并发: {base.SUBSCRIPTION_FETCH_WORKERS}, 解析并发: {base.SUBSCRIPTION_PARSE_WORKERS})"
+        )
+
+        links_results, link_infos, outcomes = self._run_subscription_pipeline(
+            collect_links=True, known_links=known_links
+        )
+
+        self.logger.info(f"🔍 共收集并解析 {len(link_infos)} 个订阅链接")
+        self._log_parse_cache_stats()
+        self._log_decoder_stats()
+
+        return self._merge_subscription_outcomes(links_results, link_infos, outcomes)
+
+    def _log_parse_cache_stats(self):
+        """输出解析缓存命中统计"""
+        cache_stats = get_parse_cache().get_stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            self.logger.info(
+                f"📦 解析缓存: 命中 {cache_stats['hits']} / 未命中 {cache_stats['misses']} "
+                f"(命中率 {cache_stats['hit_rate']:.1f}%)"
+            )
+
+    def _log_decoder_stats(self):
+        """输出订阅格式嗅探和各格式解码耗时统计"""
+        decoder_summary = get_decoder_stats().get_summary()
+        if not decoder_summary["formats"]:
+            return
+        format_stats = ", ".join(
+            f"{format_name} 嗅探{stats['sniffed']}/解码{stats['calls']}/成功{stats['successes']} "
+            f"{stats['seconds'] * 1000:.0f}ms"
+            for format_name, stats in decoder_summary["formats"].items()
+        )
+        self.logger.info(
+            f"🧩 订阅格式: {format_stats}, 回退成功 {decoder_summary['fallbacks']} 次"
+        )
+
+    def _fetch_subscription_limited(self, parser, subscription_url: str) -> Optional[str]:
+        """在单主机并发限制下获取订阅内容（带重试机制，重试耗尽后记录失败并抛出异常）"""
+        max_retries = 2
+        retry_delay = 1
+
+        with self._get_host_semaphore(subscription_url, scope="subscription"):
+            for attempt in range(max_retries):
+                try:
+                    return parser.fetch_subscription(subscription_url, raise_errors=True)
+                except Exception as e:
+                    if attempt < max_retries - 1 and self._should_retry(
+                        subscription_url, e
+                    ):
+                        self.logger.debug(f"获取重试 (尝试 {attempt + 1}): {str(e)}")
+                        time.sleep(
+                            get_host_health().get_retry_delay(
+                                subscription_url, attempt, base_delay=retry_delay
+                            )
+                        )
+                    else:
+                        parser.record_fetch_failure(subscription_url, e)
+                        raise e
+
+        return None
+
+    def _should_retry(self, url: str, error: Exception) -> bool:
+        """
+        熔断的主机和明确不存在的链接（除408/429以外的4xx）不重试，其余失败在重试预算内重试
+
+        获取订阅时 fetch_subscription(raise_errors=True) 抛出的HTTP错误在这里判断
+        """
+        if isinstance(error, CircuitOpenError):
+            return False
+        failure_class = classify_failure(error)
+        if (
+            failure_class
+            and failure_class.startswith("http_4")
+            and failure_class not in ("http_408", "http_429")
+        ):
+            return False
+        return get_host_health().try_consume_retry(url)
+
+    def _merge_subscription_outcomes(
+        self,
+        links_results: Dict[str, Dict],
+        link_infos: List[Dict],
+        outcomes: List,
+    ) -> Dict[str, Dict]:
+        """按网站聚合订阅解析结果并去重"""
+        final_results = {}
         parsed_nodes = {}
+        index_records = []
         failed_links = 0
-        total_parsed = 0
 
-        for link_info in all_subscription_links:
+        for link_info, outcome in zip(link_infos, outcomes):
             site_key = link_info["site_key"]
             link = link_info["link"]
             site_name = link_info["site_name"]
 
-            try:
-                self.logger.debug(f"解析 {site_name}: {link[:50]}...")
-                nodes = self._parse_single_subscription_with_retry(link)
-
-                if nodes:  # 只记录有内容的解析结果
-                    if site_key not in parsed_nodes:
-                        parsed_nodes[site_key] = []
-                    parsed_nodes[site_key].extend(nodes)
-                    total_parsed += len(nodes)
-                    self.logger.debug(f"✓ {site_name} 解析成功: {len(nodes)} 个节点")
-                else:
-                    self.logger.debug(f"⚠️ {site_name} 解析为空: {link[:50]}...")
-
-            except Exception as e:
+            if isinstance(outcome, Exception):
                 failed_links += 1
                 self.logger.warning(
-                    f"❌ 订阅链接解析失败 {site_name}: {link[:50]}... - {str(e)}"
+                    f"❌ 订阅链接解析失败 {site_name}: {link[:50]}... - {str(outcome)}"
                 )
+            elif outcome:  # 只记录有内容的解析结果
+                parsed_nodes.setdefault(site_key, []).extend(outcome)
+                index_records.extend((node, site_key, link) for node in outcome)
+                self.logger.debug(f"✓ {site_name} 解析成功: {len(outcome)} 个节点")
+            else:
+                self.logger.debug(f"⚠️ {site_name} 解析为空: {link[:50]}...")
 
         if failed_links > 0:
-            success_rate = (
-                (len(all_subscription_links) - failed_links)
-                / len(all_subscription_links)
-                * 100
-            )
+            success_rate = (len(link_infos) - failed_links) / len(link_infos) * 100
             self.logger.info(
-                f"📊 解析完成: {len(all_subscription_links) - failed_links}/{len(all_subscription_links)} 成功 ({success_rate:.1f}%)"
+                f"📊 解析完成: {len(link_infos) - failed_links}/{len(link_infos)} 成功 ({success_rate:.1f}%)"
             )
 
+        self._update_node_index(index_records)
+
         # 合并结果
         for site_key, site_data in links_results.items():
             nodes = parsed_nodes.get(site_key, [])
-            # 高级去重（基于server:port）
+            # 高级去重（基于节点指纹）
             unique_nodes = self._deduplicate_nodes_advanced(nodes)
 
             final_results[site_key] = {
@@ -273,51 +632,53 @@ class CollectorManager:
 
         return final_results
 
+    def _update_node_index(self, records: List[Tuple[str, str, str]]):
+        """将本次解析到的节点（含来源网站和订阅链接）批量写入节点索引"""
+        node_index = get_node_index()
+        if not records or not node_index.enabled:
+            return
+
+        result = node_index.upsert_nodes(records)
+        pruned = node_index.prune()
+        self.logger.info(
+            f"🗂️ 节点索引: 新节点 {result['inserted']} 个，已知节点 {result['updated']} 个"
+            + (f"，清理过期节点 {pruned} 个" if pruned else "")
+        )
+
     def _deduplicate_nodes_advanced(self, nodes: List[str]) -> List[str]:
-        """高级去重：基于server:port组合去重"""
+        """高级去重：基于节点指纹去重"""
         return self._deduplicate_nodes(nodes)
 
     def _parse_single_subscription_with_retry(self, subscription_url: str) -> List[str]:
-        """解析单个订阅链接（带重试机制）"""
-        max_retries = 2
-        retry_delay = 1
-
-        for attempt in range(max_retries):
-            try:
-                from src.core.subscription_parser import SubscriptionParser
-
-                parser = SubscriptionParser()
-                nodes = parser.parse_subscription_url(subscription_url)
+        """解析单个订阅链接（获取阶段带重试机制）"""
+        from src.core.subscription_parser import get_subscription_parser
 
-                # 验证解析结果
-                if nodes and isinstance(nodes, list):
-                    return nodes
-                else:
-                    self.logger.debug(
-                        f"解析结果无效 (尝试 {attempt + 1}): {type(nodes)}"
-                    )
-                    return []
+        parser = get_subscription_parser()
+        content = self._fetch_subscription_limited(parser, subscription_url)
+        if content is None:
+            return []
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.logger.debug(f"解析重试 (尝试 {attempt + 1}): {str(e)}")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    raise e
+        nodes = parser.parse_subscription_content(subscription_url, content)
 
+        # 验证解析结果
+        if nodes and isinstance(nodes, list):
+            return nodes
+        self.logger.debug(f"解析结果无效: {type(nodes)}")
         return []
 
     def _parse_single_subscription(self, subscription_url: str) -> List[str]:
         """解析单个订阅链接（兼容旧接口）"""
         return self._parse_single_subscription_with_retry(subscription_url)
 
-    def collect_all_sites(self, sites: Optional[List[str]] = None) -> Dict[str, Dict]:
+    def collect_all_sites(
+        self, sites: Optional[List[str]] = None, incremental: bool = False
+    ) -> Dict[str, Dict]:
         """
         收集所有网站的节点（两阶段流程）
 
         Args:
             sites: 指定要收集的网站列表，为None时收集所有启用网站
+            incremental: 增量模式，今日已记录文章和订阅链接的网站跳过抓取，只重新获取订阅内容
 
         Returns:
             收集结果字典
@@ -331,21 +692,110 @@ class CollectorManager:
             self.logger.error("没有可用的收集器")
             return {}
 
-        # 阶段1：收集所有链接（文章URL和订阅链接）
-        self.logger.info("📋 阶段1：收集文章链接和订阅链接...")
-        links_results = self.collect_all_links()
+        known_links = self.load_known_links() if incremental else {}
+
+        if self.config_manager.base.COLLECT_PIPELINE:
+            # 流水线模式：网站链接收集完成后立即解析其订阅链接
+            self.logger.info("📋 流水线模式：收集链接的同时解析订阅...")
+            final_results = self.collect_and_parse_pipelined(known_links)
+        else:
+            # 阶段1：收集所有链接（文章URL和订阅链接）
+            self.logger.info("📋 阶段1：收集文章链接和订阅链接...")
+            links_results = self.collect_all_links(known_links=known_links)
 
-        # 阶段2：统一解析所有订阅链接
-        self.logger.info("🔍 阶段2：统一解析订阅链接...")
-        final_results = self.parse_all_subscriptions(links_results)
+            # 阶段2：统一解析所有订阅链接
+            self.logger.info("🔍 阶段2：统一解析订阅链接...")
+            final_results = self.parse_all_subscriptions(links_results)
 
         total_nodes = sum(
             len(result.get("nodes", [])) for result in final_results.values()
         )
         self.logger.info(f"所有网站收集完成，共获取 {total_nodes} 个节点")
 
+        health_summary = get_host_health().get_summary()
+        if health_summary["retries_used"] or health_summary["tripped_hosts"]:
+            self.logger.info(
+                f"🩺 主机健康: 重试 {health_summary['retries_used']}/{health_summary['retry_budget']} 次, "
+                f"熔断主机 {len(health_summary['tripped_hosts'])} 个"
+                + (
+                    f" ({', '.join(health_summary['tripped_hosts'])})"
+                    if health_summary["tripped_hosts"]
+                    else ""
+                )
+            )
+
+        self._log_http_cache_stats()
+        self._log_dead_link_summary()
+
         return final_results
 
+    def _log_http_cache_stats(self):
+        """输出HTTP校验缓存统计（304复用次数和节省的流量）"""
+        cache_stats = get_http_cache().get_stats()
+        if cache_stats["revalidated"] or cache_stats["stored"] or cache_stats["evicted"]:
+            self.logger.info(
+                f"🗄️ HTTP缓存: 304复用 {cache_stats['revalidated']} 次, "
+                f"节省 {cache_stats['bytes_saved'] / 1024:.1f} KB, "
+                f"新缓存 {cache_stats['stored']} 个, 淘汰 {cache_stats['evicted']} 个, "
+                f"共缓存 {cache_stats['cached']} 个 ({cache_stats['cached_bytes'] / 1024:.1f} KB)"
+            )
+
+    def _log_dead_link_summary(self):
+        """输出失效订阅链接统计并保存缓存"""
+        dead_links = get_dead_link_cache()
+        dead_summary = dead_links.get_summary()
+        if dead_summary["skipped"] or dead_summary["revived"] or dead_summary["failed"]:
+            failure_classes = ", ".join(
+                f"{failure_class} {count}"
+                for failure_class, count in sorted(dead_summary["failure_classes"].items())
+            )
+            self.logger.info(
+                f"💀 失效订阅: 跳过 {dead_summary['skipped']} 个, 恢复 {dead_summary['revived']} 个, "
+                f"本次失败 {dead_summary['failed']} 个"
+                + (f" ({failure_classes})" if failure_classes else "")
+                + f", 共记录 {dead_summary['tracked']} 个"
+            )
+        dead_links.flush()
+
+    def load_known_links(self, date_suffix: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        加载今日已记录的文章链接和订阅链接（增量模式）
+
+        Args:
+            date_suffix: 日期目录（YYYYMMDD），为None时使用今天
+
+        Returns:
+            与链接收集结果格式一致的字典，只包含文章和订阅链接都已记录的网站
+        """
+        date_suffix = date_suffix or datetime.now().strftime("%Y%m%d")
+        articles = self.file_handler.load_existing_articles(date_suffix)
+        subscriptions = self.file_handler.load_existing_subscriptions(date_suffix)
+
+        known_links = {}
+        for site_key, collector in self.collectors.items():
+            article_url = articles.get(collector.site_name)
+            if not article_url:
+                continue
+            links = subscriptions.get(f"{collector.site_name}_{article_url}")
+            if not links:
+                continue
+
+            known_links[site_key] = {
+                "name": collector.site_name,
+                "article_url": article_url,
+                "subscription_links": links,
+                "raw_data": None,
+                "success": True,
+            }
+            self.logger.info(
+                f"⏭️ {collector.site_name} 今日链接已记录，跳过抓取 ({len(links)} 个订阅链接)"
+            )
+
+        self.logger.info(
+            f"📋 增量模式：{len(known_links)}/{len(self.collectors)} 个网站复用今日记录"
+        )
+        return known_links
+
     def run_single_collector(self, site_key: str) -> Tuple[bool, List[str]]:
         """运行单个收集器"""
         if site_key not in self.collectors:
@@ -397,6 +847,7 @@ class CollectorManager:
         start_time = time.time()
 
         all_nodes = []
+        deduplicator = NodeDeduplicator()
         success_count = 0
         total_count = len(self.collectors)
 
@@ -409,13 +860,10 @@ class CollectorManager:
             if success:
                 success_count += 1
                 all_nodes.extend(nodes)
-
-            # 请求间隔
-            if i < total_count:
-                time.sleep(self.config_manager.base.REQUEST_DELAY)
+                deduplicator.add_many(nodes, site_key)
 
         # 去重节点
-        unique_nodes = self._deduplicate_nodes(all_nodes)
+        unique_nodes = deduplicator.nodes
 
         # 统计结果
         duration = time.time() - start_time
@@ -429,55 +877,26 @@ class CollectorManager:
         self.logger.info(f"原始节点数: {len(all_nodes)}")
         self.logger.info(f"去重节点数: {len(unique_nodes)}")
         self.logger.info(f"重复节点数: {duplicate_count}")
+        self._log_duplicate_report(deduplicator)
         self.logger.info(f"总耗时: {duration:.2f}s")
         self.logger.info("=" * 50)
 
         return {site_key: self.results[site_key]["nodes"] for site_key in self.results}
 
     def _deduplicate_nodes(self, nodes: List[str]) -> List[str]:
-        """去重节点，基于server:port组合"""
-        if not nodes:
-            return []
-
-        seen = set()
-        unique_nodes = []
+        """去重节点，基于节点指纹（地址、凭据和传输配置，忽略备注）"""
+        return deduplicate_nodes(nodes)
 
-        for node in nodes:
-            server_port = self._extract_server_port(node)
-            if server_port and server_port not in seen:
-                seen.add(server_port)
-                unique_nodes.append(node)
-
-        return unique_nodes
-
-    def _extract_server_port(self, node: str) -> Optional[str]:
-        """从节点中提取server:port作为唯一标识"""
-        try:
-            if "://" not in node:
-                return None
-
-            protocol = node.split("://", 1)[0]
-            rest = node.split("://", 1)[1]
-
-            # 移除名称部分
-            if "#" in rest:
-                rest = rest.rsplit("#", 1)[0]
-
-            # 提取server:port
-            if "@" in rest:
-                rest = rest.split("@", 1)[1]
-
-            if ":" in rest:
-                parts = rest.split(":")
-                if len(parts) >= 2:
-                    server = parts[0]
-                    port = parts[1].split("?")[0].split("/")[0].rstrip("/")
-                    return f"{server}:{port}"
-
-        except Exception:
-            pass
-
-        return None
+    def _log_duplicate_report(self, deduplicator: NodeDeduplicator):
+        """记录各网站贡献的重复节点数"""
+        names = {
+            site_key: collector.site_name for site_key, collector in self.collectors.items()
+        }
+        lines = deduplicator.format_report(names)
+        if lines:
+            self.logger.info("📑 重复节点来源:")
+            for line in lines:
+                self.logger.info(f"  {line}")
 
     def get_results_summary(self) -> Dict:
         """获取收集结果摘要"""
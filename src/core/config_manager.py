@@ -41,15 +41,60 @@ class BaseConfig:
         self.REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
         self.REQUEST_DELAY = int(os.getenv("REQUEST_DELAY", "2"))
         self.REQUEST_RETRY = int(os.getenv("REQUEST_RETRY", "3"))
+        self.RATE_LIMIT_ENABLED = (
+            os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+        )
+        self.RATE_LIMIT_DEFAULT_RATE = float(os.getenv("RATE_LIMIT_DEFAULT_RATE", "2.0"))
+        self.RATE_LIMIT_DEFAULT_BURST = int(os.getenv("RATE_LIMIT_DEFAULT_BURST", "4"))
+
+        # 主机健康配置（滚动错误率熔断、Retry-After、全局重试预算）
+        self.HOST_HEALTH_WINDOW = int(os.getenv("HOST_HEALTH_WINDOW", "20"))
+        self.HOST_HEALTH_MIN_REQUESTS = int(os.getenv("HOST_HEALTH_MIN_REQUESTS", "4"))
+        self.HOST_HEALTH_ERROR_RATE = float(os.getenv("HOST_HEALTH_ERROR_RATE", "0.75"))
+        self.HOST_CIRCUIT_COOLDOWN = int(os.getenv("HOST_CIRCUIT_COOLDOWN", "120"))
+        self.RETRY_AFTER_MAX = int(os.getenv("RETRY_AFTER_MAX", "60"))
+        self.RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "40"))
         self.USER_AGENT = os.getenv(
             "USER_AGENT",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         )
 
+        # 连接池配置
+        self.HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "32"))
+        self.HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+        # 代理探测配置（每次运行每组代理只探测一次）
+        self.PROXY_PROBE_URL = os.getenv("PROXY_PROBE_URL", "https://httpbin.org/ip")
+        self.PROXY_PROBE_TIMEOUT = int(os.getenv("PROXY_PROBE_TIMEOUT", "10"))
+
         # 测试配置
         self.CONNECTION_TIMEOUT = int(os.getenv("CONNECTION_TIMEOUT", "5"))
         self.MAX_WORKERS = int(os.getenv("MAX_WORKERS", "10"))
 
+        # 并发收集配置
+        self.COLLECT_CONCURRENT = (
+            os.getenv("COLLECT_CONCURRENT", "True").lower() == "true"
+        )
+        self.COLLECT_MAX_WORKERS = int(os.getenv("COLLECT_MAX_WORKERS", "6"))
+        self.COLLECT_PER_HOST_LIMIT = int(os.getenv("COLLECT_PER_HOST_LIMIT", "1"))
+        self.SUBSCRIPTION_CONCURRENT = (
+            os.getenv("SUBSCRIPTION_CONCURRENT", "True").lower() == "true"
+        )
+        self.SUBSCRIPTION_FETCH_WORKERS = int(
+            os.getenv("SUBSCRIPTION_FETCH_WORKERS", "8")
+        )
+        self.SUBSCRIPTION_PER_HOST_LIMIT = int(
+            os.getenv("SUBSCRIPTION_PER_HOST_LIMIT", "2")
+        )
+        self.SUBSCRIPTION_PARSE_WORKERS = int(
+            os.getenv("SUBSCRIPTION_PARSE_WORKERS", str(os.cpu_count() or 2))
+        )
+        self.COLLECT_PIPELINE = os.getenv("COLLECT_PIPELINE", "True").lower() == "true"
+        self.SUBSCRIPTION_MAX_BYTES = int(
+            os.getenv("SUBSCRIPTION_MAX_BYTES", str(10 * 1024 * 1024))
+        )
+        self.SUBSCRIPTION_SNIFF_BYTES = int(os.getenv("SUBSCRIPTION_SNIFF_BYTES", "4096"))
+
         # 文件路径配置
         self.DATA_DIR = self.PROJECT_ROOT / "data"
         self.RAW_DATA_DIR = self.DATA_DIR / "raw"
@@ -86,6 +131,74 @@ class BaseConfig:
         self.BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))
         self.CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
 
+        # HTTP条件请求缓存配置（ETag / Last-Modified）
+        self.HTTP_CACHE_ENABLED = (
+            os.getenv("HTTP_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.HTTP_CACHE_DIR = self.DATA_DIR / "http_cache"
+        self.HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", str(7 * 24 * 3600)))
+        self.HTTP_CACHE_MAX_BYTES = int(
+            os.getenv("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+
+        # 订阅内容解析缓存配置（按内容哈希复用解析结果）
+        self.PARSE_CACHE_ENABLED = (
+            os.getenv("PARSE_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.PARSE_CACHE_DIR = self.DATA_DIR / "parse_cache"
+        self.PARSE_CACHE_TTL = int(os.getenv("PARSE_CACHE_TTL", str(7 * 24 * 3600)))
+        self.PARSE_CACHE_MAX_ENTRIES = int(
+            os.getenv("PARSE_CACHE_MAX_ENTRIES", "2000")
+        )
+
+        # 失效订阅链接缓存配置（跨运行记录失败的订阅链接，过期前直接跳过）
+        self.DEAD_LINK_CACHE_ENABLED = (
+            os.getenv("DEAD_LINK_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.DEAD_LINK_CACHE_FILE = self.DATA_DIR / "dead_links.json"
+        self.DEAD_LINK_BASE_TTL = int(os.getenv("DEAD_LINK_BASE_TTL", str(6 * 3600)))
+        self.DEAD_LINK_MAX_TTL = int(
+            os.getenv("DEAD_LINK_MAX_TTL", str(7 * 24 * 3600))
+        )
+        self.DEAD_LINK_RETENTION = int(
+            os.getenv("DEAD_LINK_RETENTION", str(30 * 24 * 3600))
+        )
+
+        # 节点域名解析配置（测速前批量解析，跳过无法解析的节点）
+        self.DNS_CACHE_ENABLED = (
+            os.getenv("DNS_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.DNS_CACHE_FILE = self.DATA_DIR / "dns_cache.json"
+        self.DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", str(30 * 60)))
+        self.DNS_NEGATIVE_TTL = int(os.getenv("DNS_NEGATIVE_TTL", str(10 * 60)))
+        self.DNS_RESOLVE_WORKERS = int(os.getenv("DNS_RESOLVE_WORKERS", "32"))
+        self.DNS_RESOLVE_TIMEOUT = int(os.getenv("DNS_RESOLVE_TIMEOUT", "5"))
+
+        # Clash订阅转换配置（节点较多时按块分发到进程池并行解析）
+        self.CLASH_CONVERT_WORKERS = int(os.getenv("CLASH_CONVERT_WORKERS", "0"))
+        self.CLASH_CONVERT_CHUNK_SIZE = int(
+            os.getenv("CLASH_CONVERT_CHUNK_SIZE", "500")
+        )
+        self.CLASH_CONVERT_PARALLEL_THRESHOLD = int(
+            os.getenv("CLASH_CONVERT_PARALLEL_THRESHOLD", "2000")
+        )
+        self.CLASH_PROXY_CACHE_ENABLED = (
+            os.getenv("CLASH_PROXY_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.CLASH_PROXY_CACHE_FILE = self.DATA_DIR / "clash_proxy_cache.json"
+        self.CLASH_PROXY_CACHE_RETENTION = int(
+            os.getenv("CLASH_PROXY_CACHE_RETENTION", str(7 * 24 * 3600))
+        )
+
+        # 浏览器池配置（BROWSER_ONLY_SITES 使用）
+        self.BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "4"))
+        self.BROWSER_FAST_LOAD = (
+            os.getenv("BROWSER_FAST_LOAD", "True").lower() == "true"
+        )
+        self.BROWSER_SELECTOR_TIMEOUT = int(
+            os.getenv("BROWSER_SELECTOR_TIMEOUT", "5000")
+        )
+
         # 调试配置
         self.DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 
@@ -94,8 +207,34 @@ class BaseConfig:
         self.API_HOST = os.getenv("API_HOST", "127.0.0.1")
         self.API_PORT = int(os.getenv("API_PORT", "8080"))
 
-        # 数据库配置
+        # 数据库配置（节点索引，相对路径以项目根目录为基准）
         self.DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///nodes.db")
+        self.NODE_INDEX_ENABLED = (
+            os.getenv("NODE_INDEX_ENABLED", "True").lower() == "true"
+        )
+        self.NODE_INDEX_RETENTION = int(
+            os.getenv("NODE_INDEX_RETENTION", str(30 * 24 * 3600))
+        )
+
+        # 增量测速配置（基于节点索引中的历史测试结果，通过 --incremental 启用）
+        self.SPEEDTEST_REVALIDATE_WINDOW = int(
+            os.getenv("SPEEDTEST_REVALIDATE_WINDOW", str(24 * 3600))
+        )
+        self.SPEEDTEST_FAILURE_THRESHOLD = int(
+            os.getenv("SPEEDTEST_FAILURE_THRESHOLD", "2")
+        )
+        self.SPEEDTEST_BACKOFF_BASE = int(
+            os.getenv("SPEEDTEST_BACKOFF_BASE", str(24 * 3600))
+        )
+        self.SPEEDTEST_BACKOFF_MAX = int(
+            os.getenv("SPEEDTEST_BACKOFF_MAX", str(7 * 24 * 3600))
+        )
+        self.SPEEDTEST_REVALIDATE_WORKERS = int(
+            os.getenv("SPEEDTEST_REVALIDATE_WORKERS", "32")
+        )
+        self.SPEEDTEST_REVALIDATE_TIMEOUT = int(
+            os.getenv("SPEEDTEST_REVALIDATE_TIMEOUT", "3")
+        )
 
 
 class WebsiteConfig:
@@ -186,9 +325,62 @@ class ConfigManager:
                 "request_timeout": self.base.REQUEST_TIMEOUT,
                 "request_delay": self.base.REQUEST_DELAY,
                 "request_retry": self.base.REQUEST_RETRY,
+                "rate_limit_enabled": self.base.RATE_LIMIT_ENABLED,
+                "rate_limit_default_rate": self.base.RATE_LIMIT_DEFAULT_RATE,
+                "rate_limit_default_burst": self.base.RATE_LIMIT_DEFAULT_BURST,
+                "host_health_window": self.base.HOST_HEALTH_WINDOW,
+                "host_health_error_rate": self.base.HOST_HEALTH_ERROR_RATE,
+                "host_circuit_cooldown": self.base.HOST_CIRCUIT_COOLDOWN,
+                "retry_after_max": self.base.RETRY_AFTER_MAX,
+                "retry_budget": self.base.RETRY_BUDGET,
                 "user_agent": self.base.USER_AGENT,
+                "http_pool_connections": self.base.HTTP_POOL_CONNECTIONS,
+                "http_pool_maxsize": self.base.HTTP_POOL_MAXSIZE,
+                "proxy_probe_url": self.base.PROXY_PROBE_URL,
+                "proxy_probe_timeout": self.base.PROXY_PROBE_TIMEOUT,
                 "connection_timeout": self.base.CONNECTION_TIMEOUT,
                 "max_workers": self.base.MAX_WORKERS,
+                "collect_concurrent": self.base.COLLECT_CONCURRENT,
+                "collect_max_workers": self.base.COLLECT_MAX_WORKERS,
+                "collect_per_host_limit": self.base.COLLECT_PER_HOST_LIMIT,
+                "subscription_concurrent": self.base.SUBSCRIPTION_CONCURRENT,
+                "subscription_fetch_workers": self.base.SUBSCRIPTION_FETCH_WORKERS,
+                "subscription_per_host_limit": self.base.SUBSCRIPTION_PER_HOST_LIMIT,
+                "subscription_parse_workers": self.base.SUBSCRIPTION_PARSE_WORKERS,
+                "collect_pipeline": self.base.COLLECT_PIPELINE,
+                "subscription_max_bytes": self.base.SUBSCRIPTION_MAX_BYTES,
+                "subscription_sniff_bytes": self.base.SUBSCRIPTION_SNIFF_BYTES,
+                "http_cache_enabled": self.base.HTTP_CACHE_ENABLED,
+                "http_cache_ttl": self.base.HTTP_CACHE_TTL,
+                "http_cache_max_bytes": self.base.HTTP_CACHE_MAX_BYTES,
+                "parse_cache_enabled": self.base.PARSE_CACHE_ENABLED,
+                "parse_cache_ttl": self.base.PARSE_CACHE_TTL,
+                "parse_cache_max_entries": self.base.PARSE_CACHE_MAX_ENTRIES,
+                "dead_link_cache_enabled": self.base.DEAD_LINK_CACHE_ENABLED,
+                "dead_link_base_ttl": self.base.DEAD_LINK_BASE_TTL,
+                "dead_link_max_ttl": self.base.DEAD_LINK_MAX_TTL,
+                "dead_link_retention": self.base.DEAD_LINK_RETENTION,
+                "dns_cache_enabled": self.base.DNS_CACHE_ENABLED,
+                "dns_cache_ttl": self.base.DNS_CACHE_TTL,
+                "dns_negative_ttl": self.base.DNS_NEGATIVE_TTL,
+                "dns_resolve_workers": self.base.DNS_RESOLVE_WORKERS,
+                "dns_resolve_timeout": self.base.DNS_RESOLVE_TIMEOUT,
+                "clash_convert_workers": self.base.CLASH_CONVERT_WORKERS,
+                "clash_convert_chunk_size": self.base.CLASH_CONVERT_CHUNK_SIZE,
+                "clash_convert_parallel_threshold": self.base.CLASH_CONVERT_PARALLEL_THRESHOLD,
+                "clash_proxy_cache_enabled": self.base.CLASH_PROXY_CACHE_ENABLED,
+                "clash_proxy_cache_retention": self.base.CLASH_PROXY_CACHE_RETENTION,
+                "node_index_enabled": self.base.NODE_INDEX_ENABLED,
+                "node_index_retention": self.base.NODE_INDEX_RETENTION,
+                "speedtest_revalidate_window": self.base.SPEEDTEST_REVALIDATE_WINDOW,
+                "speedtest_failure_threshold": self.base.SPEEDTEST_FAILURE_THRESHOLD,
+                "speedtest_backoff_base": self.base.SPEEDTEST_BACKOFF_BASE,
+                "speedtest_backoff_max": self.base.SPEEDTEST_BACKOFF_MAX,
+                "speedtest_revalidate_workers": self.base.SPEEDTEST_REVALIDATE_WORKERS,
+                "speedtest_revalidate_timeout": self.base.SPEEDTEST_REVALIDATE_TIMEOUT,
+                "browser_max_pages": self.base.BROWSER_MAX_PAGES,
+                "browser_fast_load": self.base.BROWSER_FAST_LOAD,
+                "browser_selector_timeout": self.base.BROWSER_SELECTOR_TIMEOUT,
                 "log_level": self.base.LOG_LEVEL,
                 "debug": self.base.DEBUG,
                 "api_enabled": self.base.API_ENABLED,
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+订阅内容嗅探
+根据下载内容的前几KB判断是否可能是订阅（节点列表、Base64、Clash YAML），
+明显不是订阅的内容（HTML错误页、图片、压缩包等二进制）提前中止下载
+"""
+
+import re
+from typing import Optional
+
+# 常见二进制文件头
+BINARY_SIGNATURES = (
+    b"\x89PNG",
+    b"GIF8",
+    b"\xff\xd8\xff",  # JPEG
+    b"PK\x03\x04",  # ZIP
+    b"\x1f\x8b",  # GZIP
+    b"%PDF",
+    b"7z\xbc\xaf",
+    b"Rar!",
+)
+
+# 节点协议前缀（HTML页面中直接包含节点时仍然接受）
+NODE_SCHEME_PATTERN = re.compile(
+    rb"(?:vmess|vless|trojan|ssr?|hysteria2?|hy2|tuic|socks5?)://", re.IGNORECASE
+)
+
+HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+
+
+def sniff_subscription(head: bytes) -> Optional[str]:
+    """
+    检查内容开头是否符合订阅格式
+
+    只根据内容本身判断：不少订阅服务器以 text/html 返回Base64内容，Content-Type不可信。
+
+    Args:
+        head: 内容开头的字节
+
+    Returns:
+        不符合时返回原因，符合时返回None
+    """
+    if not head:
+        return None
+
+    if head.startswith(BINARY_SIGNATURES) or b"\x00" in head:
+        return "二进制内容"
+
+    lowered = head.lstrip()[:1024].lower()
+    looks_like_html = any(marker in lowered for marker in HTML_MARKERS)
+    if looks_like_html and not NODE_SCHEME_PATTERN.search(head):
+        return "HTML页面"
+
+    return None
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+失效订阅链接缓存
+跨运行记录获取或解析失败的订阅链接（失败类型和连续失败次数），
+跳过时间随失败次数指数增长，过期前直接跳过，避免每次运行重复请求已失效的链接
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from src.core.config_manager import get_config
+from src.core.exception_handler import CircuitOpenError, ContentRejectedError
+from src.utils.logger import get_logger
+
+
+def classify_failure(error: Exception) -> Optional[str]:
+    """
+    将获取订阅时的异常归类为失败类型
+
+    Args:
+        error: 获取订阅时抛出的异常
+
+    Returns:
+        失败类型，不应记录为链接失效时（如主机熔断）返回None
+    """
+    if isinstance(error, CircuitOpenError):
+        # 主机级别的临时状态，不代表链接本身失效
+        return None
+    if isinstance(error, ContentRejectedError):
+        return "rejected"
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = getattr(error, "response", None)
+        if response is not None:
+            return f"http_{response.status_code}"
+        return "http_error"
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection"
+    return "error"
+
+
+class DeadLinkCache:
+    """持久化的失效订阅链接缓存，跳过时间按连续失败次数指数增长"""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        base_ttl: Optional[int] = None,
+        max_ttl: Optional[int] = None,
+    ):
+        config = get_config().base
+        self.logger = get_logger("dead_link_cache")
+
+        self.enabled = config.DEAD_LINK_CACHE_ENABLED
+        self.cache_file = str(cache_file or config.DEAD_LINK_CACHE_FILE)
+        self.base_ttl = base_ttl if base_ttl is not None else config.DEAD_LINK_BASE_TTL
+        self.max_ttl = max_ttl if max_ttl is not None else config.DEAD_LINK_MAX_TTL
+        self.retention = config.DEAD_LINK_RETENTION
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+        # 本次运行的统计（同一链接只统计一次）
+        self._skipped: Dict[str, str] = {}
+        self._revived: List[str] = []
+        self._failed: Dict[str, str] = {}
+
+        if self.enabled:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self):
+        """加载缓存文件"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载失效链接缓存失败，将重建: {str(e)}")
+            self._entries = {}
+
+    def flush(self):
+        """清理长期未再失败的记录并写回磁盘"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            now = time.time()
+            stale = [
+                url
+                for url, entry in self._entries.items()
+                if entry.get("expires_at", 0) + self.retention < now
+            ]
+            for url in stale:
+                del self._entries[url]
+                self._dirty = True
+
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+                tmp_path = self.cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"保存失效链接缓存失败: {str(e)}")
+
+    def should_skip(self, url: str) -> bool:
+        """
+        链接是否处于失效跳过期内
+
+        Args:
+            url: 订阅链接URL
+
+        Returns:
+            需要跳过时返回True
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            if url in self._failed:
+                # 本次运行中刚失败的链接不影响本次运行的重试
+                return False
+
+            entry = self._entries.get(url)
+            if not entry or entry.get("expires_at", 0) <= time.time():
+                return False
+
+            if url not in self._skipped:
+                self._skipped[url] = entry.get("failure_class", "unknown")
+                remaining = entry["expires_at"] - time.time()
+                self.logger.info(
+                    f"⏭️ 跳过失效订阅 ({entry.get('failure_class')}, 连续失败 {entry.get('failures')} 次, "
+                    f"{remaining / 3600:.1f}小时后重试): {url}"
+                )
+            return True
+
+    def record_failure(self, url: str, failure_class: Optional[str]):
+        """
+        记录一次失败，跳过时间为 base_ttl * 2^(连续失败次数-1)，不超过 max_ttl
+
+        同一次运行中同一链接的多次失败（重试、多个网站引用同一链接）只计一次。
+
+        Args:
+            url: 订阅链接URL
+            failure_class: 失败类型，为None时不记录
+        """
+        if not self.enabled or not failure_class:
+            return
+
+        with self._lock:
+            if url in self._failed:
+                return
+            self._failed[url] = failure_class
+
+            now = time.time()
+            entry = self._entries.get(url) or {"failures": 0, "first_failed": now}
+            entry["failures"] += 1
+            entry["failure_class"] = failure_class
+            entry["last_failed"] = now
+            ttl = min(self.base_ttl * (2 ** (entry["failures"] - 1)), self.max_ttl)
+            entry["expires_at"] = now + ttl
+
+            self._entries[url] = entry
+            self._dirty = True
+
+        self.logger.debug(
+            f"记录失效订阅 ({failure_class}, 连续失败 {entry['failures']} 次, "
+            f"跳过 {ttl / 3600:.1f}小时): {url}"
+        )
+
+    def record_success(self, url: str):
+        """记录一次成功，曾经失效的链接从缓存中移除"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            failed_this_run = self._failed.pop(url, None) is not None
+            entry = self._entries.pop(url, None)
+            if entry is None:
+                return
+            self._dirty = True
+            if failed_this_run and entry.get("failures", 0) <= 1:
+                # 本次运行中失败后重试成功，不算作恢复
+                return
+            self._revived.append(url)
+
+        self.logger.info(
+            f"♻️ 失效订阅已恢复 (此前连续失败 {entry.get('failures')} 次): {url}"
+        )
+
+    def get_summary(self) -> Dict:
+        """获取本次运行的失效链接统计"""
+        with self._lock:
+            failure_classes: Dict[str, int] = {}
+            for failure_class in self._failed.values():
+                failure_classes[failure_class] = failure_classes.get(failure_class, 0) + 1
+
+            return {
+                "skipped": len(self._skipped),
+                "revived": len(self._revived),
+                "failed": len(self._failed),
+                "failure_classes": failure_classes,
+                "tracked": len(self._entries),
+            }
+
+
+# 全局单例实例
+_dead_link_cache = None
+_dead_link_cache_lock = threading.Lock()
+
+
+def get_dead_link_cache() -> DeadLinkCache:
+    """获取失效链接缓存单例实例"""
+    global _dead_link_cache
+    if _dead_link_cache is None:
+        with _dead_link_cache_lock:
+            if _dead_link_cache is None:
+                _dead_link_cache = DeadLinkCache()
+    return _dead_link_cache
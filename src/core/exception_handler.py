@@ -33,12 +33,24 @@ class NetworkError(CollectorError):
     pass
 
 
+class CircuitOpenError(NetworkError):
+    """主机熔断中（连续失败或要求的等待时间过长），请求被快速拒绝"""
+
+    pass
+
+
 class ParseError(CollectorError):
     """解析相关异常"""
 
     pass
 
 
+class ContentRejectedError(ParseError):
+    """下载内容超过大小上限或格式不符（如期望订阅却返回HTML页面），已中止下载"""
+
+    pass
+
+
 class ConfigError(CollectorError):
     """配置相关异常"""
 
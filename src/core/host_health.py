@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主机健康管理
+按主机统计滚动错误率，遵守 429/503 的 Retry-After，主机明显不可用时熔断快速失败，
+并限制每次运行的全局重试次数，避免不可用的主机拖长运行时间
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from src.core.config_manager import get_config
+from src.core.exception_handler import CircuitOpenError
+from src.utils.logger import get_logger
+
+# 表示主机过载、应当退避的状态码
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 秒数或HTTP日期格式的响应头值
+
+    Returns:
+        需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostState:
+    """单个主机的健康状态"""
+
+    def __init__(self, window: int):
+        self.results = deque(maxlen=window)  # True为成功，False为失败
+        self.open_until = 0.0  # 熔断截止时间
+        self.half_open = False  # 熔断冷却结束后的试探状态
+        self.probe_started = 0.0  # 试探请求的发出时间（同一时间只放行一个试探请求）
+        self.blocked_until = 0.0  # Retry-After 要求的等待截止时间
+        self.trip_count = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.results:
+            return 0.0
+        return self.results.count(False) / len(self.results)
+
+
+class HostHealth:
+    """运行级主机健康跟踪器"""
+
+    def __init__(self):
+        config = get_config().base
+        self.logger = get_logger("host_health")
+
+        self.window = config.HOST_HEALTH_WINDOW
+        self.min_requests = config.HOST_HEALTH_MIN_REQUESTS
+        self.error_rate_threshold = config.HOST_HEALTH_ERROR_RATE
+        self.cooldown = config.HOST_CIRCUIT_COOLDOWN
+        self.retry_after_max = config.RETRY_AFTER_MAX
+        self.retry_budget = config.RETRY_BUDGET
+
+        self._hosts: Dict[str, HostState] = {}
+        self._retries_used = 0
+        self._budget_warned = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _get_state(self, host: str) -> HostState:
+        """获取主机状态（调用方需持有锁）"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(self.window)
+            self._hosts[host] = state
+        return state
+
+    def before_request(self, url: str):
+        """
+        请求前检查主机状态
+
+        主机熔断中时抛出 CircuitOpenError；冷却结束后只放行一个试探请求，
+        试探结果记录之前其余请求同样抛出 CircuitOpenError（试探超过一个冷却时间
+        仍无结果时重新放行试探）。主机要求 Retry-After 时等待，
+        等待时间超过 RETRY_AFTER_MAX 时同样快速失败。
+        """
+        host = self._get_host(url)
+        if not host:
+            return
+
+        with self._lock:
+            state = self._get_state(host)
+            now = time.monotonic()
+
+            if state.open_until > now:
+                raise CircuitOpenError(
+                    f"主机已熔断，{state.open_until - now:.0f}秒后重试: {host}"
+                )
+            if state.open_until:
+                if state.half_open and now - state.probe_started < self.cooldown:
+                    raise CircuitOpenError(f"主机熔断试探中，等待试探结果: {host}")
+                # 冷却结束，只放行这一个试探请求
+                state.half_open = True
+                state.probe_started = now
+                self.logger.info(f"🔄 主机熔断冷却结束，试探请求: {host}")
+
+            wait_time = state.blocked_until - now
+
+        if wait_time > 0:
+            if wait_time > self.retry_after_max:
+                raise CircuitOpenError(
+                    f"主机要求等待 {wait_time:.0f}秒，超过上限 {self.retry_after_max}秒: {host}"
+                )
+            self.logger.info(f"⏳ 遵守 Retry-After，等待 {wait_time:.1f}秒: {host}")
+            time.sleep(wait_time)
+
+    def record_response(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """根据响应状态码记录主机健康状态"""
+        if status_code in THROTTLE_STATUS_CODES or status_code >= 500:
+            self.record_failure(url, parse_retry_after(retry_after))
+        else:
+            self.record_success(url)
+
+    def record_success(self, url: str):
+        """记录一次成功请求"""
+        host = self._get_host(url)
+        with self._lock:
+            state = self._get_state(host)
+            state.results.append(True)
+            if state.half_open:
+                state.half_open = False
+                state.probe_started = 0.0
+                state.open_until = 0.0
+                state.results.clear()
+                self.logger.info(f"✅ 主机恢复正常，关闭熔断: {host}")
+
+    def record_failure(self, url: str, retry_after: Optional[float] = None):
+        """
+        记录一次失败请求（连接错误、超时、5xx或限流）
+
+        Args:
+            url: 请求URL
+            retry_after: 服务器要求的等待秒数
+        """
+        host = self._get_host(url)
+        with self._lock:
+            state = self._get_state(host)
+            state.results.append(False)
+            now = time.monotonic()
+
+            if retry_after is not None:
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+
+            should_trip = state.half_open or (
+                len(state.results) >= self.min_requests
+                and state.error_rate >= self.error_rate_threshold
+            )
+            if should_trip and state.open_until <= now:
+                # 连续熔断时冷却时间加倍
+                state.trip_count += 1
+                cooldown = self.cooldown * (2 ** (state.trip_count - 1))
+                state.open_until = now + cooldown
+                state.half_open = False
+                state.probe_started = 0.0
+                self.logger.warning(
+                    f"⛔ 主机错误率 {state.error_rate * 100:.0f}%，熔断 {cooldown:.0f}秒: {host}"
+                )
+
+    def is_open(self, url: str) -> bool:
+        """主机是否处于熔断状态"""
+        host = self._get_host(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            return bool(state and state.open_until > time.monotonic())
+
+    def try_consume_retry(self, url: str) -> bool:
+        """
+        申请一次重试机会
+
+        主机熔断中或全局重试预算用尽时返回False，调用方应放弃重试。
+        """
+        if self.is_open(url):
+            return False
+
+        with self._lock:
+            if self._retries_used >= self.retry_budget:
+                if not self._budget_warned:
+                    self._budget_warned = True
+                    self.logger.warning(
+                        f"⚠️ 本次运行的重试预算已用尽 ({self.retry_budget} 次)，后续失败不再重试"
+                    )
+                return False
+            self._retries_used += 1
+            return True
+
+    def get_retry_delay(self, url: str, attempt: int, base_delay: float = 1.0) -> float:
+        """
+        计算重试前的等待时间
+
+        主机给出 Retry-After 时由 before_request 负责等待，这里返回0；
+        否则使用带随机抖动的指数退避。
+        """
+        host = self._get_host(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            if state and state.blocked_until > time.monotonic():
+                return 0.0
+
+        delay = min(base_delay * (2**attempt), self.retry_after_max)
+        return delay * random.uniform(1.0, 1.25)
+
+    def get_summary(self) -> Dict:
+        """获取本次运行的主机健康摘要"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "retries_used": self._retries_used,
+                "retry_budget": self.retry_budget,
+                "open_hosts": sorted(
+                    host for host, state in self._hosts.items() if state.open_until > now
+                ),
+                "tripped_hosts": sorted(
+                    host for host, state in self._hosts.items() if state.trip_count
+                ),
+            }
+
+
+# 全局单例实例
+_host_health = None
+_host_health_lock = threading.Lock()
+
+
+def get_host_health() -> HostHealth:
+    """获取主机健康跟踪器单例实例"""
+    global _host_health
+    if _host_health is None:
+        with _host_health_lock:
+            if _host_health is None:
+                _host_health = HostHealth()
+    return _host_health
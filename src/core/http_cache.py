@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP条件请求缓存
+在磁盘上保存响应体和校验信息（ETag / Last-Modified），
+重复请求时发送 If-None-Match / If-Modified-Since，304时直接使用缓存内容
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+
+class HttpCache:
+    """基于磁盘的HTTP校验缓存，按总大小进行LRU淘汰"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        config = get_config().base
+        self.logger = get_logger("http_cache")
+
+        self.cache_dir = str(cache_dir or config.HTTP_CACHE_DIR)
+        self.ttl = ttl if ttl is not None else config.HTTP_CACHE_TTL
+        self.max_bytes = max_bytes if max_bytes is not None else config.HTTP_CACHE_MAX_BYTES
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+        # 统计信息
+        self.stats = {"revalidated": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+
+        self._load_index()
+        atexit.register(self.flush)
+
+    def _load_index(self):
+        """加载缓存索引"""
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载HTTP缓存索引失败，将重建: {str(e)}")
+            self._entries = {}
+
+    def flush(self):
+        """将缓存索引写回磁盘"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+                tmp_path = index_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False)
+                os.replace(tmp_path, index_path)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"保存HTTP缓存索引失败: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                **self.stats,
+                "cached": len(self._entries),
+                "cached_bytes": sum(entry.get("size", 0) for entry in self._entries.values()),
+            }
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        获取URL对应的条件请求头
+
+        Returns:
+            If-None-Match / If-Modified-Since 请求头，无有效缓存时为空字典
+        """
+        with self._lock:
+            entry = self._get_valid_entry(url)
+            if not entry:
+                return {}
+
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def handle_response(self, url: str, response):
+        """
+        处理响应：304时用缓存内容填充响应，200且带校验信息时写入缓存
+
+        流式请求（stream=True）的200响应此时尚未读取内容，不在这里写入缓存。
+
+        Args:
+            url: 请求URL
+            response: requests响应对象
+
+        Returns:
+            可直接使用的响应对象
+        """
+        if response.status_code == 304:
+            body = self._read_body(url)
+            if body is None:
+                return response
+
+            with self._lock:
+                entry = self._entries.get(url, {})
+                entry["validated_at"] = time.time()
+                entry["last_access"] = time.time()
+                self._dirty = True
+                self.stats["revalidated"] += 1
+                self.stats["bytes_saved"] += len(body)
+                encoding = entry.get("encoding")
+
+            response._content = body
+            response.status_code = 200
+            if encoding:
+                response.encoding = encoding
+            response.from_cache = True
+            self.logger.debug(f"HTTP缓存命中(304): {url}")
+            return response
+
+        if response.status_code == 200 and response._content is not False:
+            # 流式响应尚未读取内容，由读取方在读取完成后调用 store_response
+            self.store_response(url, response)
+
+        return response
+
+    def store_response(self, url: str, response):
+        """响应带校验信息时写入缓存（响应内容需已读取）"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._store(url, response, etag, last_modified)
+
+    def _get_valid_entry(self, url: str) -> Optional[Dict]:
+        """获取未过期的缓存条目（调用方需持有锁）"""
+        entry = self._entries.get(url)
+        if not entry:
+            return None
+
+        if time.time() - entry.get("validated_at", 0) > self.ttl:
+            self._remove_entry(url)
+            return None
+
+        if not os.path.exists(os.path.join(self.cache_dir, entry["file"])):
+            self._remove_entry(url)
+            return None
+
+        return entry
+
+    def _read_body(self, url: str) -> Optional[bytes]:
+        """读取缓存的响应体"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return None
+            body_path = os.path.join(self.cache_dir, entry["file"])
+
+        try:
+            with open(body_path, "rb") as f:
+                return f.read()
+        except Exception as e:
+            self.logger.debug(f"读取HTTP缓存内容失败 {url}: {str(e)}")
+            return None
+
+    def _store(self, url: str, response, etag: Optional[str], last_modified: Optional[str]):
+        """写入缓存条目"""
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        filename = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, filename), "wb") as f:
+                f.write(body)
+        except Exception as e:
+            self.logger.debug(f"写入HTTP缓存失败 {url}: {str(e)}")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._entries[url] = {
+                "file": filename,
+                "etag": etag,
+                "last_modified": last_modified,
+                "encoding": response.encoding,
+                "size": len(body),
+                "validated_at": now,
+                "last_access": now,
+            }
+            self._dirty = True
+            self.stats["stored"] += 1
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        """按最近访问时间淘汰条目，直到总大小不超过上限（调用方需持有锁）"""
+        total_size = sum(entry.get("size", 0) for entry in self._entries.values())
+        if total_size <= self.max_bytes:
+            return
+
+        for url in sorted(self._entries, key=lambda u: self._entries[u].get("last_access", 0)):
+            if total_size <= self.max_bytes:
+                break
+            total_size -= self._entries[url].get("size", 0)
+            self._remove_entry(url)
+            self.stats["evicted"] += 1
+
+    def _remove_entry(self, url: str):
+        """删除缓存条目及其内容文件（调用方需持有锁）"""
+        entry = self._entries.pop(url, None)
+        self._dirty = True
+        if not entry:
+            return
+        try:
+            os.remove(os.path.join(self.cache_dir, entry["file"]))
+        except OSError:
+            pass
+
+
+# 全局单例实例
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """获取HTTP缓存单例实例"""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                _http_cache = HttpCache()
+    return _http_cache
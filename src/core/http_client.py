@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享HTTP客户端
+进程内所有收集器和订阅解析器共用同一组连接池，复用keep-alive连接和TLS会话
+"""
+
+import os
+import random
+import threading
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+
+# 禁用SSL警告
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+from src.core.config_manager import get_config
+from src.core.exception_handler import ContentRejectedError
+from src.core.host_health import get_host_health
+from src.core.rate_limiter import get_rate_limiter
+from src.utils.logger import get_logger
+
+# 真实浏览器User-Agent（GitHub Actions环境中随机选择）
+REAL_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+]
+
+
+def get_browser_user_agent() -> str:
+    """根据运行环境选择User-Agent"""
+    if os.getenv("GITHUB_ACTIONS") == "true":
+        return random.choice(REAL_USER_AGENTS)
+    return get_config().base.USER_AGENT
+
+
+def build_browser_headers() -> Dict[str, str]:
+    """构建模拟真实浏览器的请求头以绕过反爬虫"""
+    return {
+        "User-Agent": get_browser_user_agent(),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0",
+        "DNT": "1",
+        "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Windows"',
+        "sec-ch-ua-arch": '"x86"',
+        "sec-ch-ua-bitness": '"64"',
+        "sec-ch-ua-full-version": '"120.0.6099.109"',
+        "sec-ch-ua-full-version-list": '"Not_A Brand";v="8.0.0.0", "Chromium";v="120.0.6099.109", "Google Chrome";v="120.0.6099.109"',
+        "sec-ch-ua-model": '""',
+        "sec-ch-ua-platform-version": '"15.0.0"',
+    }
+
+
+def get_env_proxies(site_key: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    从环境变量读取代理配置
+
+    Args:
+        site_key: 网站收集器关键字，属于 BROWSER_ONLY_SITES 时禁用代理
+
+    Returns:
+        requests格式的代理字典，未配置代理时返回None
+    """
+    from config.websites import BROWSER_ONLY_SITES
+
+    if site_key in BROWSER_ONLY_SITES:
+        return None
+
+    http_proxy = os.getenv("http_proxy") or os.getenv("HTTP_PROXY")
+    https_proxy = os.getenv("https_proxy") or os.getenv("HTTPS_PROXY")
+    if not (http_proxy or https_proxy):
+        return None
+
+    return {"http": http_proxy, "https": https_proxy}
+
+
+class HttpClient:
+    """进程级HTTP客户端 - 所有会话挂载同一个连接池适配器"""
+
+    def __init__(self):
+        self.config_manager = get_config()
+        self.logger = get_logger("http_client")
+
+        self.pool_connections = self.config_manager.base.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = self.config_manager.base.HTTP_POOL_MAXSIZE
+
+        # 共享适配器：urllib3连接池按主机缓存，跨会话复用
+        self.adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0,
+        )
+
+        self.cache_enabled = self.config_manager.base.HTTP_CACHE_ENABLED
+
+        # 流式下载配置
+        self.chunk_size = 64 * 1024
+        self.sniff_bytes = self.config_manager.base.SUBSCRIPTION_SNIFF_BYTES
+
+        self._shared_session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    def create_session(self, site_key: Optional[str] = None) -> requests.Session:
+        """
+        创建使用共享连接池的会话
+
+        会话自身的请求头、Cookie和代理相互独立，底层连接由所有会话共享。
+        不要对这些会话调用 close()，否则会关闭共享连接池。
+
+        Args:
+            site_key: 网站收集器关键字，用于决定代理策略
+
+        Returns:
+            配置好请求头、代理和连接池的会话
+        """
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        session.headers.update(build_browser_headers())
+
+        # 禁用SSL验证（与代理使用保持一致）
+        session.verify = False
+
+        proxies = get_env_proxies(site_key)
+        if proxies:
+            session.proxies = proxies
+
+        return session
+
+    def get_session(self) -> requests.Session:
+        """获取进程内共享的通用会话（用于订阅下载等无站点上下文的请求）"""
+        if self._shared_session is None:
+            with self._lock:
+                if self._shared_session is None:
+                    self._shared_session = self.create_session()
+        return self._shared_session
+
+    def request(
+        self, session: requests.Session, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        发送请求：检查主机健康状态并按主机限速，GET请求自动使用条件请求缓存
+
+        内容未变化的源只需一次往返且不传输响应体（304），
+        返回的响应对象与完整下载的结果一致（状态码200，内容为缓存内容）。
+
+        Args:
+            session: 发送请求使用的会话
+            method: HTTP方法
+            url: 请求URL
+            **kwargs: 传给 session.request 的其他参数
+
+        Returns:
+            响应对象
+
+        Raises:
+            CircuitOpenError: 主机熔断中
+        """
+        # 主机熔断中时快速失败，遵守服务器要求的 Retry-After
+        health = get_host_health()
+        health.before_request(url)
+
+        # 同一主机请求过快时等待令牌，不同主机互不影响
+        get_rate_limiter().acquire(url)
+
+        try:
+            response = self._send(session, method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            health.record_failure(url)
+            raise
+
+        health.record_response(
+            url, response.status_code, response.headers.get("Retry-After")
+        )
+        return response
+
+    def download_text(
+        self,
+        session: requests.Session,
+        url: str,
+        max_bytes: int,
+        validate: Optional[Callable[[bytes], Optional[str]]] = None,
+        **kwargs,
+    ) -> str:
+        """
+        流式下载文本内容，超过大小上限或格式不符时提前中止
+
+        Args:
+            session: 发送请求使用的会话
+            url: 请求URL
+            max_bytes: 内容大小上限（字节）
+            validate: 内容嗅探函数，接收开头的字节，不符合时返回原因
+            **kwargs: 传给 session.request 的其他参数
+
+        Returns:
+            解码后的文本内容
+
+        Raises:
+            ContentRejectedError: 内容超过上限或格式不符
+        """
+        response = self.request(session, "GET", url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return self.read_text(url, response, max_bytes, validate)
+
+    def read_text(
+        self,
+        url: str,
+        response: requests.Response,
+        max_bytes: int,
+        validate: Optional[Callable[[bytes], Optional[str]]] = None,
+    ) -> str:
+        """
+        分块读取流式响应（stream=True），内存占用不超过大小上限
+
+        读取到前 SUBSCRIPTION_SNIFF_BYTES 字节时进行内容嗅探，
+        声明长度或实际长度超过上限、嗅探不通过时关闭连接并抛出 ContentRejectedError。
+        解码方式与 response.text 一致。
+        """
+        try:
+            # 内容已在内存中（如304时使用的缓存内容）
+            if response._content is not False:
+                return response.text
+
+            declared_length = response.headers.get("Content-Length")
+            if declared_length and declared_length.isdigit():
+                if int(declared_length) > max_bytes:
+                    raise ContentRejectedError(
+                        f"内容过大 ({int(declared_length)} 字节，上限 {max_bytes} 字节): {url}"
+                    )
+
+            chunks = []
+            size = 0
+            sniffed = validate is None
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ContentRejectedError(
+                        f"内容超过上限 {max_bytes} 字节，已中止下载: {url}"
+                    )
+                chunks.append(chunk)
+
+                if not sniffed and size >= self.sniff_bytes:
+                    self._sniff(url, b"".join(chunks)[: self.sniff_bytes], validate)
+                    sniffed = True
+
+            body = b"".join(chunks)
+            if not sniffed:
+                self._sniff(url, body, validate)
+
+            response._content = body
+            response._content_consumed = True
+
+            if self.cache_enabled and response.status_code == 200:
+                from src.core.http_cache import get_http_cache
+
+                get_http_cache().store_response(url, response)
+
+            return response.text
+        finally:
+            response.close()
+
+    @staticmethod
+    def _sniff(url: str, head: bytes, validate: Callable[[bytes], Optional[str]]):
+        """对内容开头进行嗅探，不符合时抛出异常"""
+        reason = validate(head)
+        if reason:
+            raise ContentRejectedError(f"内容格式不符（{reason}），已中止下载: {url}")
+
+    def _send(
+        self, session: requests.Session, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """发送请求，GET请求附加条件请求头并处理304"""
+        if not self.cache_enabled or method.upper() != "GET":
+            return session.request(method, url, **kwargs)
+
+        from src.core.http_cache import get_http_cache
+
+        cache = get_http_cache()
+        conditional_headers = cache.conditional_headers(url)
+        if conditional_headers:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(conditional_headers)
+            kwargs["headers"] = headers
+
+        response = session.request(method, url, **kwargs)
+        return cache.handle_response(url, response)
+
+
+# 全局单例实例
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """获取共享HTTP客户端单例实例"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+    return _http_client
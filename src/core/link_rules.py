@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+订阅链接规则引擎
+启动时一次性编译 config/websites.py 中的网站模式、通用订阅模式、关键词模式和排除规则，
+排除规则合并为一个正则，每个URL的判定结果缓存复用
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from config.websites import (
+    EXCLUDED_SUBSCRIPTION_PATTERNS,
+    SUBSCRIPTION_KEYWORDS,
+    SUBSCRIPTION_PATTERNS,
+    WEBSITES,
+)
+from src.utils.logger import get_logger
+
+# URL格式校验
+URL_PATTERN = (
+    r"^https?://"
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"
+    r"localhost|"
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
+    r"(?::\d+)?"
+    r"(?:/?|[/?]\S+)$"
+)
+
+# 订阅文件扩展名和网页文件扩展名
+VALID_EXTENSIONS = (".txt", ".yaml", ".yml", ".json", ".sub")
+WEB_EXTENSIONS = (".htm", ".html", ".php", ".asp", ".jsp")
+STRUCTURED_EXTENSIONS = (".yaml", ".yml", ".json")
+
+# 明显的非V2Ray文件（基于文件名模式，只检查路径部分）
+NON_V2RAY_PATTERNS = [
+    r".*/[^/]*clash[^/]*\.txt$",  # 排除clash相关的txt文件
+    r".*/[^/]*sing.*box[^/]*\.txt$",  # 排除sing-box相关的txt文件
+    r".*/[^/]*config[^/]*\.txt$",  # 排除config相关的txt文件
+]
+
+# URL路径和域名中的V2Ray相关关键词
+PATH_KEYWORDS = ("v2ray", "sub", "subscribe", "node", "link", "vmess", "vless", "trojan")
+DOMAIN_KEYWORDS = ("v2ray", "node", "sub", "vmess", "vless", "trojan")
+
+# 常见的节点服务域名模式
+COMMON_NODE_HOST_PATTERNS = [
+    r".*\.mibei77\.com",
+    r".*\.freeclashnode\.com",
+    r".*node\..*",
+    r".*sub\..*",
+    r".*api\..*",
+    r".*\..*\.txt$",  # 任何包含数字和字母的.txt文件
+]
+
+# 内容转换网站
+EXCLUDED_DOMAINS = (
+    "subconverter",
+    "subx",
+    "sub.xeton",
+    "api.v1.mk",
+    "v1.mk",
+    "raw.git",
+    "githubusercontent.com",
+    "gitlab.com",
+)
+
+# 判定结果缓存的最大条目数
+CLASSIFY_CACHE_SIZE = 20000
+
+
+def combine_patterns(patterns: Sequence[str], flags: int = re.IGNORECASE) -> re.Pattern:
+    """
+    将多个正则合并为一个，match() 结果与逐个 re.match 后取 any 相同
+
+    Args:
+        patterns: 正则列表（不含捕获组引用）
+        flags: 编译标志
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+
+class LinkRules:
+    """预编译的订阅链接查找与过滤规则"""
+
+    def __init__(self):
+        self.logger = get_logger("link_rules")
+
+        self.url_re = re.compile(URL_PATTERN, re.IGNORECASE)
+        self.excluded_re = combine_patterns(EXCLUDED_SUBSCRIPTION_PATTERNS)
+        self.non_v2ray_re = combine_patterns(NON_V2RAY_PATTERNS)
+        self.common_host_re = combine_patterns(COMMON_NODE_HOST_PATTERNS)
+
+        self.subscription_res = self._compile_all(SUBSCRIPTION_PATTERNS)
+        self.keyword_res = self._compile_all(
+            [rf"{keyword}[^:]*[:：]\s*(https?://[^\s\n\r]+)" for keyword in SUBSCRIPTION_KEYWORDS]
+        )
+
+        self._site_patterns: Dict[Tuple[str, ...], List[re.Pattern]] = {}
+        self._classify_cache: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+        # 预编译所有网站的模式
+        for site_config in WEBSITES.values():
+            self.get_site_patterns(site_config.get("patterns", []))
+
+    def _compile_all(self, patterns: Sequence[str]) -> List[re.Pattern]:
+        """编译正则列表，跳过无效的模式"""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                self.logger.warning(f"模式编译失败: {pattern} - {str(e)}")
+        return compiled
+
+    def get_site_patterns(self, patterns: Sequence[str]) -> List[re.Pattern]:
+        """获取网站模式的编译结果（相同模式列表只编译一次）"""
+        key = tuple(patterns)
+        compiled = self._site_patterns.get(key)
+        if compiled is None:
+            compiled = self._compile_all(key)
+            with self._lock:
+                self._site_patterns[key] = compiled
+        return compiled
+
+    def find_candidate_links(
+        self, content: str, site_patterns: Optional[Sequence[str]] = None
+    ) -> List:
+        """
+        在页面内容中查找候选订阅链接（未清理、未去重）
+
+        依次使用网站模式、通用订阅模式和关键词附近查找，结果顺序与逐个 re.findall 一致。
+
+        Args:
+            content: 页面内容
+            site_patterns: 网站配置中的 patterns
+
+        Returns:
+            候选链接列表
+        """
+        links = []
+
+        # 使用特定网站的模式
+        for pattern in self.get_site_patterns(site_patterns or []):
+            links.extend(pattern.findall(content))
+
+        # 使用通用订阅模式
+        for pattern in self.subscription_res:
+            for match in pattern.findall(content):
+                if isinstance(match, tuple):
+                    links.extend(match)
+                else:
+                    links.append(match)
+
+        # 在关键词附近查找
+        for pattern in self.keyword_res:
+            links.extend(pattern.findall(content))
+
+        return links
+
+    def is_valid_url(self, url: str) -> bool:
+        """验证URL格式是否有效"""
+        try:
+            return self.url_re.match(url) is not None
+        except TypeError:
+            return False
+
+    def is_valid_subscription_link(self, url: str) -> bool:
+        """
+        验证是否为有效的V2Ray订阅链接（结果按URL缓存）
+
+        Args:
+            url: 已清理的链接
+
+        Returns:
+            是否为有效订阅链接
+        """
+        result = self._classify_cache.get(url)
+        if result is None:
+            result = self._classify(url)
+            with self._lock:
+                if len(self._classify_cache) >= CLASSIFY_CACHE_SIZE:
+                    self._classify_cache.clear()
+                self._classify_cache[url] = result
+        return result
+
+    def _classify(self, url: str) -> bool:
+        """执行订阅链接判定"""
+        try:
+            # 检查是否匹配排除模式
+            if self.excluded_re.match(url):
+                self.logger.debug(f"链接被排除规则过滤: {url}")
+                return False
+
+            # 必须以订阅文件扩展名结尾，排除网页文件
+            url_lower = url.lower()
+            if not url_lower.endswith(VALID_EXTENSIONS) or url_lower.endswith(
+                WEB_EXTENSIONS
+            ):
+                return False
+
+            # 对于.yaml/.yml/.json文件，更宽松的验证（因为这些通常是结构化配置文件）
+            if url_lower.endswith(STRUCTURED_EXTENSIONS):
+                return True
+
+            parsed = urlparse(url)
+            path_part = parsed.path.lower()
+
+            # 首先排除明显的非V2Ray文件
+            if self.non_v2ray_re.match(url):
+                return False
+
+            # 检查URL路径中是否包含V2Ray相关关键词
+            has_keyword = any(keyword in path_part for keyword in PATH_KEYWORDS)
+
+            # 如果路径中没有关键词，检查域名
+            if not has_keyword:
+                domain = parsed.netloc.lower()
+                has_domain_keyword = any(keyword in domain for keyword in DOMAIN_KEYWORDS)
+
+                # 如果域名也没有关键词，则检查是否为常见的节点服务域名模式
+                if not has_domain_keyword:
+                    return self.common_host_re.match(url) is not None
+
+            # 排除明显的内容转换网站
+            netloc = parsed.netloc.lower()
+            if any(domain in netloc for domain in EXCLUDED_DOMAINS):
+                return False
+
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"验证订阅链接时出错: {url} - {str(e)}")
+            return False
+
+
+# 全局单例实例
+_link_rules = None
+_link_rules_lock = threading.Lock()
+
+
+def get_link_rules() -> LinkRules:
+    """获取订阅链接规则引擎单例实例"""
+    global _link_rules
+    if _link_rules is None:
+        with _link_rules_lock:
+            if _link_rules is None:
+                _link_rules = LinkRules()
+    return _link_rules
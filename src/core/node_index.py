@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+节点索引
+在 DATABASE_URL 指向的SQLite数据库中按节点指纹记录每个节点的来源网站、订阅链接、
+首次/最近出现时间和最近一次测试结果，供跨运行的增量测试、失效节点跳过和来源评估使用；
+收集和测试结果按批在单个事务中写入
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.config_manager import get_config
+from src.utils.fingerprint import node_fingerprint
+from src.utils.logger import get_logger
+from src.utils.node import parse_node
+
+# 测试结果
+STATUS_PASSED = "passed"
+STATUS_FAILED = "failed"
+
+# 单条SQL中 IN 查询的最大参数数（SQLite默认上限为999）
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    fingerprint TEXT PRIMARY KEY,
+    uri TEXT NOT NULL,
+    protocol TEXT,
+    host TEXT,
+    port INTEGER,
+    source_site TEXT,
+    subscription_url TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_tested REAL,
+    test_status TEXT,
+    latency_ms REAL,
+    fail_streak INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_host ON nodes (host);
+CREATE INDEX IF NOT EXISTS idx_nodes_last_seen ON nodes (last_seen);
+"""
+
+UPSERT_SEEN_SQL = """
+INSERT INTO nodes (
+    fingerprint, uri, protocol, host, port, source_site, subscription_url, first_seen, last_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    uri = excluded.uri,
+    source_site = excluded.source_site,
+    subscription_url = excluded.subscription_url,
+    last_seen = excluded.last_seen
+"""
+
+UPSERT_TESTED_SQL = """
+INSERT INTO nodes (
+    fingerprint, uri, protocol, host, port, first_seen, last_seen,
+    last_tested, test_status, latency_ms, fail_streak
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    last_tested = excluded.last_tested,
+    test_status = excluded.test_status,
+    latency_ms = excluded.latency_ms,
+    fail_streak = CASE
+        WHEN excluded.test_status = 'passed' THEN 0
+        ELSE nodes.fail_streak + 1
+    END
+"""
+
+# TCP复验结果：只更新状态和连续失败次数，不刷新 last_tested（复验窗口从最近一次完整测试算起）
+UPSERT_REVALIDATED_SQL = """
+INSERT INTO nodes (
+    fingerprint, uri, protocol, host, port, first_seen, last_seen,
+    last_tested, test_status, latency_ms, fail_streak
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    test_status = excluded.test_status,
+    latency_ms = CASE
+        WHEN excluded.test_status = 'passed' THEN COALESCE(excluded.latency_ms, nodes.latency_ms)
+        ELSE NULL
+    END,
+    fail_streak = CASE
+        WHEN excluded.test_status = 'passed' THEN 0
+        ELSE nodes.fail_streak + 1
+    END
+"""
+
+
+def sqlite_path(database_url: str, project_root: str = "") -> str:
+    """
+    将 sqlite:///path 形式的 DATABASE_URL 转换为数据库文件路径
+
+    相对路径以项目根目录为基准，sqlite:///:memory: 表示内存数据库。
+
+    Raises:
+        ValueError: 不是SQLite数据库地址
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"节点索引只支持SQLite数据库: {database_url}")
+    path = database_url[len(prefix):]
+    if path == ":memory:" or os.path.isabs(path):
+        return path
+    return os.path.join(project_root, path)
+
+
+def _chunks(items: Sequence, size: int = QUERY_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class NodeIndex:
+    """基于SQLite的持久化节点索引（以节点指纹为主键）"""
+
+    def __init__(self, database_url: Optional[str] = None, enabled: Optional[bool] = None):
+        config = get_config().base
+        self.logger = get_logger("node_index")
+
+        self.enabled = config.NODE_INDEX_ENABLED if enabled is None else enabled
+        self.database_url = database_url or config.DATABASE_URL
+        self.retention = config.NODE_INDEX_RETENTION
+        self.project_root = str(config.PROJECT_ROOT)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # 本次运行的统计
+        self.stats = {"inserted": 0, "updated": 0, "tested": 0, "pruned": 0}
+
+        if self.enabled:
+            atexit.register(self.close)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """打开数据库并创建表结构（调用方需持有锁），失败时禁用索引"""
+        if self._conn is not None or not self.enabled:
+            return self._conn
+
+        try:
+            path = sqlite_path(self.database_url, self.project_root)
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        except (sqlite3.Error, ValueError, OSError) as e:
+            self.logger.warning(f"打开节点索引失败，本次运行不记录: {str(e)}")
+            self.enabled = False
+        return self._conn
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _existing_fingerprints(
+        self, conn: sqlite3.Connection, fingerprints: Sequence[str]
+    ) -> set:
+        """查询已存在的指纹（调用方需持有锁）"""
+        existing = set()
+        for chunk in _chunks(fingerprints):
+            placeholders = ",".join("?" * len(chunk))
+            existing.update(
+                row[0]
+                for row in conn.execute(
+                    f"SELECT fingerprint FROM nodes WHERE fingerprint IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return existing
+
+    def upsert_nodes(
+        self, records: Iterable[Tuple[str, str, str]], seen_at: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        批量记录本次收集到的节点（单个事务）
+
+        同一指纹在本批中多次出现时只记录第一次；已存在的节点保留首次出现时间，
+        更新URI、来源和最近出现时间。
+
+        Args:
+            records: (节点URI, 来源网站, 订阅链接) 列表
+            seen_at: 出现时间，默认为当前时间
+
+        Returns:
+            {"inserted": 新节点数, "updated": 已有节点数}
+        """
+        seen_at = seen_at or time.time()
+        rows = {}
+        for uri, source_site, subscription_url in records:
+            uri = uri.strip()
+            node = parse_node(uri) if uri else None
+            if node is None:
+                continue
+            fingerprint = node_fingerprint(node)
+            if fingerprint not in rows:
+                rows[fingerprint] = (
+                    fingerprint,
+                    uri,
+                    node.protocol,
+                    node.host,
+                    node.port,
+                    source_site,
+                    subscription_url,
+                    seen_at,
+                    seen_at,
+                )
+
+        result = {"inserted": 0, "updated": 0}
+        if not rows:
+            return result
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return result
+            try:
+                with conn:
+                    existing = self._existing_fingerprints(conn, list(rows))
+                    conn.executemany(UPSERT_SEEN_SQL, rows.values())
+            except sqlite3.Error as e:
+                self.logger.warning(f"写入节点索引失败: {str(e)}")
+                return result
+
+            result["updated"] = len(existing)
+            result["inserted"] = len(rows) - len(existing)
+            self.stats["inserted"] += result["inserted"]
+            self.stats["updated"] += result["updated"]
+        return result
+
+    def record_test_results(
+        self,
+        results: Iterable[Tuple[str, bool, Optional[float]]],
+        tested_at: Optional[float] = None,
+        full_test: bool = True,
+    ) -> int:
+        """
+        批量记录测试结果（单个事务），索引中不存在的节点同时写入
+
+        通过时连续失败次数清零，失败时加一。只做了TCP复验的结果（full_test=False）
+        不更新最近测试时间，复验窗口到期后节点重新进行完整测试。
+
+        Args:
+            results: (节点URI, 是否通过, 延迟毫秒) 列表
+            tested_at: 测试时间，默认为当前时间
+            full_test: 是否为完整测试的结果
+
+        Returns:
+            记录的节点数
+        """
+        tested_at = tested_at or time.time()
+        rows = {}
+        for uri, passed, latency_ms in results:
+            node = parse_node(uri.strip()) if uri else None
+            if node is None:
+                continue
+            fingerprint = node_fingerprint(node)
+            status = STATUS_PASSED if passed else STATUS_FAILED
+            rows[fingerprint] = (
+                fingerprint,
+                uri.strip(),
+                node.protocol,
+                node.host,
+                node.port,
+                tested_at,
+                tested_at,
+                tested_at if full_test else None,
+                status,
+                latency_ms if passed else None,
+                0 if passed else 1,
+            )
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            try:
+                with conn:
+                    conn.executemany(
+                        UPSERT_TESTED_SQL if full_test else UPSERT_REVALIDATED_SQL,
+                        rows.values(),
+                    )
+            except sqlite3.Error as e:
+                self.logger.warning(f"写入测试结果失败: {str(e)}")
+                return 0
+            self.stats["tested"] += len(rows)
+        return len(rows)
+
+    def get_nodes(self, fingerprints: Sequence[str]) -> Dict[str, Dict]:
+        """
+        按指纹批量查询节点记录
+
+        Returns:
+            指纹 -> 记录字典（不存在的指纹不包含在结果中）
+        """
+        records = {}
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return records
+            for chunk in _chunks(list(fingerprints)):
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT * FROM nodes WHERE fingerprint IN ({placeholders})", chunk
+                ):
+                    records[row["fingerprint"]] = dict(row)
+        return records
+
+    def get_nodes_by_host(self, host: str) -> List[Dict]:
+        """查询同一服务器地址上的所有节点记录"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            rows = conn.execute(
+                "SELECT * FROM nodes WHERE host = ?", (host.strip("[]").lower(),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self, retention: Optional[int] = None) -> int:
+        """
+        删除超过保留时间未再出现的节点
+
+        Args:
+            retention: 保留时间（秒），默认为 NODE_INDEX_RETENTION
+
+        Returns:
+            删除的节点数
+        """
+        retention = self.retention if retention is None else retention
+        cutoff = time.time() - retention
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            try:
+                with conn:
+                    deleted = conn.execute(
+                        "DELETE FROM nodes WHERE last_seen < ?", (cutoff,)
+                    ).rowcount
+            except sqlite3.Error as e:
+                self.logger.warning(f"清理节点索引失败: {str(e)}")
+                return 0
+            self.stats["pruned"] += deleted
+        return deleted
+
+    def get_summary(self) -> Dict:
+        """获取索引总体情况和本次运行的统计"""
+        summary = dict(self.stats, total=0, passed=0, failed=0, untested=0)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return summary
+            for status, count in conn.execute(
+                "SELECT test_status, COUNT(*) FROM nodes GROUP BY test_status"
+            ):
+                summary["total"] += count
+                if status == STATUS_PASSED:
+                    summary["passed"] = count
+                elif status == STATUS_FAILED:
+                    summary["failed"] = count
+                else:
+                    summary["untested"] += count
+        return summary
+
+
+# 全局单例实例
+_node_index = None
+_node_index_lock = threading.Lock()
+
+
+def get_node_index() -> NodeIndex:
+    """获取节点索引单例实例"""
+    global _node_index
+    if _node_index is None:
+        with _node_index_lock:
+            if _node_index is None:
+                _node_index = NodeIndex()
+    return _node_index
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+订阅内容解析缓存
+以原始内容的SHA256为键保存解析出的节点列表，
+内容完全相同的订阅（同一链接跨运行、或不同链接镜像同一文件）直接复用解析结果
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+# 解析逻辑发生不兼容变化时递增，使旧缓存失效
+PARSE_CACHE_VERSION = 2
+
+
+class ParseCache:
+    """内容寻址的节点解析缓存，超出条目上限或过期时按最近访问时间淘汰"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ):
+        config = get_config().base
+        self.logger = get_logger("parse_cache")
+
+        self.enabled = config.PARSE_CACHE_ENABLED
+        self.cache_dir = str(cache_dir or config.PARSE_CACHE_DIR)
+        self.max_entries = (
+            max_entries if max_entries is not None else config.PARSE_CACHE_MAX_ENTRIES
+        )
+        self.ttl = ttl if ttl is not None else config.PARSE_CACHE_TTL
+
+        self._lock = threading.Lock()
+        # 条目路径 -> 最近访问时间，首次使用时从磁盘加载
+        self._access_times: Optional[Dict[str, float]] = None
+
+        # 统计信息
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def get_or_parse(
+        self, namespace: str, content: str, parse_func: Callable[[str], List[str]]
+    ) -> List[str]:
+        """
+        优先从缓存获取解析结果，未命中时调用解析函数并写入缓存
+
+        Args:
+            namespace: 解析器命名空间，不同解析逻辑的结果互不共享
+            content: 订阅原始内容
+            parse_func: 解析函数，接收内容返回节点列表
+
+        Returns:
+            节点列表
+        """
+        if not self.enabled:
+            return parse_func(content)
+
+        key = self._make_key(namespace, content)
+        nodes = self._get(key)
+        if nodes is not None:
+            return nodes
+
+        nodes = parse_func(content)
+        self._put(key, nodes)
+        return nodes
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / total * 100 if total else 0.0,
+            }
+
+    def _make_key(self, namespace: str, content: str) -> str:
+        """生成缓存条目的相对路径"""
+        digest = hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
+        return os.path.join(f"{namespace}_v{PARSE_CACHE_VERSION}", f"{digest}.json")
+
+    def _load_access_times(self) -> Dict[str, float]:
+        """扫描缓存目录加载条目访问时间（调用方需持有锁）"""
+        if self._access_times is not None:
+            return self._access_times
+
+        self._access_times = {}
+        if os.path.isdir(self.cache_dir):
+            for namespace_entry in os.scandir(self.cache_dir):
+                if not namespace_entry.is_dir():
+                    continue
+                for entry in os.scandir(namespace_entry.path):
+                    if entry.name.endswith(".json"):
+                        key = os.path.join(namespace_entry.name, entry.name)
+                        self._access_times[key] = entry.stat().st_mtime
+        return self._access_times
+
+    def _get(self, key: str) -> Optional[List[str]]:
+        """读取缓存条目"""
+        path = os.path.join(self.cache_dir, key)
+        now = time.time()
+
+        with self._lock:
+            access_times = self._load_access_times()
+            last_access = access_times.get(key)
+            if last_access is None:
+                self.stats["misses"] += 1
+                return None
+
+            if now - last_access > self.ttl:
+                self._remove(key)
+                self.stats["misses"] += 1
+                return None
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    nodes = json.load(f)
+                # 用文件修改时间记录最近访问时间，供跨运行的LRU淘汰使用
+                os.utime(path, (now, now))
+                access_times[key] = now
+                self.stats["hits"] += 1
+                return nodes
+            except Exception as e:
+                self.logger.debug(f"读取解析缓存失败 {key}: {str(e)}")
+                self._remove(key)
+                self.stats["misses"] += 1
+                return None
+
+    def _put(self, key: str, nodes: List[str]):
+        """写入缓存条目"""
+        path = os.path.join(self.cache_dir, key)
+
+        with self._lock:
+            access_times = self._load_access_times()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(nodes, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+                access_times[key] = time.time()
+            except Exception as e:
+                self.logger.debug(f"写入解析缓存失败 {key}: {str(e)}")
+                return
+
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        """淘汰最久未访问的条目，直到不超过条目上限（调用方需持有锁）"""
+        access_times = self._access_times
+        overflow = len(access_times) - self.max_entries
+        if overflow <= 0:
+            return
+
+        for key in sorted(access_times, key=access_times.get)[:overflow]:
+            self._remove(key)
+            self.stats["evicted"] += 1
+
+    def _remove(self, key: str):
+        """删除缓存条目（调用方需持有锁）"""
+        self._access_times.pop(key, None)
+        try:
+            os.remove(os.path.join(self.cache_dir, key))
+        except OSError:
+            pass
+
+
+# 全局单例实例
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """获取解析缓存单例实例"""
+    global _parse_cache
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                _parse_cache = ParseCache()
+    return _parse_cache
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代理连通性探测
+每次运行对每组代理只探测一次，缓存连通结果和出口IP，供所有收集器共享
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from src.core.config_manager import get_config
+from src.core.http_client import get_http_client
+from src.utils.logger import get_logger
+
+
+class ProxyProbe:
+    """运行级代理探测服务，按代理地址缓存探测结果"""
+
+    def __init__(self):
+        config = get_config().base
+        self.logger = get_logger("proxy_probe")
+        self.probe_url = config.PROXY_PROBE_URL
+        self.timeout = config.PROXY_PROBE_TIMEOUT
+
+        self._results: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="proxy-probe")
+
+    @staticmethod
+    def _make_key(proxies: Optional[Dict[str, str]]) -> Tuple:
+        """代理配置的缓存键"""
+        proxies = proxies or {}
+        return (proxies.get("http"), proxies.get("https"))
+
+    def check_async(self, proxies: Optional[Dict[str, str]]) -> Future:
+        """
+        在后台探测代理连通性，同一组代理只探测一次
+
+        Args:
+            proxies: requests格式的代理字典
+
+        Returns:
+            结果为探测结果字典的Future
+        """
+        key = self._make_key(proxies)
+        with self._lock:
+            future = self._results.get(key)
+            if future is None:
+                future = self._executor.submit(self._probe, dict(proxies or {}))
+                self._results[key] = future
+            return future
+
+    def check(self, proxies: Optional[Dict[str, str]]) -> Dict:
+        """
+        探测代理连通性（阻塞直到结果可用）
+
+        Returns:
+            探测结果字典：ok（是否连通）、ip（出口IP）、error（失败原因）
+        """
+        return self.check_async(proxies).result()
+
+    def get_result(self, proxies: Optional[Dict[str, str]]) -> Optional[Dict]:
+        """获取已完成的探测结果，尚未探测或探测未完成时返回None"""
+        with self._lock:
+            future = self._results.get(self._make_key(proxies))
+        if future is None or not future.done():
+            return None
+        return future.result()
+
+    def _probe(self, proxies: Dict[str, str]) -> Dict:
+        """执行一次探测请求"""
+        label = proxies.get("https") or proxies.get("http") or "直连"
+        try:
+            response = get_http_client().get_session().get(
+                self.probe_url,
+                proxies=proxies or {"http": None, "https": None},
+                timeout=self.timeout,
+                verify=False,
+            )
+            if response.status_code != 200:
+                self.logger.warning(
+                    f"⚠️ 代理连接测试失败 ({label})，状态码: {response.status_code}"
+                )
+                return {"ok": False, "ip": None, "error": f"HTTP {response.status_code}"}
+
+            ip = response.json().get("origin", "unknown")
+            self.logger.info(f"✅ 代理连接测试成功 ({label})，当前IP: {ip}")
+            return {"ok": True, "ip": ip, "error": None}
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ 代理连接测试异常 ({label}): {str(e)}")
+            return {"ok": False, "ip": None, "error": str(e)}
+
+
+# 全局单例实例
+_proxy_probe = None
+_proxy_probe_lock = threading.Lock()
+
+
+def get_proxy_probe() -> ProxyProbe:
+    """获取代理探测单例实例"""
+    global _proxy_probe
+    if _proxy_probe is None:
+        with _proxy_probe_lock:
+            if _proxy_probe is None:
+                _proxy_probe = ProxyProbe()
+    return _proxy_probe
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按主机限速的令牌桶
+只在同一主机请求过快时才等待，不同主机之间的请求互不影响
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即稳定状态下每秒允许的请求数）
+            burst: 桶容量（允许的突发请求数）
+        """
+        self.rate = max(rate, 0.001)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        获取一个令牌，令牌不足时阻塞等待
+
+        Returns:
+            实际等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+
+            # 预留令牌（允许为负），在锁外等待，保证并发请求按顺序排队
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+class RateLimiter:
+    """按主机分配令牌桶的限速器"""
+
+    def __init__(self):
+        config = get_config().base
+        self.logger = get_logger("rate_limiter")
+        self.enabled = config.RATE_LIMIT_ENABLED
+        self.default_rate = config.RATE_LIMIT_DEFAULT_RATE
+        self.default_burst = config.RATE_LIMIT_DEFAULT_BURST
+
+        self._host_limits: Dict[str, Dict] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def configure_host(self, url: str, rate_limit: Optional[Dict]):
+        """
+        为URL所在主机设置限速参数（来自网站配置的 rate_limit）
+
+        Args:
+            url: 主机下任意URL
+            rate_limit: {"rate": 每秒请求数, "burst": 突发请求数}，为空时使用默认值
+        """
+        if not rate_limit:
+            return
+
+        host = self._get_host(url)
+        with self._lock:
+            self._host_limits[host] = rate_limit
+            # 已创建的令牌桶按新参数重建
+            self._buckets.pop(host, None)
+
+    def acquire(self, url: str) -> float:
+        """
+        请求前获取所在主机的令牌
+
+        Returns:
+            实际等待的秒数
+        """
+        if not self.enabled:
+            return 0.0
+
+        host = self._get_host(url)
+        if not host:
+            return 0.0
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = self._host_limits.get(host, {})
+                bucket = TokenBucket(
+                    limit.get("rate", self.default_rate),
+                    limit.get("burst", self.default_burst),
+                )
+                self._buckets[host] = bucket
+
+        wait_time = bucket.acquire()
+        if wait_time > 0:
+            self.logger.debug(f"限速等待 {wait_time:.2f}s: {host}")
+        return wait_time
+
+
+# 全局单例实例
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取限速器单例实例"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
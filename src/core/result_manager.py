@@ -10,6 +10,7 @@ import time
 from datetime import datetime
 from typing import Dict, List, Any
 
+from src.utils.fingerprint import NodeDeduplicator
 from src.utils.logger import get_logger
 from src.utils.file_handler import FileHandler
 from config.settings import *
@@ -42,8 +43,9 @@ class ResultManager:
             result_dir = os.path.join("result", date_str)
             os.makedirs(result_dir, exist_ok=True)
 
-            # 保存各个网站的info文件
-            all_nodes = []
+            # 保存各个网站的info文件，节点按指纹去重（保留首次出现的节点）
+            deduplicator = NodeDeduplicator()
+            site_names = {}
             for site_key, site_results in results.items():
                 if not site_results or not site_results.get("nodes"):
                     continue
@@ -52,11 +54,16 @@ class ResultManager:
                 self._save_site_info(result_dir, site_key, site_results)
 
                 # 收集所有节点
-                all_nodes.extend(site_results["nodes"])
+                deduplicator.add_many(site_results["nodes"], site_key)
+                site_names[site_key] = site_results.get("name", site_key)
 
-            # 去重并保存总节点文件
-            if all_nodes:
-                unique_nodes = list(set(all_nodes))
+            # 记录今日文章和订阅链接（供增量模式复用）
+            self._save_link_records(date_str, results)
+
+            # 保存总节点文件
+            unique_nodes = deduplicator.nodes
+            if unique_nodes:
+                self._log_duplicate_report(deduplicator, site_names)
 
                 # 保存到日期目录
                 total_file = os.path.join(result_dir, "nodetotal.txt")
@@ -86,6 +93,58 @@ class ResultManager:
             self.logger.error(f"保存结果失败: {str(e)}")
             return False
 
+    def _log_duplicate_report(
+        self, deduplicator: NodeDeduplicator, site_names: Dict[str, str]
+    ) -> None:
+        """记录去重统计和各网站贡献的重复节点数"""
+        report = deduplicator.get_report()
+        self.logger.info(
+            f"节点去重: {report['total']} → {report['unique']} "
+            f"(重复 {report['duplicates']} 个，无效 {report['invalid']} 个)"
+        )
+        for line in deduplicator.format_report(site_names):
+            self.logger.info(f"  {line}")
+
+    def _save_link_records(self, date_str: str, results: Dict[str, Any]) -> None:
+        """保存各网站的文章链接和订阅链接到 webpage.txt / subscription.txt
+
+        本次运行未收集到的网站保留已有记录，避免重跑时丢失当天的链接。
+        """
+        articles = self.file_handler.load_existing_articles(date_str)
+        subscriptions = self.file_handler.load_existing_subscriptions(date_str)
+
+        records = {}
+        for website_name, article_url in articles.items():
+            links = subscriptions.get(f"{website_name}_{article_url}", [])
+            records[website_name] = (article_url, links)
+
+        for site_key, site_results in results.items():
+            if not site_results:
+                continue
+            article_url = site_results.get("article_url")
+            links = site_results.get("subscription_links", [])
+            if article_url and links:
+                records[site_results.get("name", site_key)] = (article_url, links)
+
+        if not records:
+            return
+
+        self.file_handler.save_webpage_links(
+            [
+                {"website_name": website_name, "article_url": article_url}
+                for website_name, (article_url, _) in records.items()
+            ],
+            date_suffix=date_str,
+        )
+        self.file_handler.save_subscription_links(
+            [
+                {"source": website_name, "source_url": article_url, "url": link}
+                for website_name, (article_url, links) in records.items()
+                for link in links
+            ],
+            date_suffix=date_str,
+        )
+
     def _save_site_info(
         self, result_dir: str, site_key: str, site_results: Dict[str, Any]
     ) -> None:
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+订阅内容格式嗅探与解码
+先根据开头字符、字符集、行结构和 proxies 键等廉价特征判断订阅格式，
+只调用对应的一个解码器，解码失败时才按固定顺序回退到其他解码器，
+并按格式统计调用次数、成功次数和耗时
+"""
+
+import base64
+import re
+import threading
+import time
+from typing import Callable, Dict, List
+
+from src.utils.logger import get_logger
+
+# 订阅格式
+FORMAT_CLASH = "clash"  # Clash YAML/JSON 配置或代理列表
+FORMAT_BASE64 = "base64"  # Base64编码的节点列表
+FORMAT_URL_ENCODED = "url_encoded"  # URL编码的节点列表
+FORMAT_PLAIN = "plain"  # 明文节点列表
+
+# 嗅探失败时的回退顺序
+FALLBACK_ORDER = (FORMAT_CLASH, FORMAT_BASE64, FORMAT_URL_ENCODED, FORMAT_PLAIN)
+
+# 嗅探时只检查内容开头的字符数
+SNIFF_CHARS = 4096
+
+NODE_SCHEME_PATTERN = re.compile(
+    r"(?:vmess|vless|trojan|ssr?|hysteria2?|hy2|tuic|socks5?|reality)://", re.IGNORECASE
+)
+URL_ENCODED_SCHEME_PATTERN = re.compile(
+    r"(?:vmess|vless|trojan|ssr?|hysteria2?|hy2|tuic|socks5?|reality)%3A%2F%2F",
+    re.IGNORECASE,
+)
+PROXIES_KEY_PATTERN = re.compile(r"^proxies\s*:", re.MULTILINE)
+PROXY_LIST_PATTERN = re.compile(r"-\s*(?:\{|name\s*:)")
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/=_\-\s]+")
+
+
+def sniff_format(content: str) -> str:
+    """
+    根据内容特征判断订阅格式
+
+    Args:
+        content: 订阅内容
+
+    Returns:
+        订阅格式（FORMAT_* 之一），无法判断时按明文处理
+    """
+    head = content[:SNIFF_CHARS].lstrip("\ufeff \t\r\n")
+    if not head:
+        return FORMAT_PLAIN
+
+    # JSON配置或代理数组
+    if head[0] in "{[":
+        return FORMAT_CLASH
+
+    # Clash配置中 proxies 可能在较多通用配置之后，按行首匹配整个内容
+    if PROXIES_KEY_PATTERN.search(content) or PROXY_LIST_PATTERN.match(head):
+        return FORMAT_CLASH
+
+    if NODE_SCHEME_PATTERN.search(head):
+        return FORMAT_PLAIN
+
+    if URL_ENCODED_SCHEME_PATTERN.search(head):
+        return FORMAT_URL_ENCODED
+
+    # 只包含Base64字符集（含换行）
+    if head.isascii() and BASE64_PATTERN.fullmatch(head):
+        return FORMAT_BASE64
+
+    return FORMAT_PLAIN
+
+
+def decode_base64_text(text: str) -> str:
+    """
+    解码Base64文本（自动补齐padding，兼容URL安全字符集）
+
+    Raises:
+        ValueError: 内容不是有效的Base64
+    """
+    clean_text = "".join(text.split())
+    clean_text += "=" * (-len(clean_text) % 4)
+    if "-" in clean_text or "_" in clean_text:
+        decoded_bytes = base64.urlsafe_b64decode(clean_text)
+    else:
+        decoded_bytes = base64.b64decode(clean_text)
+    return decoded_bytes.decode("utf-8", errors="ignore")
+
+
+class DecoderStats:
+    """按格式统计嗅探结果、解码调用次数、成功次数和耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sniffed: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.successes: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.fallbacks = 0
+
+    def record_sniff(self, format_name: str):
+        with self._lock:
+            self.sniffed[format_name] = self.sniffed.get(format_name, 0) + 1
+
+    def record_decode(self, format_name: str, elapsed: float, success: bool, fallback: bool):
+        with self._lock:
+            self.calls[format_name] = self.calls.get(format_name, 0) + 1
+            self.seconds[format_name] = self.seconds.get(format_name, 0.0) + elapsed
+            if success:
+                self.successes[format_name] = self.successes.get(format_name, 0) + 1
+                if fallback:
+                    self.fallbacks += 1
+
+    def get_summary(self) -> Dict:
+        """获取统计摘要"""
+        with self._lock:
+            formats = {
+                format_name: {
+                    "sniffed": self.sniffed.get(format_name, 0),
+                    "calls": self.calls.get(format_name, 0),
+                    "successes": self.successes.get(format_name, 0),
+                    "seconds": self.seconds.get(format_name, 0.0),
+                }
+                for format_name in FALLBACK_ORDER
+                if format_name in self.sniffed or format_name in self.calls
+            }
+            return {"formats": formats, "fallbacks": self.fallbacks}
+
+
+class SubscriptionDecoder:
+    """
+    按嗅探结果分发的订阅解码器
+
+    各格式的解码函数由调用方提供（节点提取和Clash代理转换逻辑各自不同），
+    解码器只负责选择格式、回退和计时。
+    """
+
+    def __init__(self, decoders: Dict[str, Callable[[str], List[str]]], name: str = "decoder"):
+        """
+        Args:
+            decoders: 格式 -> 解码函数（接收订阅内容，返回节点列表）
+            name: 日志中显示的名称
+        """
+        self.decoders = decoders
+        self.name = name
+        self.logger = get_logger("subscription_decoder")
+
+    def decode(self, content: str) -> List[str]:
+        """
+        解码订阅内容
+
+        Args:
+            content: 订阅内容
+
+        Returns:
+            节点列表，所有格式都解码失败时返回空列表
+        """
+        sniffed = sniff_format(content)
+        stats = get_decoder_stats()
+        stats.record_sniff(sniffed)
+
+        order = [sniffed] + [f for f in FALLBACK_ORDER if f != sniffed]
+        for index, format_name in enumerate(order):
+            decoder = self.decoders.get(format_name)
+            if decoder is None:
+                continue
+
+            start_time = time.perf_counter()
+            try:
+                nodes = decoder(content)
+            except Exception as e:
+                self.logger.debug(f"{self.name}: {format_name} 解码失败: {str(e)}")
+                nodes = []
+            stats.record_decode(
+                format_name, time.perf_counter() - start_time, bool(nodes), index > 0
+            )
+
+            if nodes:
+                if index > 0:
+                    self.logger.debug(
+                        f"{self.name}: 嗅探为 {sniffed}，回退到 {format_name} 解码成功"
+                    )
+                return nodes
+
+        return []
+
+
+# 全局统计实例
+_decoder_stats = None
+_decoder_stats_lock = threading.Lock()
+
+
+def get_decoder_stats() -> DecoderStats:
+    """获取订阅解码统计单例实例"""
+    global _decoder_stats
+    if _decoder_stats is None:
+        with _decoder_stats_lock:
+            if _decoder_stats is None:
+                _decoder_stats = DecoderStats()
+    return _decoder_stats
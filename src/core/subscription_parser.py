@@ -5,23 +5,35 @@
 负责解析各种格式的订阅链接，提取节点信息
 """
 
-import re
-import base64
 import requests
-import time
 from typing import List, Optional, Dict, Any
 from urllib.parse import unquote
 
 try:
-    import yaml
+    from src.utils import yaml_io
 
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
-    yaml = None
+    yaml_io = None
 
 from src.core.config_manager import get_config
+from src.core.content_sniffer import sniff_subscription
+from src.core.dead_link_cache import classify_failure, get_dead_link_cache
+from src.core.exception_handler import CircuitOpenError, ContentRejectedError
+from src.core.http_client import get_http_client
+from src.core.parse_cache import get_parse_cache
+from src.core.subscription_decoder import (
+    FORMAT_BASE64,
+    FORMAT_CLASH,
+    FORMAT_PLAIN,
+    FORMAT_URL_ENCODED,
+    SubscriptionDecoder,
+    decode_base64_text,
+)
 from src.utils.logger import get_logger
+from src.utils.node import Node
+from src.utils.node_scanner import NodeScanner
 
 
 class SubscriptionParser:
@@ -34,6 +46,7 @@ class SubscriptionParser:
         # 配置参数
         self.timeout = self.config_manager.base.REQUEST_TIMEOUT
         self.min_node_length = self.config_manager.base.MIN_NODE_LENGTH
+        self.max_bytes = self.config_manager.base.SUBSCRIPTION_MAX_BYTES
 
         # 节点协议模式
         self.node_patterns = [
@@ -47,6 +60,18 @@ class SubscriptionParser:
             r'socks5://[^\s<>"]+',  # SOCKS5
             r'reality://[^\s<>"]+',  # Reality
         ]
+        # 预编译的单次扫描器，结果与逐个模式 findall 一致
+        self.node_scanner = NodeScanner.from_patterns(self.node_patterns)
+
+        # 按嗅探格式分发的解码器
+        decoders = {
+            FORMAT_BASE64: self._parse_base64_content,
+            FORMAT_URL_ENCODED: self._parse_url_decoded_content,
+            FORMAT_PLAIN: self._parse_plain_content,
+        }
+        if HAS_YAML:
+            decoders[FORMAT_CLASH] = self._parse_yaml_json_content
+        self.decoder = SubscriptionDecoder(decoders, name="parser")
 
     def parse_subscription_url(
         self, url: str, session: Optional[requests.Session] = None
@@ -62,149 +87,144 @@ class SubscriptionParser:
             节点列表
         """
         try:
-            # 过滤掉HTML页面（文章页面，不是订阅内容）
-            if url.endswith((".htm", ".html", ".htm/", ".html/")):
-                self.logger.info(f"跳过HTML页面: {url}")
-                return []
-
-            # 获取订阅内容
-            content = self._fetch_subscription_content(url, session)
+            content = self.fetch_subscription(url, session)
             if content is None:
-                simplified_url = (
-                    url.replace("https://", "").replace("http://", "").split("/")[0]
-                    + "/"
-                    + "/".join(url.split("/")[-2:])
-                )
-                self.logger.warning(f"❌ {simplified_url}: 无法获取订阅内容")
                 return []
-            elif not content.strip():
-                simplified_url = (
-                    url.replace("https://", "").replace("http://", "").split("/")[0]
-                    + "/"
-                    + "/".join(url.split("/")[-2:])
-                )
-                self.logger.warning(f"❌ {simplified_url}: 订阅内容为空")
+
+            return self.parse_subscription_content(url, content)
+
+        except Exception as e:
+            self.logger.warning(f"❌ {self._simplify_url(url)}: 解析失败 - {str(e)}")
+            return []
+
+    def fetch_subscription(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        raise_errors: bool = False,
+    ) -> Optional[str]:
+        """
+        获取订阅链接的原始内容（网络IO部分）
+
+        Args:
+            url: 订阅链接URL
+            session: 可选的requests会话
+            raise_errors: 网络错误（超时、连接失败、HTTP错误）时抛出异常而不是返回None，
+                由调用方决定是否重试，最终失败后调用 record_fetch_failure 记录
+
+        Returns:
+            订阅内容，跳过或获取失败时返回None
+        """
+        # 过滤掉HTML页面（文章页面，不是订阅内容）
+        if url.endswith((".htm", ".html", ".htm/", ".html/")):
+            self.logger.info(f"跳过HTML页面: {url}")
+            return None
+
+        # 此前多次运行失败的链接在跳过期内不再请求
+        if get_dead_link_cache().should_skip(url):
+            return None
+
+        # 获取订阅内容
+        content = self._fetch_subscription_content(url, session, raise_errors)
+        if content is None:
+            self.logger.warning(f"❌ {self._simplify_url(url)}: 无法获取订阅内容")
+        return content
+
+    def record_fetch_failure(self, url: str, error: Exception):
+        """记录订阅获取的最终失败（用于 raise_errors=True 时重试耗尽后）"""
+        self.logger.error(f"获取订阅内容失败 {url}: {str(error)}")
+        get_dead_link_cache().record_failure(url, classify_failure(error))
+
+    def parse_subscription_content(self, url: str, content: str) -> List[str]:
+        """
+        解析已获取的订阅内容（CPU计算部分）
+
+        Args:
+            url: 订阅链接URL（仅用于日志）
+            content: 订阅原始内容
+
+        Returns:
+            节点列表
+        """
+        try:
+            dead_links = get_dead_link_cache()
+            if not content.strip():
+                self.logger.warning(f"❌ {self._simplify_url(url)}: 订阅内容为空")
+                dead_links.record_failure(url, "empty")
                 return []
 
-            # 解析不同格式的内容
-            nodes = self._parse_subscription_content(content)
+            # 解析不同格式的内容（内容相同时直接复用缓存的解析结果）
+            nodes = get_parse_cache().get_or_parse(
+                "parser", content, self._parse_subscription_content
+            )
 
             # 只在有节点时记录成功，否则记录失败
             if nodes:
-                # 显示简化的URL（保留域名和关键路径）
-                simplified_url = (
-                    url.replace("https://", "").replace("http://", "").split("/")[0]
-                    + "/"
-                    + "/".join(url.split("/")[-2:])
-                )
-                self.logger.info(f"✓ {simplified_url}: {len(nodes)} 个节点")
+                self.logger.info(f"✓ {self._simplify_url(url)}: {len(nodes)} 个节点")
+                dead_links.record_success(url)
             else:
-                simplified_url = (
-                    url.replace("https://", "").replace("http://", "").split("/")[0]
-                    + "/"
-                    + "/".join(url.split("/")[-2:])
-                )
-                self.logger.debug(f"⚠️ {simplified_url}: 0 个节点")
+                self.logger.debug(f"⚠️ {self._simplify_url(url)}: 0 个节点")
+                dead_links.record_failure(url, "no_nodes")
 
             return nodes
 
         except Exception as e:
-            simplified_url = (
-                url.replace("https://", "").replace("http://", "").split("/")[0]
-                + "/"
-                + "/".join(url.split("/")[-2:])
-            )
-            self.logger.warning(f"❌ {simplified_url}: 解析失败 - {str(e)}")
+            self.logger.warning(f"❌ {self._simplify_url(url)}: 解析失败 - {str(e)}")
             return []
 
+    @staticmethod
+    def _simplify_url(url: str) -> str:
+        """显示简化的URL（保留域名和关键路径）"""
+        return (
+            url.replace("https://", "").replace("http://", "").split("/")[0]
+            + "/"
+            + "/".join(url.split("/")[-2:])
+        )
+
     def _fetch_subscription_content(
-        self, url: str, session: Optional[requests.Session] = None
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        raise_errors: bool = False,
     ) -> Optional[str]:
         """获取订阅内容"""
         try:
-            if session:
-                # 使用提供的会话（通常来自BaseCollector）
-                response = session.get(url, timeout=self.timeout)
-            else:
-                # 创建带有合适头的会话
-                import os
-                import random
-
-                # 多种真实的浏览器User-Agent
-                real_user_agents = [
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0",
-                ]
-
-                temp_session = requests.Session()
-
-                # 根据环境选择User-Agent
-                if os.getenv("GITHUB_ACTIONS") == "true":
-                    ua = random.choice(real_user_agents)
-                else:
-                    ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-
-                temp_session.headers.update(
-                    {
-                        "User-Agent": ua,
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                        "Accept-Language": "zh-CN,zh;q=0.8,en;q=0.6",
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "Connection": "keep-alive",
-                    }
-                )
-                temp_session.verify = False
-                response = temp_session.get(url, timeout=self.timeout)
-
-            response.raise_for_status()
-            return response.text.strip()
+            if session is None:
+                # 使用共享连接池会话，复用keep-alive和TLS会话
+                session = get_http_client().get_session()
+
+            # 流式下载：超过大小上限或开头不像订阅内容时提前中止
+            content = get_http_client().download_text(
+                session,
+                url,
+                max_bytes=self.max_bytes,
+                validate=sniff_subscription,
+                timeout=self.timeout,
+            )
+            return content.strip()
 
+        except (CircuitOpenError, ContentRejectedError) as e:
+            self.logger.warning(f"⛔ 跳过订阅 {self._simplify_url(url)}: {str(e)}")
+            get_dead_link_cache().record_failure(url, classify_failure(e))
+            return None
         except Exception as e:
-            self.logger.error(f"获取订阅内容失败 {url}: {str(e)}")
+            if raise_errors:
+                raise
+            self.record_fetch_failure(url, e)
             return None
 
     def _parse_subscription_content(self, content: str) -> List[str]:
         """
         解析订阅内容，支持多种格式
 
-        解析顺序：
-        1. YAML/JSON格式（Clash配置）
-        2. Base64编码
-        3. URL解码
-        4. 直接文本解析
+        先嗅探格式（Clash YAML/JSON、Base64、URL编码、明文）并只调用对应的解码器，
+        解码失败时按 YAML/JSON -> Base64 -> URL解码 -> 明文 的顺序回退
         """
-        nodes = []
-
-        # 1. 尝试YAML/JSON格式解析
-        if HAS_YAML:
-            yaml_nodes = self._parse_yaml_json_content(content)
-            if yaml_nodes:
-                nodes.extend(yaml_nodes)
-                return nodes  # YAML成功则直接返回
-
-        # 2. 尝试Base64解码
-        base64_nodes = self._parse_base64_content(content)
-        if base64_nodes:
-            self.logger.debug(f"Base64解码成功，提取到 {len(base64_nodes)} 个节点")
-            return base64_nodes  # Base64成功则直接返回
-
-        # 3. 尝试URL解码
-        url_nodes = self._parse_url_decoded_content(content)
-        if url_nodes:
-            self.logger.debug(f"URL解码成功，提取到 {len(url_nodes)} 个节点")
-            return url_nodes  # URL解码成功则直接返回
-
-        # 4. 直接从文本提取节点
-        direct_nodes = self._extract_nodes_from_text(content)
-        nodes.extend(direct_nodes)
-
-        # 去重并过滤
-        unique_nodes = self._filter_and_deduplicate(nodes)
+        return self.decoder.decode(content)
 
-        return unique_nodes
+    def _parse_plain_content(self, content: str) -> List[str]:
+        """直接从明文内容提取节点（去重并过滤）"""
+        return self._filter_and_deduplicate(self._extract_nodes_from_text(content))
 
     def _parse_yaml_json_content(self, content: str) -> List[str]:
         """解析YAML/JSON格式内容（Clash配置）"""
@@ -217,17 +237,6 @@ class SubscriptionParser:
             if not stripped_content:
                 return []
 
-            # 如果内容看起来像是纯文本（包含大量节点协议），跳过YAML解析
-            node_count = len(
-                re.findall(
-                    r"(?:vmess|vless|trojan|ss|ssr|hysteria)://",
-                    stripped_content,
-                    re.IGNORECASE,
-                )
-            )
-            if node_count > 5:  # 如果包含5个以上节点协议，认为这是纯文本
-                return []
-
             # 检查是否可能是YAML格式（包含YAML特征）
             yaml_indicators = [":", "-", "{", "}", "[", "]"]
             has_yaml_features = any(
@@ -239,7 +248,7 @@ class SubscriptionParser:
                 return []
 
             # 尝试解析为YAML
-            data = yaml.safe_load(stripped_content)
+            data = yaml_io.load(stripped_content)
 
             # 处理Clash配置文件格式
             if isinstance(data, dict) and "proxies" in data:
@@ -271,17 +280,8 @@ class SubscriptionParser:
     def _parse_base64_content(self, content: str) -> List[str]:
         """解析Base64编码的内容"""
         try:
-            # 标准化Base64内容
-            clean_content = content.strip()
-
-            # 补齐padding
-            padding_needed = (-len(clean_content)) % 4
-            if padding_needed:
-                clean_content += "=" * padding_needed
-
-            # 解码
-            decoded_bytes = base64.b64decode(clean_content)
-            decoded_text = decoded_bytes.decode("utf-8", errors="ignore")
+            # 解码（自动补齐padding）
+            decoded_text = decode_base64_text(content)
 
             # 从解码内容提取节点
             nodes = self._extract_nodes_from_text(decoded_text)
@@ -297,8 +297,6 @@ class SubscriptionParser:
     def _parse_url_decoded_content(self, content: str) -> List[str]:
         """解析URL编码的内容"""
         try:
-            from urllib.parse import unquote
-
             decoded_content = unquote(content)
             if decoded_content != content:  # 确实发生了解码
                 nodes = self._extract_nodes_from_text(decoded_content)
@@ -315,15 +313,10 @@ class SubscriptionParser:
         """从文本中提取节点"""
         nodes = []
 
-        for pattern in self.node_patterns:
-            try:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    node = match.strip()
-                    if len(node) >= self.min_node_length:
-                        nodes.append(node)
-            except Exception as e:
-                self.logger.debug(f"节点模式匹配失败: {pattern} - {str(e)}")
+        for match in self.node_scanner.scan(text):
+            node = match.strip()
+            if len(node) >= self.min_node_length:
+                nodes.append(node)
 
         return nodes
 
@@ -344,244 +337,12 @@ class SubscriptionParser:
         return nodes
 
     def _convert_single_clash_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换单个Clash代理配置为URI"""
-        proxy_type = proxy.get("type", "").lower()
-
-        if proxy_type == "vmess":
-            return self._convert_vmess_proxy(proxy)
-        elif proxy_type == "vless":
-            return self._convert_vless_proxy(proxy)
-        elif proxy_type == "trojan":
-            return self._convert_trojan_proxy(proxy)
-        elif proxy_type == "ss":
-            return self._convert_ss_proxy(proxy)
-        elif proxy_type in ["hysteria", "hysteria2"]:
-            return self._convert_hysteria_proxy(proxy)
-        elif proxy_type == "socks5":
-            return self._convert_socks5_proxy(proxy)
-        else:
-            self.logger.debug(f"不支持的代理类型: {proxy_type}")
-            return None
-
-    def _convert_vmess_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换VMess代理为URI"""
-        try:
-            import json
-
-            vmess_config = {
-                "v": "2",
-                "ps": proxy.get("name", ""),
-                "add": proxy.get("server", ""),
-                "port": str(proxy.get("port", "")),
-                "id": proxy.get("uuid", proxy.get("id", "")),
-                "aid": proxy.get("alterId", 0),
-                "net": proxy.get("network", "tcp"),
-                "type": proxy.get("cipher", "auto"),
-                "host": proxy.get("servername", ""),
-                "path": proxy.get("path", ""),
-                "tls": "tls" if proxy.get("tls") else "",
-            }
-
-            config_json = json.dumps(vmess_config, separators=(",", ":"))
-            config_b64 = base64.b64encode(config_json.encode()).decode()
-
-            uri = f"vmess://{config_b64}"
-            name = proxy.get("name", "")
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"VMess转换失败: {str(e)}")
-            return None
-
-    def _convert_vless_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换VLESS代理为URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            uuid = proxy.get("uuid", "")
-            name = proxy.get("name", "")
-
-            if not all([server, port, uuid]):
-                return None
-
-            uri = f"vless://{uuid}@{server}:{port}"
-
-            params = []
-            network = proxy.get("network", "tcp")
-            if network:
-                params.append(f"type={network}")
-
-            security = proxy.get("security", "")
-            if security:
-                params.append(f"security={security}")
-
-            encryption = proxy.get("encryption", "none")
-            if encryption and encryption != "none":
-                params.append(f"encryption={encryption}")
-
-            if proxy.get("tls"):
-                params.append("security=tls")
-
-            servername = proxy.get("servername", proxy.get("sni", ""))
-            if servername:
-                params.append(f"sni={servername}")
-
-            fp = proxy.get("client-fingerprint", proxy.get("fp", ""))
-            if fp:
-                params.append(f"fp={fp}")
-
-            # WebSocket参数
-            if network in ["ws", "grpc"]:
-                ws_opts = proxy.get("ws-opts", {})
-                if ws_opts:
-                    host = ws_opts.get("headers", {}).get("Host", "")
-                    if host:
-                        params.append(f"host={host}")
-
-                    path = ws_opts.get("path", "")
-                    if path:
-                        params.append(f"path={path}")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"VLESS转换失败: {str(e)}")
-            return None
-
-    def _convert_trojan_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换Trojan代理为URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            password = proxy.get("password", "")
-            name = proxy.get("name", "")
-
-            if not all([server, port, password]):
-                return None
-
-            uri = f"trojan://{password}@{server}:{port}"
-
-            params = []
-            sni = proxy.get("sni", proxy.get("servername", ""))
-            if sni:
-                params.append(f"sni={sni}")
-
-            if proxy.get("skip-cert-verify"):
-                params.append("allowInsecure=1")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"Trojan转换失败: {str(e)}")
-            return None
-
-    def _convert_ss_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换Shadowsocks代理为URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            method = proxy.get("cipher", "aes-256-gcm")
-            password = proxy.get("password", "")
-            name = proxy.get("name", "")
-
-            if not all([server, port, method, password]):
-                return None
-
-            # Base64编码 method:password
-            auth = f"{method}:{password}"
-            auth_b64 = base64.b64encode(auth.encode()).decode()
-
-            uri = f"ss://{auth_b64}@{server}:{port}"
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"Shadowsocks转换失败: {str(e)}")
-            return None
-
-    def _convert_hysteria_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换Hysteria代理为URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            protocol = proxy.get("protocol", "udp")
-            name = proxy.get("name", "")
-
-            if not all([server, port]):
-                return None
-
-            auth = proxy.get("auth", proxy.get("password", ""))
-            obfs = proxy.get("obfs", "")
-            obfs_password = proxy.get("obfs-password", "")
-
-            uri = f"hysteria://{server}:{port}"
-
-            params = []
-            if auth:
-                params.append(f"auth={auth}")
-            if protocol:
-                params.append(f"protocol={protocol}")
-            if obfs:
-                params.append(f"obfs={obfs}")
-            if obfs_password:
-                params.append(f"obfs-password={obfs_password}")
-
-            if params:
-                uri += "?" + "&".join(params)
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"Hysteria转换失败: {str(e)}")
-            return None
-
-    def _convert_socks5_proxy(self, proxy: Dict[str, Any]) -> Optional[str]:
-        """转换SOCKS5代理为URI"""
-        try:
-            server = proxy.get("server", "")
-            port = proxy.get("port", "")
-            username = proxy.get("username", "")
-            password = proxy.get("password", "")
-            name = proxy.get("name", "")
-
-            if not all([server, port]):
-                return None
-
-            uri = f"socks5://{server}:{port}"
-
-            if username and password:
-                auth_b64 = base64.b64encode(f"{username}:{password}".encode()).decode()
-                uri = f"socks5://{auth_b64}@{server}:{port}"
-
-            if name:
-                uri += f"#{name}"
-
-            return uri
-
-        except Exception as e:
-            self.logger.debug(f"SOCKS5转换失败: {str(e)}")
+        """转换单个Clash代理配置为规范URI"""
+        node = Node.from_clash(proxy)
+        if node is None:
+            self.logger.debug(f"不支持的代理类型: {proxy.get('type', '')}")
             return None
+        return node.to_uri()
 
     def _filter_and_deduplicate(self, nodes: List[str]) -> List[str]:
         """过滤和去重节点"""
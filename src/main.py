@@ -26,6 +26,11 @@ def main():
     parser.add_argument("--sites", nargs="+", help="指定要收集的网站")
     parser.add_argument("--list-sites", action="store_true", help="列出所有可用网站")
     parser.add_argument("--plugin-info", action="store_true", help="显示插件信息")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式：今日已记录文章和订阅链接的网站跳过抓取，只重新获取订阅内容",
+    )
     parser.add_argument(
         "--update-github",
         action="store_true",
@@ -62,7 +67,9 @@ def main():
 
         # 执行节点收集（两阶段流程）
         logger.info("开始执行节点收集任务（两阶段流程）...")
-        results = collector_manager.collect_all_sites(args.sites)
+        results = collector_manager.collect_all_sites(
+            args.sites, incremental=args.incremental
+        )
 
         if not results:
             logger.error("收集失败，没有获取到任何结果")
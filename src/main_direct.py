@@ -6,7 +6,6 @@
 
 import sys
 import os
-import time
 import argparse
 import traceback
 from datetime import datetime
@@ -131,11 +130,6 @@ class NodeCollector:
                 self.logger.error(f"{site_name} 收集失败: {str(e)}")
                 continue
 
-            # 添加延迟避免请求过快
-            from config.settings import REQUEST_DELAY
-
-            time.sleep(REQUEST_DELAY)
-
         # 去重
         unique_nodes = list(set(all_nodes))
         self.logger.info(f"总计收集到 {len(unique_nodes)} 个去重节点")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量测速计划
+根据节点索引中的历史测试结果划分本次需要测试的节点：
+新节点优先完整测试，复验窗口内通过过测试的节点只做TCP复验，
+连续失败的节点在退避时间内跳过，其余节点重新完整测试
+"""
+
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config_manager import get_config
+from src.core.node_index import STATUS_FAILED, STATUS_PASSED, NodeIndex, get_node_index
+from src.utils.dns_resolver import get_dns_resolver
+from src.utils.fingerprint import node_fingerprint
+from src.utils.logger import get_logger
+from src.utils.node import parse_node
+
+# 基于UDP的协议，TCP连接无法反映可用性，始终完整测试
+UDP_PROTOCOLS = ("hysteria", "hysteria2", "tuic")
+
+
+@dataclass
+class TestPlan:
+    """增量测速计划"""
+
+    new: List[str] = field(default_factory=list)  # 没有测试记录的节点
+    retest: List[str] = field(default_factory=list)  # 需要重新完整测试的已知节点
+    revalidate: List[str] = field(default_factory=list)  # 复验窗口内通过过测试的节点
+    skipped: List[str] = field(default_factory=list)  # 连续失败且退避未到期的节点
+
+    @property
+    def full_test(self) -> List[str]:
+        """需要完整测试的节点（新节点在前）"""
+        return self.new + self.retest
+
+    def summary(self) -> str:
+        return (
+            f"新节点 {len(self.new)} 个，重新测试 {len(self.retest)} 个，"
+            f"TCP复验 {len(self.revalidate)} 个，退避跳过 {len(self.skipped)} 个"
+        )
+
+
+def backoff_seconds(fail_streak: int) -> float:
+    """
+    计算连续失败后的跳过时间
+
+    连续失败次数达到 SPEEDTEST_FAILURE_THRESHOLD 时开始退避，之后每多失败一次加倍。
+    """
+    config = get_config().base
+    if fail_streak < config.SPEEDTEST_FAILURE_THRESHOLD:
+        return 0
+    exponent = min(fail_streak - config.SPEEDTEST_FAILURE_THRESHOLD, 16)
+    return min(
+        config.SPEEDTEST_BACKOFF_BASE * (2 ** exponent), config.SPEEDTEST_BACKOFF_MAX
+    )
+
+
+def plan_incremental_test(
+    nodes: List[str],
+    node_index: Optional[NodeIndex] = None,
+    now: Optional[float] = None,
+) -> TestPlan:
+    """
+    根据节点索引中的测试记录生成测速计划
+
+    同一指纹的节点只保留第一个；无法解析的节点按新节点处理。
+
+    Args:
+        nodes: 节点URI列表
+        node_index: 节点索引，默认为全局实例
+        now: 当前时间
+
+    Returns:
+        测速计划
+    """
+    config = get_config().base
+    node_index = node_index or get_node_index()
+    now = now or time.time()
+
+    fingerprints: Dict[str, str] = {}
+    unparsed = []
+    for node in nodes:
+        fingerprint = node_fingerprint(node)
+        if fingerprint is None:
+            unparsed.append(node)
+        else:
+            fingerprints.setdefault(fingerprint, node)
+
+    records = node_index.get_nodes(list(fingerprints))
+    plan = TestPlan(new=unparsed)
+    retest: List[Tuple[float, str]] = []
+
+    for fingerprint, node in fingerprints.items():
+        record = records.get(fingerprint)
+        if record is None or record.get("last_tested") is None:
+            plan.new.append(node)
+            continue
+
+        age = now - record["last_tested"]
+        status = record.get("test_status")
+        parsed = parse_node(node)
+
+        if (
+            status == STATUS_PASSED
+            and age <= config.SPEEDTEST_REVALIDATE_WINDOW
+            and parsed.protocol not in UDP_PROTOCOLS
+        ):
+            plan.revalidate.append(node)
+        elif status == STATUS_FAILED and age < backoff_seconds(record.get("fail_streak", 0)):
+            plan.skipped.append(node)
+        else:
+            retest.append((record["last_tested"], node))
+
+    # 最久未测试的节点优先
+    plan.retest = [node for _, node in sorted(retest, key=lambda item: item[0])]
+    return plan
+
+
+def _tcp_connect(host: str, port: int, timeout: float) -> bool:
+    """TCP连接测试（使用批量解析的地址）"""
+    address = get_dns_resolver().lookup(host) or host
+    try:
+        with socket.create_connection((address, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def revalidate_proxies(
+    proxies: List[dict],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[List[dict], List[dict]]:
+    """
+    对Clash代理做TCP复验
+
+    Args:
+        proxies: Clash代理列表
+        max_workers: 并发数
+        timeout: 单个连接的超时时间（秒）
+
+    Returns:
+        (连通的代理, 无法连通或域名无法解析的代理)
+    """
+    config = get_config().base
+    logger = get_logger("incremental_test")
+    max_workers = max_workers or config.SPEEDTEST_REVALIDATE_WORKERS
+    timeout = timeout or config.SPEEDTEST_REVALIDATE_TIMEOUT
+
+    resolvable, unresolvable = get_dns_resolver().filter_resolvable(
+        proxies, lambda proxy: proxy.get("server")
+    )
+    if not resolvable:
+        return [], unresolvable
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(resolvable))) as executor:
+        results = list(
+            executor.map(
+                lambda proxy: _tcp_connect(str(proxy["server"]), int(proxy["port"]), timeout),
+                resolvable,
+            )
+        )
+
+    alive = [proxy for proxy, ok in zip(resolvable, results) if ok]
+    dead = [proxy for proxy, ok in zip(resolvable, results) if not ok] + unresolvable
+    logger.info(f"TCP复验: {len(alive)}/{len(proxies)} 个节点连通")
+    return alive, dead
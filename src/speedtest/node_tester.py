@@ -12,16 +12,16 @@ import ssl
 import time
 import json
 import re
-import base64
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
-from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.utils.node import parse_node
+
 try:
     from src.utils.logger import get_logger
 except ImportError:
@@ -53,180 +53,32 @@ class NodeTester:
 
     def parse_node(self, node_url: str) -> Optional[Dict[str, Any]]:
         """解析节点URL"""
-        try:
-            if node_url.startswith("vmess://"):
-                return self._parse_vmess(node_url)
-            elif node_url.startswith("vless://"):
-                return self._parse_vless(node_url)
-            elif node_url.startswith("trojan://"):
-                return self._parse_trojan(node_url)
-            elif node_url.startswith("ss://"):
-                return self._parse_shadowsocks(node_url)
-            elif node_url.startswith("ssr://"):
-                return self._parse_shadowsocksr(node_url)
-            else:
-                return None
-        except Exception as e:
-            self.logger.error(f"解析节点失败 {node_url}: {str(e)}")
-            return None
-
-    def _parse_vmess(self, vmess_url: str) -> Optional[Dict[str, Any]]:
-        """解析VMess节点"""
-        try:
-            # 移除vmess://前缀
-            encoded = vmess_url[8:]
-
-            # 修复base64填充
-            missing_padding = len(encoded) % 4
-            if missing_padding:
-                encoded += "=" * (4 - missing_padding)
-
-            # 解码JSON
-            decoded = base64.b64decode(encoded).decode("utf-8")
-            config = json.loads(decoded)
-
-            return {
-                "type": "vmess",
-                "host": config.get("add"),
-                "port": int(config.get("port", 443)),
-                "uuid": config.get("id"),
-                "alterId": int(config.get("aid", 0)),
-                "security": config.get("tls", "none"),
-                "network": config.get("net", "tcp"),
-                "path": config.get("path", "/"),
-                "host_header": config.get("host", ""),
-                "ps": config.get("ps", ""),
-                "raw_config": config,
-            }
-        except Exception as e:
-            self.logger.error(f"VMess解析失败: {str(e)}")
-            return None
-
-    def _parse_vless(self, vless_url: str) -> Optional[Dict[str, Any]]:
-        """解析VLESS节点"""
-        try:
-            parsed = urlparse(vless_url)
-
-            return {
-                "type": "vless",
-                "host": parsed.hostname,
-                "port": parsed.port or 443,
-                "uuid": parsed.username,
-                "security": parsed.query.get("security", "none"),
-                "network": parsed.query.get("type", "tcp"),
-                "path": parsed.path or "/",
-                "host_header": parsed.query.get("host", ""),
-                "ps": parsed.fragment or "",
-                "raw_url": vless_url,
-            }
-        except Exception as e:
-            self.logger.error(f"VLESS解析失败: {str(e)}")
-            return None
-
-    def _parse_trojan(self, trojan_url: str) -> Optional[Dict[str, Any]]:
-        """解析Trojan节点"""
-        try:
-            parsed = urlparse(trojan_url)
-
-            return {
-                "type": "trojan",
-                "host": parsed.hostname,
-                "port": parsed.port or 443,
-                "password": parsed.username,
-                "security": "tls",
-                "network": "tcp",
-                "path": parsed.path or "/",
-                "host_header": parsed.query.get("sni", ""),
-                "ps": parsed.fragment or "",
-                "raw_url": trojan_url,
-            }
-        except Exception as e:
-            self.logger.error(f"Trojan解析失败: {str(e)}")
-            return None
-
-    def _parse_shadowsocks(self, ss_url: str) -> Optional[Dict[str, Any]]:
-        """解析Shadowsocks节点"""
-        try:
-            # 处理base64编码的SS
-            if "@" in ss_url:
-                # userinfo@host:port 格式
-                parsed = urlparse(ss_url)
-                method = parsed.username
-                password = parsed.password
-                host = parsed.hostname
-                port = parsed.port
-            else:
-                # base64编码格式
-                encoded = ss_url[5:]  # 移除ss://
-                missing_padding = len(encoded) % 4
-                if missing_padding:
-                    encoded += "=" * (4 - missing_padding)
-
-                decoded = base64.b64decode(encoded).decode("utf-8")
-                if "@" in decoded:
-                    method_password, host_port = decoded.split("@")
-                    method, password = method_password.split(":")
-                    host, port = host_port.split(":")
-                else:
-                    return None
-
-            return {
-                "type": "ss",
-                "host": host,
-                "port": int(port),
-                "method": method,
-                "password": password,
-                "security": "none",
-                "network": "tcp",
-                "path": "/",
-                "host_header": "",
-                "ps": "",
-                "raw_url": ss_url,
-            }
-        except Exception as e:
-            self.logger.error(f"Shadowsocks解析失败: {str(e)}")
+        node = parse_node(node_url)
+        if node is None or node.protocol not in ("vmess", "vless", "trojan", "ss", "ssr"):
+            self.logger.error(f"解析节点失败 {node_url}")
             return None
 
-    def _parse_shadowsocksr(self, ssr_url: str) -> Optional[Dict[str, Any]]:
-        """解析ShadowsocksR节点"""
-        try:
-            # SSR格式: ssr://base64(info)
-            encoded = ssr_url[6:]  # 移除ssr://
-            missing_padding = len(encoded) % 4
-            if missing_padding:
-                encoded += "=" * (4 - missing_padding)
-
-            decoded = base64.b64decode(encoded).decode("utf-8")
-            parts = decoded.split("/")
-
-            if len(parts) < 6:
-                return None
-
-            server = parts[0]
-            port = int(parts[1])
-            protocol = parts[2]
-            method = parts[3]
-            obfs = parts[4]
-            password = base64.b64decode(parts[5] + "==").decode("utf-8")
-
-            return {
-                "type": "ssr",
-                "host": server,
-                "port": port,
-                "protocol": protocol,
-                "method": method,
-                "obfs": obfs,
-                "password": password,
-                "security": "none",
-                "network": "tcp",
-                "path": "/",
-                "host_header": "",
-                "ps": "",
-                "raw_url": ssr_url,
-            }
-        except Exception as e:
-            self.logger.error(f"ShadowsocksR解析失败: {str(e)}")
-            return None
+        node_info = {
+            "type": node.protocol,
+            "host": node.host,
+            "port": node.port,
+            "security": node.security or ("tls" if node.protocol == "trojan" else "none"),
+            "network": node.network,
+            "path": node.path or "/",
+            "host_header": node.host_header or node.sni,
+            "ps": node.remark,
+            "raw_url": node_url,
+        }
+        if node.protocol in ("vmess", "vless"):
+            node_info["uuid"] = node.credential
+        else:
+            node_info["password"] = node.credential
+        if node.protocol in ("ss", "ssr"):
+            node_info["method"] = node.method
+        if node.protocol == "ssr":
+            node_info["protocol"] = node.params.get("protocol", "origin")
+            node_info["obfs"] = node.params.get("obfs", "plain")
+        return node_info
 
     async def test_node_connectivity(self, node_info: Dict[str, Any]) -> Dict[str, Any]:
         """测试节点连接性"""
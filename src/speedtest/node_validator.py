@@ -17,7 +17,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
 from src.core.config_manager import get_config
+from src.utils.dns_resolver import get_dns_resolver
 from src.utils.logger import get_logger
+from src.utils.node import parse_node
 
 
 @dataclass
@@ -73,6 +75,16 @@ class AdvancedNodeValidator:
         """批量验证节点"""
         self.logger.info(f"开始验证 {len(node_urls)} 个节点")
         start_time = time.time()
+        total_count = len(node_urls)
+
+        # 测试前批量解析所有节点域名，域名无法解析的节点不再进行连接测试
+        loop = asyncio.get_running_loop()
+        node_urls, unresolvable_urls = await loop.run_in_executor(
+            self.executor,
+            get_dns_resolver().filter_resolvable,
+            node_urls,
+            lambda node_url: (self.parse_node_url(node_url) or {}).get("host"),
+        )
 
         # 创建任务
         tasks = []
@@ -116,11 +128,28 @@ class AdvancedNodeValidator:
                 )
                 valid_results.append(error_result)
 
+        for node_url in unresolvable_urls:
+            valid_results.append(
+                NodeTestResult(
+                    url=node_url,
+                    is_online=False,
+                    response_time=None,
+                    download_speed=None,
+                    upload_speed=None,
+                    country=None,
+                    isp=None,
+                    streaming_support={},
+                    quality_score=0.0,
+                    test_time=datetime.now(),
+                    error_message="域名无法解析",
+                )
+            )
+
         duration = time.time() - start_time
         online_count = sum(1 for r in valid_results if r.is_online)
 
         self.logger.info(
-            f"节点验证完成: {online_count}/{len(node_urls)} 在线，耗时 {duration:.2f}s"
+            f"节点验证完成: {online_count}/{total_count} 在线，耗时 {duration:.2f}s"
         )
 
         return valid_results
@@ -206,57 +235,22 @@ class AdvancedNodeValidator:
 
     def parse_node_url(self, node_url: str) -> Optional[Dict[str, Any]]:
         """解析节点URL"""
-        try:
-            import urllib.parse as urlparse
-            import base64
-
-            if node_url.startswith("vmess://"):
-                # VMess节点
-                data = base64.b64decode(node_url[8:] + "=" * (-len(node_url[8:]) % 4))
-                config = json.loads(data)
-                return {
-                    "type": "vmess",
-                    "host": config.get("add"),
-                    "port": config.get("port"),
-                    "protocol": config.get("net", "tcp"),
-                    "path": config.get("path", ""),
-                    "tls": config.get("tls", "none"),
-                    "raw_config": config,
-                }
-
-            elif node_url.startswith(("vless://", "trojan://")):
-                # VLESS/Trojan节点
-                parsed = urlparse.urlparse(node_url)
-                return {
-                    "type": "vless" if node_url.startswith("vless://") else "trojan",
-                    "host": parsed.hostname,
-                    "port": parsed.port,
-                    "path": parsed.path,
-                    "params": dict(urlparse.parse_qs(parsed.query)),
-                    "raw_url": node_url,
-                }
-
-            elif node_url.startswith("ss://"):
-                # Shadowsocks节点
-                parsed = urlparse.urlparse(node_url)
-                user_info = parsed.username
-                if "@" in parsed.netloc:
-                    user_info = parsed.netloc.split("@")[0]
-
-                return {
-                    "type": "ss",
-                    "host": parsed.hostname,
-                    "port": parsed.port,
-                    "cipher": user_info.split(":")[0] if user_info else "",
-                    "password": user_info.split(":")[1] if ":" in user_info else "",
-                    "raw_url": node_url,
-                }
-
+        node = parse_node(node_url)
+        if node is None:
             return None
 
-        except Exception as e:
-            self.logger.error(f"解析节点URL失败: {str(e)}")
-            return None
+        return {
+            "type": node.protocol,
+            "host": node.host,
+            "port": node.port,
+            "protocol": node.network,
+            "path": node.path,
+            "tls": node.security or "none",
+            "cipher": node.method,
+            "password": node.credential,
+            "params": dict(node.params),
+            "raw_url": node_url,
+        }
 
     async def test_connection(self, node_info: Dict[str, Any]) -> Dict[str, Any]:
         """测试节点连接"""
@@ -308,8 +302,11 @@ class AdvancedNodeValidator:
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
 
+            # 使用批量解析的结果连接，SNI仍使用原域名
+            address = get_dns_resolver().lookup(host) or host
+
             wrapped_socket = context.wrap_socket(sock, server_hostname=host)
-            wrapped_socket.connect((host, port))
+            wrapped_socket.connect((address, port))
 
             wrapped_socket.close()
             return True
@@ -7,14 +7,16 @@
 
 import sys
 import os
-import yaml
 import time
 import socket
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# 添加项目路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils import yaml_io
+from src.utils.dns_resolver import get_dns_resolver
 
 def test_node_speed(proxy: dict, timeout: int = 5) -> dict:
     """
@@ -41,10 +43,13 @@ def test_node_speed(proxy: dict, timeout: int = 5) -> dict:
     
     try:
         # 测试延迟
+        # 使用批量解析的结果，延迟不包含DNS查询时间
+        address = get_dns_resolver().lookup(server) or server
+
         start_time = time.time()
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(timeout)
-        sock.connect((server, port))
+        sock.connect((address, port))
         end_time = time.time()
         
         latency = (end_time - start_time) * 1000  # 转换为毫秒
@@ -87,12 +92,20 @@ def main():
     # 读取节点文件
     print(f'读取节点文件: {args.input}')
     with open(args.input, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        data = yaml_io.load(f)
     
     proxies = data.get('proxies', [])
     print(f'节点数量: {len(proxies)}')
     print()
     
+    # 批量解析节点域名，无法解析的节点不参与测速（保留在输出中，不添加速度信息）
+    test_proxies, unresolvable = get_dns_resolver().filter_resolvable(
+        proxies, lambda proxy: proxy.get('server')
+    )
+    if unresolvable:
+        print(f'域名无法解析: {len(unresolvable)} 个节点，跳过测速')
+        print()
+    
     # 测试节点速度
     print(f'开始测速（并发数: {args.concurrent}，超时: {args.timeout}秒）')
     print()
@@ -101,7 +114,7 @@ def main():
     completed = 0
     
     with ThreadPoolExecutor(max_workers=args.concurrent) as executor:
-        futures = {executor.submit(test_node_speed, proxy, args.timeout): proxy for proxy in proxies}
+        futures = {executor.submit(test_node_speed, proxy, args.timeout): proxy for proxy in test_proxies}
         
         for future in as_completed(futures):
             completed += 1
@@ -109,8 +122,8 @@ def main():
             speed_results.append(result)
             
             # 显示进度
-            progress = completed / len(proxies) * 100
-            print(f'\r进度: [{"=" * int(progress / 5)}{" " * (20 - int(progress / 5))}] {progress:.1f}% ({completed}/{len(proxies)})', end='', flush=True)
+            progress = completed / len(test_proxies) * 100
+            print(f'\r进度: [{"=" * int(progress / 5)}{" " * (20 - int(progress / 5))}] {progress:.1f}% ({completed}/{len(test_proxies)})', end='', flush=True)
     
     print()
     print()
@@ -139,7 +152,7 @@ def main():
     
     print(f'保存结果到: {args.output}')
     with open(args.output, 'w', encoding='utf-8') as f:
-        yaml.dump(output_data, f, allow_unicode=True, default_flow_style=False)
+        yaml_io.dump_clash_config(output_data, f)
     
     print()
     print('前10个节点（带速度信息）:')
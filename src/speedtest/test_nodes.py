@@ -8,7 +8,6 @@ import sys
 import os
 import time
 import concurrent.futures
-from urllib.parse import urlparse
 import requests
 from requests.exceptions import RequestException
 
@@ -18,7 +17,9 @@ project_root = os.path.dirname(
 )
 sys.path.insert(0, project_root)
 
+from src.utils.dns_resolver import get_dns_resolver
 from src.utils.logger import get_logger
+from src.utils.node import parse_node
 
 # 测试目标网站
 TEST_SITES = [
@@ -43,84 +44,16 @@ class NodeTester:
 
     def extract_host_port(self, node):
         """从节点中提取主机和端口"""
-        try:
-            if node.startswith("vmess://"):
-                import base64
-                import json
-
-                data = node[8:]
-                data += "=" * (-len(data) % 4)
-                decoded = base64.b64decode(data).decode("utf-8")
-                config = json.loads(decoded)
-                return config.get("add"), config.get("port")
-            elif node.startswith("vless://") or node.startswith("trojan://"):
-                parsed = urlparse(node)
-                return parsed.hostname, parsed.port
-            elif node.startswith("ss://"):
-                parsed = urlparse(node)
-                if parsed.hostname and parsed.port:
-                    return parsed.hostname, parsed.port
-                # 尝试 base64 解码
-                try:
-                    import base64
-
-                    data = node[5:]
-                    data += "=" * (-len(data) % 4)
-                    decoded = base64.b64decode(data).decode("utf-8")
-                    if "@" in decoded:
-                        _, server_part = decoded.rsplit("@", 1)
-                        if ":" in server_part:
-                            host, port_str = server_part.rsplit(":", 1)
-                            return host, int(port_str)
-                except:
-                    pass
-            return None, None
-        except Exception as e:
-            self.logger.error(f"提取主机端口失败: {str(e)}")
+        parsed = parse_node(node)
+        if not parsed:
             return None, None
+        return parsed.host, parsed.port
 
     def get_node_type(self, node):
         """从节点中提取传输类型"""
-        try:
-            node_type = None
-
-            if node.startswith("vmess://"):
-                # vmess节点需要Base64解码
-                import base64
-                import json
-
-                data = node[8:]
-                data += "=" * (-len(data) % 4)
-                decoded = base64.b64decode(data).decode("utf-8")
-                config = json.loads(decoded)
-                node_type = config.get("net", "tcp")  # 默认为tcp
-
-            elif (
-                node.startswith("vless://")
-                or node.startswith("trojan://")
-                or node.startswith("ss://")
-            ):
-                # 从URL查询参数中提取type
-                parsed = urlparse(node)
-                if parsed.query:
-                    # 解析查询参数
-                    params = {}
-                    for param in parsed.query.split("&"):
-                        if "=" in param:
-                            key, value = param.split("=", 1)
-                            params[key] = value
-
-                    node_type = params.get("type", "tcp")  # 默认为tcp
-
-            # 如果没有获取到类型，默认为tcp
-            if not node_type:
-                node_type = "tcp"
-
-            return node_type.lower()
-
-        except Exception as e:
-            self.logger.error(f"提取节点类型失败: {str(e)}")
-            return "tcp"  # 出错时默认为tcp
+        parsed = parse_node(node)
+        # 无法解析时默认为tcp
+        return parsed.network.lower() if parsed else "tcp"
 
     def is_http_proxy_supported(self, node_type):
         """判断节点类型是否支持HTTP代理"""
@@ -133,9 +66,12 @@ class NodeTester:
         try:
             import socket
 
+            # 使用批量解析的结果，避免每次连接都单独解析域名
+            address = get_dns_resolver().lookup(host) or host
+
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(TIMEOUT)
-            result = sock.connect_ex((host, port))
+            result = sock.connect_ex((address, port))
             sock.close()
             return result == 0
         except Exception:
@@ -190,6 +126,12 @@ class NodeTester:
 
         start_time = time.time()
 
+        # 测试前批量解析所有节点域名，剔除无法解析的节点
+        total_count = len(nodes)
+        nodes, unresolvable_nodes = get_dns_resolver().filter_resolvable(
+            nodes, lambda node: self.extract_host_port(node)[0]
+        )
+
         with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
             # 提交所有任务
             future_to_node = {
@@ -251,10 +193,12 @@ class NodeTester:
 
         self.logger.info("=" * 50)
         self.logger.info("测试完成！")
-        self.logger.info(f"总节点数: {len(nodes)}")
+        self.logger.info(f"总节点数: {total_count}")
         self.logger.info(f"有效节点: {len(valid_nodes)}")
-        self.logger.info(f"无效节点: {len(nodes) - len(valid_nodes)}")
-        self.logger.info(f"通过率: {len(valid_nodes) / len(nodes) * 100:.1f}%")
+        self.logger.info(f"无效节点: {total_count - len(valid_nodes)}")
+        if unresolvable_nodes:
+            self.logger.info(f"域名无法解析: {len(unresolvable_nodes)}")
+        self.logger.info(f"通过率: {len(valid_nodes) / total_count * 100:.1f}%")
         self.logger.info(f"测试耗时: {duration:.2f}秒")
         self.logger.info("=" * 50)
 
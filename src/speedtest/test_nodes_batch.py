@@ -8,15 +8,15 @@ import sys
 import os
 import subprocess
 import time
-import yaml
-from typing import List, Dict, Any
+from typing import List
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.utils import convert_nodes_to_subscription, yaml_io
 from src.utils.logger import get_logger
+from src.utils.node import Node
 
 
 class BatchNodeTester:
@@ -165,7 +165,7 @@ class BatchNodeTester:
         # 保存配置
         os.makedirs(os.path.dirname(config_file), exist_ok=True)
         with open(config_file, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+            yaml_io.dump(config, f)
         
         self.logger.info(f"批次 {batch_index} 配置文件已创建: {config_file}")
         return config_file
@@ -209,10 +209,9 @@ class BatchNodeTester:
         try:
             # 为当前批次创建独立的订阅文件
             batch_subscription_file = os.path.join(self.project_root, 'result', f'batch_subscription_{batch_index}_phase1.yaml')
-from ..utils import convert_nodes_to_subscription
-batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_nodes)
+            batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_nodes)
             with open(batch_subscription_file, 'w', encoding='utf-8') as f:
-                yaml.dump(batch_clash_config, f, allow_unicode=True, default_flow_style=False)
+                yaml_io.dump_clash_config(batch_clash_config, f)
 
             # 创建阶段1配置（禁用媒体检测，高并发）
             config_file = self.create_batch_config(batch_index, f'http://127.0.0.1:{http_server_port}/result/batch_subscription_{batch_index}_phase1.yaml', phase=1)
@@ -236,7 +235,6 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_
             last_output_time = start_time
             last_line = ""
             last_progress = 0
-            last_progress_time = start_time
 
             while True:
                 # 检查超时
@@ -271,7 +269,6 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_
                                         current_progress = float(progress_match.group(1))
                                         if current_progress > last_progress:
                                             last_progress = current_progress
-                                            last_progress_time = time.time()
                                 last_line = ""
                             elif char == '\r':
                                 if last_line.strip():
@@ -283,7 +280,6 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_
                                         current_progress = float(progress_match.group(1))
                                         if current_progress > last_progress:
                                             last_progress = current_progress
-                                            last_progress_time = time.time()
                                 last_line = ""
                             else:
                                 last_line += char
@@ -321,10 +317,9 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(batch_
         try:
             # 为阶段1的可用节点创建订阅文件
             batch_subscription_file = os.path.join(self.project_root, 'result', f'batch_subscription_{batch_index}_phase2.yaml')
-from ..utils import convert_nodes_to_subscription
-batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(phase1_nodes)
+            batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(phase1_nodes)
             with open(batch_subscription_file, 'w', encoding='utf-8') as f:
-                yaml.dump(batch_clash_config, f, allow_unicode=True, default_flow_style=False)
+                yaml_io.dump_clash_config(batch_clash_config, f)
 
             # 创建阶段2配置（只检测openai和gemini，低并发）
             config_file = self.create_batch_config(batch_index, f'http://127.0.0.1:{http_server_port}/result/batch_subscription_{batch_index}_phase2.yaml', phase=2)
@@ -439,7 +434,7 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(phase1
         """解析测试结果"""
         try:
             with open(output_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml_io.load(f)
             
             results = []
             if data and 'proxies' in data:
@@ -516,44 +511,8 @@ batch_clash_config = convert_nodes_to_subscription.convert_nodes_to_clash(phase1
     
     def _convert_proxy_to_uri(self, proxy: dict, new_name: str) -> str:
         """转换Clash节点为V2Ray URI"""
-        try:
-            proxy_type = proxy.get('type', '')
-            
-            if proxy_type == 'ss':
-                cipher = proxy.get('cipher', 'aes-256-gcm')
-                password = proxy.get('password', '')
-                server = proxy.get('server', '')
-                port = proxy.get('port', 443)
-                return f"ss://{cipher}:{password}@{server}:{port}#{new_name}"
-            
-            elif proxy_type == 'vless':
-                uuid = proxy.get('uuid', '')
-                server = proxy.get('server', '')
-                port = proxy.get('port', 443)
-                params = ['encryption=none', 'security=tls', 'type=tcp']
-                uri = f"vless://{uuid}@{server}:{port}?{'&'.join(params)}#{new_name}"
-                return uri
-            
-            elif proxy_type == 'trojan':
-                password = proxy.get('password', '')
-                server = proxy.get('server', '')
-                port = proxy.get('port', 443)
-                params = ['security=tls']
-                uri = f"trojan://{password}@{server}:{port}?{'&'.join(params)}#{new_name}"
-                return uri
-            
-            elif proxy_type == 'hysteria2':
-                password = proxy.get('password', '')
-                server = proxy.get('server', '')
-                port = proxy.get('port', 443)
-                uri = f"hysteria2://{password}@{server}:{port}?insecure=1#{new_name}"
-                return uri
-            
-            return ''
-        
-        except Exception as e:
-            self.logger.error(f"转换节点失败: {str(e)}")
-            return ''
+        node = Node.from_clash(dict(proxy, name=new_name))
+        return node.to_uri() if node else ''
     
     def test_nodes(self, nodes: List[str]) -> List[str]:
         """使用线程池分批测试节点"""
@@ -14,7 +14,6 @@ import sys
 import os
 import subprocess
 import time
-import yaml
 from typing import List, Dict, Any, Tuple
 
 # 添加项目根目录到路径
@@ -22,7 +21,14 @@ sys.path.insert(
     0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from src.core.node_index import get_node_index
+from src.utils.convert_nodes_to_subscription import node_to_clash
+from src.utils.dns_resolver import get_dns_resolver
+from src.utils.fingerprint import node_fingerprint
+from src.utils import yaml_io
 from src.utils.logger import get_logger
+from src.utils.node import Node, parse_node
+from src.speedtest.incremental import plan_incremental_test, revalidate_proxies
 from src.speedtest.intelligent_timeout import (
     IntelligentTimeoutManager,
     PerformanceMonitor,
@@ -68,6 +74,13 @@ class SubsCheckTester:
         self.performance_monitor = PerformanceMonitor()
         self.concurrency_controller = ConcurrencyController()
 
+        # 阶段1可用的节点（写入节点索引）
+        self.phase1_proxies: List[dict] = []
+        # 增量测速中TCP复验通过、跳过阶段1直接进入阶段2的节点
+        self.revalidated_proxies: List[dict] = []
+        # 阶段2输出的节点（阶段2未完成时为None）
+        self.phase2_proxies: List[dict] | None = None
+
     def start_http_server(self) -> bool:
         """启动HTTP服务器"""
         try:
@@ -534,7 +547,7 @@ class SubsCheckTester:
                 subscription_path = os.path.join(self.project_root, subscription_file)
                 if os.path.exists(subscription_path):
                     with open(subscription_path, "r", encoding="utf-8") as f:
-                        data = yaml.safe_load(f)
+                        data = yaml_io.load(f)
                         if data and "proxies" in data:
                             node_count = len(data["proxies"])
                             self.logger.info(f"检测到{node_count}个节点")
@@ -643,7 +656,7 @@ class SubsCheckTester:
             # 确保目录存在
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             with open(self.config_file, "w", encoding="utf-8") as f:
-                yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+                yaml_io.dump(config, f)
 
             self.logger.info(f"配置文件创建成功: {self.config_file}")
             return True
@@ -693,13 +706,23 @@ class SubsCheckTester:
             # 读取阶段1结果
             print("\n[4/6] 读取阶段1结果...", flush=True)
             phase1_nodes = []
+            phase1_data = None
             try:
                 with open(self.output_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
+                    phase1_data = data = yaml_io.load(f)
                 if data and "proxies" in data:
                     phase1_nodes = [proxy for proxy in data["proxies"]]
                     print(f"✓ 阶段1完成: {len(phase1_nodes)}个节点可用", flush=True)
                     self.logger.info(f"阶段1可用节点数: {len(phase1_nodes)}")
+                if self.revalidated_proxies:
+                    # TCP复验通过的节点与阶段1可用节点一起进行媒体检测
+                    phase1_nodes.extend(self.revalidated_proxies)
+                    phase1_data = dict(phase1_data or {}, proxies=phase1_nodes)
+                    print(
+                        f"✓ 加入 {len(self.revalidated_proxies)} 个TCP复验通过的节点",
+                        flush=True,
+                    )
+                self.phase1_proxies = phase1_nodes
             except Exception as e:
                 print(f"✗ 读取阶段1结果失败: {str(e)}", flush=True)
                 self.logger.error(f"读取阶段1结果失败: {str(e)}")
@@ -716,12 +739,11 @@ class SubsCheckTester:
             print("\n[5/6] 准备阶段2测试...", flush=True)
             phase2_subscription_file = "result/output/clash_subscription.yaml"
             try:
-                with open(self.output_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                if data:
+                # 直接复用已读取的阶段1结果，不再重复解析输出文件
+                if phase1_data:
                     # 保存为Clash格式
                     with open(phase2_subscription_file, "w", encoding="utf-8") as f:
-                        yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+                        yaml_io.dump_clash_config(phase1_data, f)
                     print(f"✓ 阶段1结果已转换", flush=True)
                     self.logger.info(
                         f"阶段1结果已转换为Clash格式: {phase2_subscription_file}"
@@ -753,6 +775,14 @@ class SubsCheckTester:
                 # 阶段2失败不影响整体成功，返回阶段1的结果
                 return True, f"阶段1完成，阶段2失败: {phase2_message}"
 
+            # 记录阶段2输出，TCP复验节点以阶段2结果判定是否通过
+            try:
+                with open(self.output_file, "r", encoding="utf-8") as f:
+                    phase2_data = yaml_io.load(f)
+                self.phase2_proxies = list((phase2_data or {}).get("proxies") or [])
+            except Exception as e:
+                self.logger.warning(f"读取阶段2结果失败: {str(e)}")
+
             print("\n" + "=" * 60, flush=True)
             print("✓ 两阶段测试完成", flush=True)
             print("=" * 60, flush=True)
@@ -1341,7 +1371,7 @@ class SubsCheckTester:
             if os.path.exists(self.output_file):
                 try:
                     with open(self.output_file, "r", encoding="utf-8") as f:
-                        data = yaml.safe_load(f)
+                        data = yaml_io.load(f)
                     if data and "proxies" in data:
                         tested_node_count = len(data["proxies"])
                         self.logger.info(
@@ -1381,7 +1411,7 @@ class SubsCheckTester:
             self.logger.info(f"解析输出文件: {self.output_file}")
 
             with open(self.output_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = yaml_io.load(f)
 
             # 提取节点并重命名
             renamed_nodes = []
@@ -1687,94 +1717,105 @@ class SubsCheckTester:
         # 组合复杂名称（测速后格式）
         return f"{flag}{region}_{number}|{ai_tag}{yt_tag}"
 
+    def record_node_index(
+        self,
+        nodes: List[str],
+        tested_proxies: List[dict],
+        unresolvable: List[dict],
+        revalidate_failed: List[dict] | None = None,
+    ) -> int:
+        """
+        将本次测试结果写入节点索引
+
+        完整测试的节点阶段1可用即视为通过；TCP复验连通的节点（revalidated_proxies）
+        以是否出现在阶段2输出中判定（阶段2未完成时按复验结果），复验结果不刷新
+        最近测试时间，复验窗口到期后节点重新完整测试。
+
+        Args:
+            nodes: 输入的节点URI（含TCP复验的节点）
+            tested_proxies: 完整测试（交给subs-check阶段1）的Clash代理
+            unresolvable: 域名无法解析、未参与测试的Clash代理（记为失败）
+            revalidate_failed: TCP复验未连通的Clash代理（记为复验失败）
+
+        Returns:
+            记录的节点数
+        """
+        node_index = get_node_index()
+        if not node_index.enabled:
+            return 0
+
+        # Clash转换会丢弃部分参数，按转换后的指纹找回原始节点URI，与收集时的索引记录对应
+        # （转换后相同的多个原始节点共享同一个测试结果）
+        source_uris: Dict[str, List[str]] = {}
+        for uri in nodes:
+            fingerprint = _proxy_fingerprint(node_to_clash(parse_node(uri)))
+            if fingerprint:
+                source_uris.setdefault(fingerprint, []).append(uri)
+
+        def collect_results(proxies: List[dict], passed: Dict[str, float | None]) -> list:
+            results = []
+            for proxy in proxies:
+                fingerprint = _proxy_fingerprint(proxy)
+                if not fingerprint:
+                    continue
+                uris = source_uris.get(fingerprint) or [Node.from_clash(proxy).to_uri()]
+                results.extend(
+                    (uri, fingerprint in passed, passed.get(fingerprint)) for uri in uris
+                )
+            return results
+
+        passed = {}
+        for proxy in self.phase1_proxies:
+            fingerprint = _proxy_fingerprint(proxy)
+            if fingerprint:
+                passed[fingerprint] = _proxy_latency(proxy)
+
+        if self.phase2_proxies is None:
+            revalidate_passed = {
+                _proxy_fingerprint(proxy): None for proxy in self.revalidated_proxies
+            }
+        else:
+            revalidate_passed = {
+                _proxy_fingerprint(proxy): _proxy_latency(proxy)
+                for proxy in self.phase2_proxies
+            }
+
+        full_results = collect_results(list(tested_proxies) + list(unresolvable), passed)
+        revalidate_results = collect_results(
+            list(self.revalidated_proxies) + list(revalidate_failed or []),
+            revalidate_passed,
+        )
+
+        recorded = node_index.record_test_results(full_results)
+        recorded += node_index.record_test_results(revalidate_results, full_test=False)
+        passed_count = sum(1 for _, ok, _ in full_results + revalidate_results if ok)
+        self.logger.info(
+            f"节点索引已记录 {recorded} 个节点的测试结果（通过 {passed_count} 个，"
+            f"其中TCP复验 {len(revalidate_results)} 个）"
+        )
+        return recorded
+
     def _convert_proxy_to_uri(self, proxy: dict, new_name: str) -> str:
         """将Clash节点转换回V2Ray URI格式"""
-        try:
-            proxy_type = proxy.get("type", "")
-
-            if proxy_type == "ss":
-                # Shadowsocks节点
-                cipher = proxy.get("cipher", "aes-256-gcm")
-                password = proxy.get("password", "")
-                server = proxy.get("server", "")
-                port = proxy.get("port", 443)
-                return f"ss://{cipher}:{password}@{server}:{port}#{new_name}"
-
-            elif proxy_type == "vmess":
-                # VMess节点
-                return f"vmess://{new_name}"
-
-            elif proxy_type == "vless":
-                # VLESS节点
-                uuid = proxy.get("uuid", "")
-                server = proxy.get("server", "")
-                port = proxy.get("port", 443)
-                security = proxy.get("tls", False)
-                sni = proxy.get("servername", "")
-                network = proxy.get("network", "tcp")
-
-                # 构建VLESS URI
-                params = []
-                params.append(f"encryption=none")
-                if security:
-                    params.append(f"security=tls")
-                    if sni:
-                        params.append(f"sni={sni}")
-                params.append(f"type={network}")
-
-                if network == "ws":
-                    ws_opts = proxy.get("ws-opts", {})
-                    if ws_opts:
-                        if "headers" in ws_opts and "Host" in ws_opts["headers"]:
-                            params.append(f"host={ws_opts['headers']['Host']}")
-                        if "path" in ws_opts:
-                            path = ws_opts["path"]
-                            # 移除path中包含的旧名称（#后面的内容）
-                            if "#" in path:
-                                path = path.split("#")[0]
-                            # URL编码path中的#符号，避免URI格式错误
-                            if "#" in path:
-                                import urllib.parse
-
-                                path = urllib.parse.quote(path, safe="")
-                            params.append(f"path={path}")
-
-                uri = f"vless://{uuid}@{server}:{port}?{'&'.join(params)}#{new_name}"
-                return uri
-
-            elif proxy_type == "trojan":
-                # Trojan节点
-                password = proxy.get("password", "")
-                server = proxy.get("server", "")
-                port = proxy.get("port", 443)
-                sni = proxy.get("sni", "")
-
-                params = []
-                params.append(f"security=tls")
-                if sni:
-                    params.append(f"sni={sni}")
-
-                uri = (
-                    f"trojan://{password}@{server}:{port}?{'&'.join(params)}#{new_name}"
-                )
-                return uri
+        node = Node.from_clash(dict(proxy, name=new_name))
+        if node is None:
+            self.logger.warning(f"不支持的节点类型: {proxy.get('type', '')}")
+            return ""
+        return node.to_uri()
 
-            elif proxy_type == "hysteria2":
-                # Hysteria2节点
-                password = proxy.get("password", "")
-                server = proxy.get("server", "")
-                port = proxy.get("port", 443)
 
-                uri = f"hysteria2://{password}@{server}:{port}?insecure=1#{new_name}"
-                return uri
+def _proxy_fingerprint(proxy: dict | None) -> str | None:
+    """计算Clash代理的节点指纹（忽略名称）"""
+    node = Node.from_clash(proxy) if proxy else None
+    return node_fingerprint(node) if node else None
 
-            else:
-                self.logger.warning(f"不支持的节点类型: {proxy_type}")
-                return ""
 
-        except Exception as e:
-            self.logger.error(f"转换节点失败: {str(e)}")
-            return ""
+def _proxy_latency(proxy: dict) -> float | None:
+    """读取subs-check输出中的延迟（毫秒），没有该字段时返回None"""
+    delay = proxy.get("delay")
+    if isinstance(delay, (int, float)) and delay > 0:
+        return float(delay)
+    return None
 
 
 def convert_nodes_to_vless_yaml(clash_file: str, output_file: str) -> bool:
@@ -1788,33 +1829,15 @@ def convert_nodes_to_vless_yaml(clash_file: str, output_file: str) -> bool:
     logger = get_logger("converter")
     try:
         with open(clash_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = yaml_io.load(f)
 
         proxies = data.get("proxies", [])
         nodes = []
 
         for proxy in proxies:
-            # 根据类型转换节点
-            if proxy.get("type") == "ss":
-                # Shadowsocks节点
-                node = f"ss://{proxy.get('cipher')}:{proxy.get('password')}@{proxy.get('server')}:{proxy.get('port')}#{proxy.get('name', 'SS')}"
-                nodes.append(node)
-            elif proxy.get("type") == "vmess":
-                # VMess节点
-                node = f"vmess://{proxy.get('name', 'VMess')}"
-                nodes.append(node)
-            elif proxy.get("type") == "vless":
-                # VLESS节点
-                node = f"vless://{proxy.get('uuid')}@{proxy.get('server')}:{proxy.get('port')}?encryption=none&security=tls&type=ws&host={proxy.get('ws-opts', {}).get('headers', {}).get('Host', '')}&path={proxy.get('ws-opts', {}).get('path', '')}#{proxy.get('name', 'VLESS')}"
-                nodes.append(node)
-            elif proxy.get("type") == "trojan":
-                # Trojan节点
-                node = f"trojan://{proxy.get('password')}@{proxy.get('server')}:{proxy.get('port')}?security=tls&sni={proxy.get('sni', '')}#{proxy.get('name', 'Trojan')}"
-                nodes.append(node)
-            elif proxy.get("type") == "hysteria2":
-                # Hysteria2节点
-                node = f"hysteria2://{proxy.get('password')}@{proxy.get('server')}:{proxy.get('port')}?insecure=1#{proxy.get('name', 'Hysteria2')}"
-                nodes.append(node)
+            node = Node.from_clash(proxy)
+            if node is not None:
+                nodes.append(node.to_uri())
 
         # 保存节点
         with open(output_file, "w", encoding="utf-8") as f:
@@ -1836,6 +1859,11 @@ def main():
     parser = argparse.ArgumentParser(description="节点测速脚本 - 使用subs-check")
     parser.add_argument("--input", default="result/nodetotal.txt", help="输入节点文件")
     parser.add_argument("--output", default="result/nodelist.txt", help="输出节点文件")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量测速：新节点优先，近期通过的节点只做TCP复验，连续失败的节点按退避时间跳过",
+    )
 
     args = parser.parse_args()
 
@@ -1867,6 +1895,14 @@ def main():
     print(f"✅ 读取到 {len(nodes)} 个节点 (耗时: {read_elapsed:.2f}秒)", flush=True)
     logger.info(f"读取到 {len(nodes)} 个节点")
 
+    # 增量测速：根据节点索引中的历史测试结果划分节点
+    plan = None
+    if args.incremental:
+        plan = plan_incremental_test(nodes)
+        print(f"\n📉 增量测速: {plan.summary()}", flush=True)
+        logger.info(f"增量测速: {plan.summary()}")
+        nodes = plan.full_test
+
     # 转换为Clash格式
     print(f"\n转换为Clash订阅格式...", flush=True)
     logger.info("转换为Clash订阅格式...")
@@ -1895,10 +1931,53 @@ def main():
     elapsed = time.time() - start_time
     print(f"⚡ Clash格式转换完成，耗时: {elapsed:.1f}秒", flush=True)
 
+    # 批量解析节点域名，无法解析的节点不交给subs-check测试
+    print(f"\n🌐 批量解析节点域名...", flush=True)
+    resolve_start = time.time()
+    proxies, unresolvable = get_dns_resolver().filter_resolvable(
+        clash_config.get("proxies", []), lambda proxy: proxy.get("server")
+    )
+    clash_config["proxies"] = proxies
+    if unresolvable:
+        # 代理组只引用保留的节点
+        for group in clash_config.get("proxy-groups", []):
+            group["proxies"] = [proxy["name"] for proxy in proxies] or ["DIRECT"]
+    print(
+        f"✅ 域名解析完成: 剔除 {len(unresolvable)} 个无法解析的节点，剩余 {len(proxies)} 个 "
+        f"(耗时: {time.time() - resolve_start:.2f}秒)",
+        flush=True,
+    )
+    logger.info(f"剔除 {len(unresolvable)} 个域名无法解析的节点")
+
+    # 复验窗口内通过过测试的节点只做TCP复验，连通的节点跳过阶段1
+    revalidated, revalidate_failed = [], []
+    if plan and plan.revalidate:
+        print(f"\n🔁 TCP复验 {len(plan.revalidate)} 个近期通过的节点...", flush=True)
+        revalidate_config = convert_nodes_to_subscription.convert_nodes_to_clash(
+            plan.revalidate
+        )
+        revalidated, revalidate_failed = revalidate_proxies(revalidate_config["proxies"])
+        print(
+            f"✅ TCP复验完成: {len(revalidated)} 个连通，{len(revalidate_failed)} 个失败",
+            flush=True,
+        )
+        if not clash_config["proxies"]:
+            # 没有需要完整测试的节点时，复验通过的节点直接参与完整测试
+            clash_config["proxies"] = revalidated
+            for group in clash_config.get("proxy-groups", []):
+                group["proxies"] = [proxy["name"] for proxy in revalidated] or ["DIRECT"]
+            revalidated = []
+
+    if plan and not clash_config["proxies"]:
+        print("⚠ 增量测速: 没有需要测试的节点，保留现有结果", flush=True)
+        logger.warning("增量测速: 没有需要测试的节点")
+        SubsCheckTester().record_node_index(plan.revalidate, [], [], revalidate_failed)
+        sys.exit(0)
+
     # 保存Clash配置
     os.makedirs(os.path.dirname(subscription_file), exist_ok=True)
     with open(subscription_file, "w", encoding="utf-8") as f:
-        yaml.dump(clash_config, f, allow_unicode=True, default_flow_style=False)
+        yaml_io.dump_clash_config(clash_config, f)
 
     print(f"✓ Clash订阅文件已保存: {subscription_file}", flush=True)
     logger.info(f"Clash订阅文件已保存: {subscription_file}")
@@ -1906,6 +1985,7 @@ def main():
     # 运行subs-check测试
     print(f"\n初始化测试器...", flush=True)
     tester = SubsCheckTester()
+    tester.revalidated_proxies = revalidated
 
     # 计算并发数（根据CPU核心数）
     cpu_count = os.cpu_count() or 2
@@ -1923,7 +2003,7 @@ def main():
 
     # 运行测试
     print(f"\n开始测试...", flush=True)
-    success, message = tester.run_test(node_count=len(nodes))
+    success, message = tester.run_test(node_count=len(clash_config["proxies"]))
 
     if not success:
         print(f"\n✗ 测试失败: {message}", flush=True)
@@ -1937,6 +2017,14 @@ def main():
     # 使用parse_results方法解析结果并重命名节点
     renamed_nodes = tester.parse_results()
 
+    # 记录测试结果到节点索引
+    tester.record_node_index(
+        nodes + (plan.revalidate if plan else []),
+        clash_config["proxies"],
+        unresolvable,
+        revalidate_failed,
+    )
+
     if renamed_nodes:
         # 保存重命名后的节点
         os.makedirs(os.path.dirname(args.output), exist_ok=True)
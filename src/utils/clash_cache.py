@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Clash代理转换缓存
+以节点URI的SHA256为键持久化转换得到的Clash代理配置（转换失败同样缓存），
+跨运行重复出现的节点不再解析，超过保留时间未再出现的条目在写回时淘汰
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+# 转换逻辑发生不兼容变化时递增，使旧缓存失效
+CLASH_PROXY_CACHE_VERSION = 1
+
+# 未命中标记（区分“未缓存”和“缓存的转换失败结果None”）
+MISS = object()
+
+
+def uri_digest(uri: str) -> str:
+    """计算节点URI的缓存键"""
+    return hashlib.sha256(uri.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class ClashProxyCache:
+    """节点URI -> Clash代理配置的持久化缓存"""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        retention: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        config = get_config().base
+        self.logger = get_logger("clash_cache")
+
+        self.enabled = config.CLASH_PROXY_CACHE_ENABLED if enabled is None else enabled
+        self.cache_file = str(cache_file or config.CLASH_PROXY_CACHE_FILE)
+        self.retention = (
+            retention if retention is not None else config.CLASH_PROXY_CACHE_RETENTION
+        )
+
+        # URI摘要 -> {"proxy": 代理配置（转换失败时为None）, "last_seen": 最近出现时间}
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        # 统计信息
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+        if self.enabled:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self):
+        """加载磁盘缓存（版本不一致时整体丢弃）"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CLASH_PROXY_CACHE_VERSION:
+                self.logger.info("Clash转换缓存版本已变化，将重建")
+                self._dirty = True
+                return
+            self._entries = data.get("entries", {})
+        except Exception as e:
+            self.logger.warning(f"加载Clash转换缓存失败，将重建: {str(e)}")
+            self._entries = {}
+
+    def flush(self):
+        """淘汰超过保留时间未出现的条目，并写回磁盘"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = time.time() - self.retention
+            entries = {
+                key: entry
+                for key, entry in self._entries.items()
+                if entry.get("last_seen", 0) > cutoff
+            }
+            self.stats["evicted"] += len(self._entries) - len(entries)
+            self._entries = entries
+            try:
+                os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+                tmp_path = self.cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": CLASH_PROXY_CACHE_VERSION, "entries": entries},
+                        f,
+                        ensure_ascii=False,
+                    )
+                os.replace(tmp_path, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"保存Clash转换缓存失败: {str(e)}")
+
+    def get(self, uri: str) -> Any:
+        """
+        获取节点的缓存转换结果，并刷新最近出现时间
+
+        Args:
+            uri: 节点URI（已去除首尾空白）
+
+        Returns:
+            代理配置的副本；缓存的转换失败结果返回None；未缓存时返回 MISS
+        """
+        if not self.enabled:
+            return MISS
+
+        key = uri_digest(uri)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return MISS
+            entry["last_seen"] = time.time()
+            self._dirty = True
+            self.stats["hits"] += 1
+            proxy = entry["proxy"]
+        return copy.deepcopy(proxy)
+
+    def put(self, uri: str, proxy: Optional[Dict[str, Any]]):
+        """缓存节点的转换结果（None表示转换失败），保存副本以免调用方修改缓存内容"""
+        if not self.enabled:
+            return
+
+        proxy = copy.deepcopy(proxy)
+        with self._lock:
+            self._entries[uri_digest(uri)] = {"proxy": proxy, "last_seen": time.time()}
+            self._dirty = True
+            self.stats["stored"] += 1
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return dict(
+                self.stats,
+                cached=len(self._entries),
+                hit_rate=self.stats["hits"] / total * 100 if total else 0.0,
+            )
+
+
+# 全局单例实例
+_clash_proxy_cache = None
+_clash_proxy_cache_lock = threading.Lock()
+
+
+def get_clash_proxy_cache() -> ClashProxyCache:
+    """获取Clash转换缓存单例实例"""
+    global _clash_proxy_cache
+    if _clash_proxy_cache is None:
+        with _clash_proxy_cache_lock:
+            if _clash_proxy_cache is None:
+                _clash_proxy_cache = ClashProxyCache()
+    return _clash_proxy_cache
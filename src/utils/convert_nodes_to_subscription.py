@@ -6,476 +6,275 @@
 
 import sys
 import os
-import base64
-import json
-import yaml
-from typing import List, Dict, Any
-from urllib.parse import urlparse, parse_qs, unquote
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
 
 # 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-
-def parse_vmess(vmess_uri: str) -> Dict[str, Any]:
-    """解析 vmess:// 节点"""
-    try:
-        # vmess URI 可能是 Base64 编码的 JSON
-        if vmess_uri.startswith('vmess://'):
-            encoded = vmess_uri[8:]
-            try:
-                decoded = base64.b64decode(encoded).decode('utf-8')
-                config = json.loads(decoded)
-                
-                return {
-                    'name': config.get('ps', 'VMess'),
-                    'type': 'vmess',
-                    'server': config.get('add', ''),
-                    'port': int(config.get('port', 443)),
-                    'uuid': config.get('id', ''),
-                    'alterId': config.get('aid', 0),
-                    'cipher': config.get('scy', 'auto'),
-                    'udp': True,
-                    'network': config.get('net', 'tcp'),
-                    'tls': config.get('tls', '') == 'tls',
-                    'skip-cert-verify': True,
-                    'ws-opts': {
-                        'path': config.get('path', ''),
-                        'headers': {
-                            'Host': config.get('host', '')
-                        }
-                    } if config.get('net') == 'ws' else None
-                }
-            except:
-                pass
-    except Exception as e:
-        print(f"解析 vmess 节点失败: {e}")
-    return None
-
-
-def parse_vless(vless_uri: str) -> Dict[str, Any]:
-    """解析 vless:// 节点"""
-    try:
-        if not vless_uri.startswith('vless://'):
-            return None
-        
-        # 移除 vless:// 前缀
-        uri = vless_uri[8:]
-        
-        # 分割 UUID 和参数
-        if '?' in uri:
-            uuid_part, params_part = uri.split('?', 1)
-        else:
-            uuid_part = uri
-            params_part = ''
-        
-        # 分割 UUID 和地址
-        if '@' in uuid_part:
-            uuid, addr_port = uuid_part.split('@', 1)
-        else:
-            return None
-        
-        # 分割地址和端口
-        if ':' in addr_port:
-            server, port = addr_port.rsplit(':', 1)
-        else:
-            return None
-        
-        # 分割端口和名称
-        if '#' in port:
-            port, name = port.split('#', 1)
-            name = unquote(name)
-        else:
-            # 生成唯一名称：使用server+port组合
-            name = f'VLESS-{server}:{port}'
-        
-        # 清理端口字符串（移除可能的斜杠等）
-        port = port.strip().rstrip('/')
-        
-        # 解析参数
-        params = parse_qs(params_part)
-        
-        network = params.get('type', ['tcp'])[0]
-        security = params.get('security', ['none'])[0]
-        
-        proxy = {
-            'name': name,
-            'type': 'vless',
-            'server': server,
-            'port': int(port),
-            'uuid': uuid,
-            'udp': True,
-            'network': network,
-            'tls': security == 'tls' or security == 'reality',
-            'skip-cert-verify': params.get('insecure', ['0'])[0] == '1',
-            'flow': params.get('flow', [''])[0] if security == 'reality' else '',
-            'servername': params.get('sni', [''])[0],
-            'client-fingerprint': params.get('fp', ['chrome'])[0],
-            'reality-opts': {
-                'public-key': params.get('pbk', [''])[0],
-                'short-id': params.get('sid', [''])[0]
-            } if security == 'reality' else None,
-            'ws-opts': {
-                'path': params.get('path', [''])[0],
-                'headers': {
-                    'Host': params.get('host', [''])[0]
-                }
-            } if network == 'ws' else None,
-            'grpc-opts': {
-                'grpc-service-name': params.get('serviceName', [''])[0]
-            } if network == 'grpc' else None
-        }
-        
-        return proxy
-    except Exception as e:
-        print(f"解析 vless 节点失败: {e}")
-        return None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from src.core.config_manager import get_config
+from src.utils import yaml_io
+from src.utils.clash_cache import MISS, get_clash_proxy_cache
+from src.utils.node import Node, parse_node
 
-def parse_trojan(trojan_uri: str) -> Dict[str, Any]:
-    """解析 trojan:// 节点"""
-    try:
-        if not trojan_uri.startswith('trojan://'):
-            return None
-        
-        # 移除 trojan:// 前缀
-        uri = trojan_uri[9:]
-        
-        # 分割密码和地址
-        if '@' in uri:
-            password, addr_port = uri.split('@', 1)
-        else:
-            return None
-        
-        # 分割地址和端口
-        if ':' in addr_port:
-            server, port = addr_port.rsplit(':', 1)
-        else:
-            return None
-        
-        # 分割端口和名称
-        if '#' in port:
-            port, name = port.split('#', 1)
-            name = unquote(name)
-        else:
-            # 生成唯一名称：使用server+port组合
-            name = f'Trojan-{server}:{port}'
-        
-        # 解析参数
-        if '?' in port:
-            port, params_part = port.split('?', 1)
-        else:
-            params_part = ''
-        
-        params = parse_qs(params_part)
-        
-        # 清理端口字符串（移除可能的斜杠等）
-        port = port.strip().rstrip('/')
-        
-        proxy = {
-            'name': name,
-            'type': 'trojan',
-            'server': server,
-            'port': int(port),
-            'password': password,
-            'udp': True,
-            'skip-cert-verify': params.get('insecure', ['0'])[0] == '1',
-            'sni': params.get('sni', [''])[0]
+
+def _ws_opts(node: Node) -> Dict[str, Any]:
+    """WebSocket传输配置"""
+    return {
+        'path': node.path,
+        'headers': {
+            'Host': node.host_header
         }
-        
-        return proxy
-    except Exception as e:
-        print(f"解析 trojan 节点失败: {e}")
-        return None
+    }
 
 
-def parse_ss(ss_uri: str) -> Dict[str, Any]:
-    """解析 ss:// 节点"""
-    try:
-        if not ss_uri.startswith('ss://'):
-            return None
-        
-        # 移除 ss:// 前缀
-        uri = ss_uri[5:]
-        
-        # 分离名称
-        if '#' in uri:
-            encoded, name = uri.rsplit('#', 1)
-            name = unquote(name)
-        else:
-            encoded = uri
-            # 生成唯一名称：使用server+port组合（需要先解析server和port）
-            name = 'SS'  # 临时名称，后面会替换
-        
-        # 分离参数
-        if '?' in encoded:
-            encoded, params_part = encoded.split('?', 1)
-        else:
-            params_part = ''
-        
-        # 解析参数
-        params = parse_qs(params_part)
-        
-        # 尝试多种解码方式
-        decoded = None
-        
-        # 方法1: UUID 格式 (ss://uuid@server:port)
-        if not decoded and '@' in encoded and '-' in encoded.split('@')[0]:
-            try:
-                uuid_part, server_port = encoded.split('@', 1)
-                # 检查是否是 UUID 格式
-                if len(uuid_part) == 36 and uuid_part.count('-') == 4:
-                    # 这是 UUID 格式，使用默认配置
-                    if ':' in server_port:
-                        server, port = server_port.split(':', 1)
-                        # 如果name是临时名称，生成唯一名称
-                        if name == 'SS':
-                            name = f'SS-{server}:{port}'
-                        proxy = {
-                            'name': name,
-                            'type': 'ss',
-                            'server': server,
-                            'port': int(port),
-                            'cipher': 'aes-256-gcm',
-                            'password': uuid_part,
-                            'udp': True
-                        }
-                        return proxy
-            except:
-                pass
-        
-        # 方法2: JSON 格式 (ss://base64({"add":"...","ps":"...",...}))
-        if not decoded:
-            try:
-                padding = 4 - len(encoded) % 4
-                if padding != 4:
-                    encoded += '=' * padding
-                decoded = base64.b64decode(encoded).decode('utf-8')
-                if decoded.startswith('{'):
-                    # JSON 格式
-                    config = json.loads(decoded)
-                    proxy = {
-                        'name': config.get('ps', name),
-                        'type': 'ss',
-                        'server': config.get('add', ''),
-                        'port': int(config.get('port', 8388)),
-                        'cipher': config.get('method', 'aes-256-gcm'),
-                        'password': config.get('password', ''),
-                        'udp': True
-                    }
-                    return proxy
-            except:
-                decoded = None
-        
-        # 方法3: 标准 Base64 解码
-        if not decoded:
-            try:
-                padding = 4 - len(encoded) % 4
-                if padding != 4:
-                    encoded += '=' * padding
-                decoded = base64.b64decode(encoded).decode('utf-8')
-            except:
-                pass
-        
-        # 方法4: 尝试 URL 解码后再 Base64
-        if not decoded:
-            try:
-                url_decoded = unquote(encoded)
-                padding = 4 - len(url_decoded) % 4
-                if padding != 4:
-                    url_decoded += '=' * padding
-                decoded = base64.b64decode(url_decoded).decode('utf-8')
-            except:
-                pass
-        
-        # 方法5: 尝试直接解析（URL 格式: base64(method:password)@server:port）
-        if not decoded and '@' in encoded:
-            try:
-                credentials, server_port = encoded.split('@', 1)
-                padding = 4 - len(credentials) % 4
-                if padding != 4:
-                    credentials += '=' * padding
-                method_password = base64.b64decode(credentials).decode('utf-8')
-                if ':' in method_password:
-                    method, password = method_password.split(':', 1)
-                    decoded = f"{method}:{password}@{server_port}"
-            except:
-                pass
-        
-        # 方法6: 尝试旧格式 (server:port:method:password)
-        if not decoded:
-            try:
-                padding = 4 - len(encoded) % 4
-                if padding != 4:
-                    encoded += '=' * padding
-                decoded = base64.b64decode(encoded).decode('utf-8')
-                parts = decoded.split(':')
-                if len(parts) == 4:
-                    server, port, method, password = parts
-                    decoded = f"{method}:{password}@{server}:{port}"
-            except:
-                pass
-        
-        if not decoded:
-            return None
-        
-        # 解析解码后的内容
-        if '@' in decoded:
-            method_password, server_port = decoded.rsplit('@', 1)
-        else:
-            return None
-        
-        if ':' in method_password:
-            method, password = method_password.split(':', 1)
-        else:
-            return None
-        
-        if ':' in server_port:
-            server, port = server_port.rsplit(':', 1)
-        else:
-            return None
-        
-        # 清理端口字符串（移除可能的斜杠等）
-        port = port.strip().rstrip('/')
-        
-        # 如果name是临时名称，生成唯一名称
-        if name == 'SS':
-            name = f'SS-{server}:{port}'
-        
-        proxy = {
-            'name': name,
-            'type': 'ss',
-            'server': server,
-            'port': int(port),
-            'cipher': method,
-            'password': password,
-            'udp': True
-        }
-        
-        # 添加插件配置
-        if 'plugin' in params:
-            proxy['plugin'] = params['plugin'][0]
-            if 'plugin-opts' in params:
-                proxy['plugin-opts'] = params['plugin-opts'][0]
-        
-        # 添加 TLS 配置
-        if 'security' in params and params['security'][0] == 'tls':
-            proxy['udp'] = True
-            proxy['tls'] = True
-            proxy['skip-cert-verify'] = params.get('insecure', ['0'])[0] == '1'
-            proxy['sni'] = params.get('sni', [''])[0]
-            
-            if params.get('type', [''])[0] == 'ws':
-                proxy['network'] = 'ws'
-                proxy['ws-opts'] = {
-                    'path': params.get('path', [''])[0],
-                    'headers': {
-                        'Host': params.get('host', [''])[0]
-                    }
-                }
-        
-        return proxy
-    except Exception as e:
-        return None
+def _insecure(node: Node) -> bool:
+    """是否跳过证书验证"""
+    return (node.params.get('insecure') or node.params.get('allowInsecure')) == '1'
 
 
-def parse_hysteria2(hysteria2_uri: str) -> Dict[str, Any]:
-    """解析 hysteria2:// 节点"""
-    try:
-        if not hysteria2_uri.startswith('hysteria2://'):
-            return None
-        
-        # 移除 hysteria2:// 前缀
-        uri = hysteria2_uri[12:]
-        
-        # 分割 UUID 和地址
-        if '@' in uri:
-            uuid, addr_port = uri.split('@', 1)
-        else:
-            return None
-        
-        # 分割地址和端口
-        if ':' in addr_port:
-            server, port = addr_port.rsplit(':', 1)
-        else:
-            return None
-        
-        # 分割端口和名称
-        if '#' in port:
-            port, name = port.split('#', 1)
-            name = unquote(name)
-        else:
-            # 生成唯一名称：使用server+port组合
-            name = f'Hysteria2-{server}:{port}'
-        
-        # 解析参数
-        if '?' in port:
-            port, params_part = port.split('?', 1)
-        else:
-            params_part = ''
-        
-        params = parse_qs(params_part)
-        
-        # 清理端口字符串（移除可能的斜杠等）
-        port = port.strip().rstrip('/')
-        
-        proxy = {
-            'name': name,
-            'type': 'hysteria2',
-            'server': server,
-            'port': int(port),
-            'password': uuid,
-            'udp': True,
-            'skip-cert-verify': params.get('insecure', ['0'])[0] == '1',
-            'sni': params.get('sni', [''])[0]
-        }
-        
-        return proxy
-    except Exception as e:
-        print(f"解析 hysteria2 节点失败: {e}")
+def vmess_to_clash(node: Node) -> Dict[str, Any]:
+    """转换 vmess 节点"""
+    alter_id = node.params.get('aid', '0')
+    return {
+        'name': node.remark or 'VMess',
+        'type': 'vmess',
+        'server': node.host,
+        'port': node.port,
+        'uuid': node.credential,
+        'alterId': int(alter_id) if alter_id.isdigit() else 0,
+        'cipher': node.method or 'auto',
+        'udp': True,
+        'network': node.network,
+        'tls': node.security == 'tls',
+        'skip-cert-verify': True,
+        'ws-opts': _ws_opts(node) if node.network == 'ws' else None
+    }
+
+
+def vless_to_clash(node: Node) -> Dict[str, Any]:
+    """转换 vless 节点"""
+    reality = node.security == 'reality'
+    return {
+        # 没有备注时使用server+port组合生成唯一名称
+        'name': node.remark or f'VLESS-{node.host}:{node.port}',
+        'type': 'vless',
+        'server': node.host,
+        'port': node.port,
+        'uuid': node.credential,
+        'udp': True,
+        'network': node.network,
+        'tls': node.tls,
+        'skip-cert-verify': _insecure(node),
+        'flow': node.params.get('flow', '') if reality else '',
+        'servername': node.sni,
+        'client-fingerprint': node.params.get('fp') or 'chrome',
+        'reality-opts': {
+            'public-key': node.params.get('pbk', ''),
+            'short-id': node.params.get('sid', '')
+        } if reality else None,
+        'ws-opts': _ws_opts(node) if node.network == 'ws' else None,
+        'grpc-opts': {
+            'grpc-service-name': node.params.get('serviceName', '')
+        } if node.network == 'grpc' else None
+    }
+
+
+def trojan_to_clash(node: Node) -> Dict[str, Any]:
+    """转换 trojan 节点"""
+    return {
+        'name': node.remark or f'Trojan-{node.host}:{node.port}',
+        'type': 'trojan',
+        'server': node.host,
+        'port': node.port,
+        'password': node.credential,
+        'udp': True,
+        'skip-cert-verify': _insecure(node),
+        'sni': node.sni
+    }
+
+
+def ss_to_clash(node: Node) -> Dict[str, Any]:
+    """转换 ss 节点"""
+    proxy = {
+        'name': node.remark or f'SS-{node.host}:{node.port}',
+        'type': 'ss',
+        'server': node.host,
+        'port': node.port,
+        'cipher': node.method,
+        'password': node.credential,
+        'udp': True
+    }
+    
+    # 添加插件配置
+    if 'plugin' in node.params:
+        proxy['plugin'] = node.params['plugin']
+        if 'plugin-opts' in node.params:
+            proxy['plugin-opts'] = node.params['plugin-opts']
+    
+    # 添加 TLS 配置
+    if node.security == 'tls':
+        proxy['tls'] = True
+        proxy['skip-cert-verify'] = _insecure(node)
+        proxy['sni'] = node.sni
+        
+        if node.network == 'ws':
+            proxy['network'] = 'ws'
+            proxy['ws-opts'] = _ws_opts(node)
+    
+    return proxy
+
+
+def hysteria2_to_clash(node: Node) -> Dict[str, Any]:
+    """转换 hysteria2 节点"""
+    return {
+        'name': node.remark or f'Hysteria2-{node.host}:{node.port}',
+        'type': 'hysteria2',
+        'server': node.host,
+        'port': node.port,
+        'password': node.credential,
+        'udp': True,
+        'skip-cert-verify': _insecure(node),
+        'sni': node.sni
+    }
+
+
+# 协议 -> Clash代理转换函数
+CLASH_CONVERTERS = {
+    'vmess': vmess_to_clash,
+    'vless': vless_to_clash,
+    'trojan': trojan_to_clash,
+    'ss': ss_to_clash,
+    'hysteria2': hysteria2_to_clash,
+}
+
+
+def node_to_clash(node: Optional[Node]) -> Optional[Dict[str, Any]]:
+    """将解析后的节点转换为Clash代理配置，不支持的协议返回None"""
+    if node is None:
         return None
+    converter = CLASH_CONVERTERS.get(node.protocol)
+    return converter(node) if converter else None
 
 
-def convert_nodes_to_clash(nodes: List[str]) -> Dict[str, Any]:
+def _node_protocol(node: str) -> str:
+    """获取节点协议名（用于失败统计）"""
+    scheme, sep, _ = node.partition('://')
+    return scheme.lower() if sep and scheme else 'unknown'
+
+
+def _convert_chunk(nodes: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    转换一块节点（进程池工作函数，需在模块顶层定义以便序列化）
+
+    Returns:
+        与输入一一对应的代理配置列表，转换失败的位置为None
+    """
+    # 节点只解析一次（解析结果按URI缓存，去重和测速阶段直接复用）
+    return [node_to_clash(parse_node(node)) for node in nodes]
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """确定进程数（0表示按CPU核数）"""
+    if workers is None:
+        workers = get_config().base.CLASH_CONVERT_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _convert_many(
+    nodes: List[str], workers: int, chunk_size: int
+) -> List[Optional[Dict[str, Any]]]:
+    """转换节点列表，数量达到阈值时按块分发到进程池"""
+    threshold = get_config().base.CLASH_CONVERT_PARALLEL_THRESHOLD
+    if workers > 1 and len(nodes) >= threshold:
+        chunks = [nodes[i:i + chunk_size] for i in range(0, len(nodes), chunk_size)]
+        workers = min(workers, len(chunks))
+        try:
+            # map 按提交顺序返回结果，保证代理顺序与输入一致
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return [
+                    proxy
+                    for chunk_result in executor.map(_convert_chunk, chunks)
+                    for proxy in chunk_result
+                ]
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ 进程池不可用，改为串行转换: {str(e)}")
+
+    return _convert_chunk(nodes)
+
+
+def convert_nodes_to_clash(
+    nodes: List[str],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     """
     将V2Ray节点列表转换为Clash订阅格式
-    
+
+    已转换过的节点直接从持久化缓存读取；未命中的节点数达到
+    CLASH_CONVERT_PARALLEL_THRESHOLD 且可用进程数大于1时，按块分发到进程池并行解析，
+    结果按输入顺序合并，与串行转换完全一致。
+
     Args:
         nodes: 节点列表
-        
+        workers: 进程数，None时使用 CLASH_CONVERT_WORKERS，0表示按CPU核数，1表示串行
+        chunk_size: 每块节点数，None时使用 CLASH_CONVERT_CHUNK_SIZE
+        use_cache: 是否使用Clash转换缓存（CLASH_PROXY_CACHE_ENABLED 为False时不生效）
+
     Returns:
         clash_config: Clash配置字典
     """
+    workers = _resolve_workers(workers)
+    chunk_size = max(1, chunk_size or get_config().base.CLASH_CONVERT_CHUNK_SIZE)
+
+    uris = [node.strip() for node in nodes]
+    uris = [uri for uri in uris if uri]
+
+    # 先查缓存，只转换未命中的节点
+    cache = get_clash_proxy_cache() if use_cache else None
+    if cache is not None and cache.enabled:
+        converted = [cache.get(uri) for uri in uris]
+    else:
+        cache = None
+        converted = [MISS] * len(uris)
+
+    pending = [index for index, proxy in enumerate(converted) if proxy is MISS]
+    if pending:
+        results = _convert_many([uris[index] for index in pending], workers, chunk_size)
+        for index, proxy in zip(pending, results):
+            converted[index] = proxy
+            if cache is not None:
+                cache.put(uris[index], proxy)
+
+    if cache is not None:
+        cache.flush()
+        print(
+            f"🗃️ 转换缓存: 命中 {len(uris) - len(pending)} 个，未命中 {len(pending)} 个"
+        )
+
     proxies = []
-    failed_count = 0
-    
-    for i, node in enumerate(nodes):
-        node = node.strip()
-        if not node:
-            continue
-        
-        proxy = None
-        
-        # 根据协议类型解析节点
-        if node.startswith('vmess://'):
-            proxy = parse_vmess(node)
-        elif node.startswith('vless://'):
-            proxy = parse_vless(node)
-        elif node.startswith('trojan://'):
-            proxy = parse_trojan(node)
-        elif node.startswith('ss://'):
-            proxy = parse_ss(node)
-        elif node.startswith('hysteria2://'):
-            proxy = parse_hysteria2(node)
-        
+    failures = Counter()
+    for uri, proxy in zip(uris, converted):
         if proxy:
             proxies.append(proxy)
         else:
-            failed_count += 1
-    
-    # 每100个失败打印一次统计
-    if failed_count > 0 and failed_count % 100 == 0:
-        print(f"已处理 {len(nodes)} 个节点，成功 {len(proxies)} 个，失败 {failed_count} 个")
-    
+            failures[_node_protocol(uri)] += 1
+
+    # 按协议打印失败统计
+    failed_count = sum(failures.values())
+    if failed_count > 0:
+        details = ", ".join(
+            f"{protocol}: {count}" for protocol, count in failures.most_common()
+        )
+        print(
+            f"已处理 {len(nodes)} 个节点，成功 {len(proxies)} 个，"
+            f"失败 {failed_count} 个（{details}）"
+        )
+
     # 创建 Clash 配置
     clash_config = {
         'port': 7890,
@@ -506,6 +305,9 @@ def main():
     parser = argparse.ArgumentParser(description='将V2Ray节点列表转换为Clash订阅格式')
     parser.add_argument('--input', default='result/nodetotal.txt', help='输入节点文件')
     parser.add_argument('--output', default='result/clash_subscription.yaml', help='输出Clash订阅文件')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='并行转换的进程数（0表示按CPU核数，1表示串行）')
+    parser.add_argument('--no-cache', action='store_true', help='不使用Clash转换缓存')
     
     args = parser.parse_args()
     
@@ -518,7 +320,9 @@ def main():
     
     # 转换为 Clash 格式
     print("转换为 Clash 格式...")
-    clash_config = convert_nodes_to_clash(nodes)
+    clash_config = convert_nodes_to_clash(
+        nodes, workers=args.workers, use_cache=not args.no_cache
+    )
     
     print(f"成功转换 {len(clash_config['proxies'])} 个节点")
     
@@ -527,7 +331,7 @@ def main():
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     
     with open(args.output, 'w', encoding='utf-8') as f:
-        yaml.dump(clash_config, f, allow_unicode=True, default_flow_style=False)
+        yaml_io.dump_clash_config(clash_config, f)
     
     print("✓ 转换完成")
 
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+节点域名批量解析
+测速前并发解析节点列表中所有不重复的域名，结果按TTL缓存在内存和磁盘中，
+域名不存在（NXDOMAIN）的结果同样缓存，无法解析的节点在TCP测试前直接剔除
+"""
+
+import atexit
+import ipaddress
+import json
+import math
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from src.core.config_manager import get_config
+from src.utils.logger import get_logger
+
+T = TypeVar("T")
+
+# 表示域名确定不存在（或没有IPv4地址）的 getaddrinfo 错误码
+NEGATIVE_ERRORS = {
+    code
+    for code in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None))
+    if code is not None
+}
+
+
+def _normalize_host(host) -> str:
+    """统一域名格式（小写，去掉IPv6方括号和末尾的点）"""
+    return str(host or "").strip().strip("[]").rstrip(".").lower()
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class DnsResolver:
+    """带TTL缓存的批量域名解析器"""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        ttl: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        config = get_config().base
+        self.logger = get_logger("dns_resolver")
+
+        self.persist = config.DNS_CACHE_ENABLED
+        self.cache_file = str(cache_file or config.DNS_CACHE_FILE)
+        self.ttl = ttl if ttl is not None else config.DNS_CACHE_TTL
+        self.negative_ttl = (
+            negative_ttl if negative_ttl is not None else config.DNS_NEGATIVE_TTL
+        )
+        self.max_workers = max_workers or config.DNS_RESOLVE_WORKERS
+        self.timeout = config.DNS_RESOLVE_TIMEOUT
+
+        # 域名 -> {"addresses": IP列表（不存在时为None）, "expires_at": 过期时间}
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        # 统计信息
+        self.stats = {"cache_hits": 0, "resolved": 0, "nxdomain": 0, "errors": 0}
+
+        if self.persist:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self):
+        """加载磁盘缓存（跳过已过期的条目）"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            now = time.time()
+            self._entries = {
+                host: entry
+                for host, entry in entries.items()
+                if entry.get("expires_at", 0) > now
+            }
+        except Exception as e:
+            self.logger.warning(f"加载DNS缓存失败，将重建: {str(e)}")
+            self._entries = {}
+
+    def flush(self):
+        """将未过期的解析结果写回磁盘"""
+        if not self.persist:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            entries = {
+                host: entry
+                for host, entry in self._entries.items()
+                if entry.get("expires_at", 0) > now
+            }
+            try:
+                os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+                tmp_path = self.cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"保存DNS缓存失败: {str(e)}")
+
+    def _get_cached(self, host: str) -> Optional[Dict]:
+        """获取未过期的缓存条目（调用方需持有锁）"""
+        entry = self._entries.get(host)
+        if entry and entry.get("expires_at", 0) > time.time():
+            return entry
+        return None
+
+    def _query(self, host: str) -> Tuple[str, Optional[List[str]]]:
+        """
+        执行一次解析
+
+        Returns:
+            (状态, IP列表)：状态为 ok / nxdomain / error
+        """
+        try:
+            infos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            if addresses:
+                return "ok", addresses
+            return "nxdomain", None
+        except socket.gaierror as e:
+            if e.errno in NEGATIVE_ERRORS:
+                return "nxdomain", None
+            return "error", None
+        except Exception:
+            return "error", None
+
+    def _store(self, host: str, status: str, addresses: Optional[List[str]]):
+        """保存解析结果（临时错误不缓存）"""
+        with self._lock:
+            if status == "ok":
+                self.stats["resolved"] += 1
+                ttl = self.ttl
+            elif status == "nxdomain":
+                self.stats["nxdomain"] += 1
+                ttl = self.negative_ttl
+            else:
+                self.stats["errors"] += 1
+                return
+            self._entries[host] = {
+                "addresses": addresses,
+                "expires_at": time.time() + ttl,
+            }
+            self._dirty = True
+
+    def resolve_many(self, hosts: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        """
+        并发解析多个域名
+
+        Args:
+            hosts: 域名或IP列表（可重复）
+
+        Returns:
+            域名 -> IP列表，确定无法解析的域名对应None；
+            临时错误或超时的域名不在结果中，调用方应按原样保留
+        """
+        results: Dict[str, Optional[List[str]]] = {}
+        pending: List[str] = []
+
+        with self._lock:
+            for host in dict.fromkeys(_normalize_host(h) for h in hosts):
+                if not host:
+                    continue
+                if _is_ip_address(host):
+                    results[host] = [host]
+                    continue
+                entry = self._get_cached(host)
+                if entry is not None:
+                    self.stats["cache_hits"] += 1
+                    results[host] = entry["addresses"]
+                else:
+                    pending.append(host)
+
+        if not pending:
+            return results
+
+        cached_count = len(results)
+        start_time = time.time()
+        workers = max(1, min(self.max_workers, len(pending)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dns")
+        try:
+            futures = {executor.submit(self._query, host): host for host in pending}
+            # 每个线程依次处理多个域名，总等待时间按批次数放宽
+            deadline = self.timeout * math.ceil(len(pending) / workers)
+            done, not_done = wait(futures, timeout=deadline)
+
+            for future in done:
+                host = futures[future]
+                status, addresses = future.result()
+                self._store(host, status, addresses)
+                if status != "error":
+                    results[host] = addresses
+
+            if not_done:
+                with self._lock:
+                    self.stats["errors"] += len(not_done)
+                self.logger.warning(f"⚠️ {len(not_done)} 个域名解析超时，保留对应节点")
+        finally:
+            # 不等待仍未返回的解析线程
+            executor.shutdown(wait=False)
+
+        self.logger.info(
+            f"🌐 解析 {len(pending)} 个域名，耗时 {time.time() - start_time:.2f}秒 "
+            f"(缓存命中 {cached_count} 个)"
+        )
+        return results
+
+    def lookup(self, host: str) -> Optional[str]:
+        """
+        从缓存获取域名的第一个IP（不发起解析）
+
+        Returns:
+            IP地址，未缓存或无法解析时返回None
+        """
+        host = _normalize_host(host)
+        if _is_ip_address(host):
+            return host
+
+        with self._lock:
+            entry = self._get_cached(host)
+        if entry and entry["addresses"]:
+            return entry["addresses"][0]
+        return None
+
+    def filter_resolvable(
+        self, items: List[T], get_host: Callable[[T], Optional[str]]
+    ) -> Tuple[List[T], List[T]]:
+        """
+        批量解析所有条目的域名，剔除域名无法解析的条目
+
+        无法提取域名或解析临时失败的条目保留，交给后续测试处理。
+
+        Args:
+            items: 节点列表（URI字符串或代理配置字典）
+            get_host: 从条目中提取域名的函数
+
+        Returns:
+            (保留的条目, 剔除的条目)，均保持原有顺序
+        """
+        hosts = []
+        for item in items:
+            try:
+                hosts.append(_normalize_host(get_host(item)))
+            except Exception:
+                hosts.append("")
+
+        results = self.resolve_many(host for host in hosts if host)
+
+        kept, dropped = [], []
+        for item, host in zip(items, hosts):
+            if host and host in results and results[host] is None:
+                dropped.append(item)
+            else:
+                kept.append(item)
+
+        if dropped:
+            self.logger.info(
+                f"🚫 剔除 {len(dropped)} 个域名无法解析的节点，剩余 {len(kept)} 个"
+            )
+        self.flush()
+        return kept, dropped
+
+    def get_stats(self) -> Dict:
+        """获取解析统计"""
+        with self._lock:
+            return dict(self.stats, cached=len(self._entries))
+
+
+# 全局单例实例
+_dns_resolver = None
+_dns_resolver_lock = threading.Lock()
+
+
+def get_dns_resolver() -> DnsResolver:
+    """获取域名解析器单例实例"""
+    global _dns_resolver
+    if _dns_resolver is None:
+        with _dns_resolver_lock:
+            if _dns_resolver is None:
+                _dns_resolver = DnsResolver()
+    return _dns_resolver
@@ -277,7 +277,7 @@ class FileHandler:
                     line = line.strip()
                     if line.startswith('# ') and not line.startswith('===') and not line.startswith('各网站'):
                         website_name = line.replace('#', '').strip()
-                    elif line.startswith('https://') and not line.startswith('#') and website_name:
+                    elif line.startswith(('http://', 'https://')) and website_name:
                         article_url = line.strip()
                         if website_name and article_url:
                             articles[website_name] = article_url
@@ -323,7 +323,7 @@ class FileHandler:
                     elif line.startswith('# 文章链接:'):
                         if '文章链接: None' not in line:
                             article_url = line.split('文章链接:')[1].strip()
-                    elif line.startswith('https://') and not line.startswith('#'):
+                    elif line.startswith(('http://', 'https://')):
                         links.append(line)
                 
                 if website_name and article_url and links:
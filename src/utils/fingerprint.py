@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+节点指纹
+按协议提取决定连接行为的字段（地址、凭据、传输配置）计算规范身份，忽略备注和
+客户端指纹等不影响连接的参数；同一服务器无论以Base64、SIP002还是不同备注出现，
+都得到相同的指纹，去重时用哈希索引一次遍历完成并按来源统计重复数
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Union
+
+from src.utils.node import NODE_CACHE_SIZE, Node, parse_node
+
+# 始终使用TLS的协议（URI中省略 security 时按tls处理）
+TLS_PROTOCOLS = ("trojan", "hysteria", "hysteria2", "tuic")
+
+# 路径为空等同于 "/" 的传输方式
+PATH_NETWORKS = ("ws", "httpupgrade", "h2", "http")
+
+# 影响连接行为的协议参数（其余参数如 fp、alpn、insecure 不参与指纹）
+IDENTITY_PARAMS = (
+    "aid",
+    "flow",
+    "encryption",
+    "pbk",
+    "sid",
+    "serviceName",
+    "mode",
+    "headerType",
+    "plugin",
+    "protocol",
+    "protoparam",
+    "obfs",
+    "obfsparam",
+    "obfs-password",
+)
+
+
+def node_identity(node: Node) -> str:
+    """
+    计算节点的规范身份字符串
+
+    Args:
+        node: 解析后的节点
+
+    Returns:
+        由协议、地址、凭据和传输配置组成的字符串
+    """
+    security = node.security.lower()
+    if not security and node.protocol in TLS_PROTOCOLS:
+        security = "tls"
+
+    network = node.network.lower()
+    path = node.path
+    if network in PATH_NETWORKS and not path:
+        path = "/"
+
+    # 未指定SNI时客户端使用Host头或服务器地址
+    sni = ""
+    if security:
+        sni = (node.sni or node.host_header or node.host).lower()
+
+    params = [
+        f"{key}={node.params[key]}"
+        for key in IDENTITY_PARAMS
+        if node.params.get(key) not in (None, "")
+        and not (key == "aid" and node.params[key] == "0")
+    ]
+
+    return "\x1f".join(
+        [
+            node.protocol,
+            node.host,
+            str(node.port),
+            node.credential,
+            node.method.lower(),
+            network,
+            path,
+            node.host_header.lower(),
+            security,
+            sni,
+            *params,
+        ]
+    )
+
+
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def _uri_fingerprint(uri: str) -> Optional[str]:
+    node = parse_node(uri)
+    return node_fingerprint(node) if node else None
+
+
+def node_fingerprint(node: Union[str, Node]) -> Optional[str]:
+    """
+    计算节点指纹
+
+    Args:
+        node: 节点URI或解析后的节点
+
+    Returns:
+        32位十六进制指纹，无法解析时返回None
+    """
+    if isinstance(node, str):
+        return _uri_fingerprint(node.strip())
+    return hashlib.blake2b(
+        node_identity(node).encode("utf-8", errors="ignore"), digest_size=16
+    ).hexdigest()
+
+
+class NodeDeduplicator:
+    """
+    基于指纹哈希索引的节点去重器
+
+    可以分多次、按不同来源添加节点，每个指纹只保留第一次出现的节点，
+    并记录每个来源贡献的重复数以及重复节点最先出现的来源。
+    """
+
+    def __init__(self):
+        # 指纹 -> 首次出现的来源
+        self._index: Dict[str, str] = {}
+        self.nodes: List[str] = []
+        # 来源 -> {"total", "unique", "duplicates", "invalid", "duplicate_of": {来源: 数量}}
+        self.sources: Dict[str, Dict] = {}
+
+    def _source_stats(self, source: str) -> Dict:
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = {"total": 0, "unique": 0, "duplicates": 0, "invalid": 0, "duplicate_of": {}}
+            self.sources[source] = stats
+        return stats
+
+    def add(self, node: str, source: str = "") -> bool:
+        """
+        添加节点
+
+        Args:
+            node: 节点URI
+            source: 来源（网站、订阅链接等）
+
+        Returns:
+            是否为新节点（无法解析的节点返回False）
+        """
+        stats = self._source_stats(source)
+        stats["total"] += 1
+
+        node = node.strip()
+        fingerprint = node_fingerprint(node) if node else None
+        if fingerprint is None:
+            stats["invalid"] += 1
+            return False
+
+        first_source = self._index.get(fingerprint)
+        if first_source is not None:
+            stats["duplicates"] += 1
+            stats["duplicate_of"][first_source] = stats["duplicate_of"].get(first_source, 0) + 1
+            return False
+
+        self._index[fingerprint] = source
+        self.nodes.append(node)
+        stats["unique"] += 1
+        return True
+
+    def add_many(self, nodes: Iterable[str], source: str = "") -> List[str]:
+        """
+        批量添加节点
+
+        Returns:
+            本次新增的节点（保持原有顺序）
+        """
+        return [node.strip() for node in nodes if self.add(node, source)]
+
+    def get_report(self) -> Dict:
+        """获取去重报告"""
+        return {
+            "total": sum(stats["total"] for stats in self.sources.values()),
+            "unique": len(self.nodes),
+            "duplicates": sum(stats["duplicates"] for stats in self.sources.values()),
+            "invalid": sum(stats["invalid"] for stats in self.sources.values()),
+            "sources": self.sources,
+        }
+
+    def format_report(self, names: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        生成按重复数排序的来源报告（只包含有重复或无效节点的来源）
+
+        Args:
+            names: 来源 -> 显示名称
+        """
+        names = names or {}
+        lines = []
+        for source, stats in sorted(
+            self.sources.items(), key=lambda item: item[1]["duplicates"], reverse=True
+        ):
+            if not stats["duplicates"] and not stats["invalid"]:
+                continue
+            line = (
+                f"{names.get(source, source) or '未知来源'}: {stats['total']} 个节点，"
+                f"重复 {stats['duplicates']} 个"
+            )
+            if stats["invalid"]:
+                line += f"，无效 {stats['invalid']} 个"
+            overlaps = [
+                f"{names.get(first, first) or '未知来源'} {count}"
+                for first, count in sorted(
+                    stats["duplicate_of"].items(), key=lambda item: item[1], reverse=True
+                )
+            ]
+            if overlaps:
+                line += f"（与 {', '.join(overlaps)} 重复）"
+            lines.append(line)
+        return lines
+
+
+def deduplicate_nodes(nodes: Iterable[str]) -> List[str]:
+    """按指纹去重节点列表（保持首次出现的顺序，丢弃无法解析的节点）"""
+    return NodeDeduplicator().add_many(nodes)
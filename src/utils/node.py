@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一节点模型
+节点URI在进入流程时解析一次为 Node，去重、地区识别、Clash转换和测速都直接使用解析结果，
+不再各自解码Base64和拆分字符串；Node 可以序列化回规范URI
+"""
+
+import base64
+import binascii
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, quote, unquote, urlencode
+
+# 协议别名
+PROTOCOL_ALIASES = {"hy2": "hysteria2", "socks": "socks5", "shadowsocks": "ss"}
+
+# 支持解析的协议
+SUPPORTED_PROTOCOLS = (
+    "vmess",
+    "vless",
+    "trojan",
+    "ss",
+    "ssr",
+    "hysteria",
+    "hysteria2",
+    "tuic",
+    "socks5",
+)
+
+# 解析结果缓存的最大条目数
+NODE_CACHE_SIZE = 65536
+
+# 映射到 Node 字段的通用查询参数
+TYPED_PARAMS = ("type", "security", "sni", "host", "path")
+
+
+def _b64decode(text: str) -> str:
+    """
+    解码Base64文本（兼容URL安全字符集和缺失的padding）
+
+    Raises:
+        ValueError: 内容不是有效的Base64或UTF-8
+    """
+    text = "".join(text.split())
+    text += "=" * (-len(text) % 4)
+    try:
+        return base64.urlsafe_b64decode(
+            text.replace("+", "-").replace("/", "_")
+        ).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Base64解码失败: {str(e)}")
+
+
+def _b64encode(text: str) -> str:
+    """Base64编码（URL安全字符集，不带padding）"""
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _split_host_port(netloc: str):
+    """
+    拆分 host:port（支持IPv6方括号格式）
+
+    Raises:
+        ValueError: 缺少端口或端口无效
+    """
+    if netloc.startswith("["):
+        host, _, rest = netloc[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+    else:
+        host, _, port = netloc.rpartition(":")
+    port = port.strip().rstrip("/")
+    if not host or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"无效的地址: {netloc}")
+    return host, int(port)
+
+
+def _quote_remark(remark: str) -> str:
+    """编码备注中会破坏URI或按行/空白分割的字符，其余字符（含中文和emoji）保持原样"""
+    return "".join(
+        quote(char, safe="") if char in "%#" or char.isspace() or not char.isprintable() else char
+        for char in remark
+    )
+
+
+def _format_host(host: str) -> str:
+    """IPv6地址加方括号"""
+    return f"[{host}]" if ":" in host else host
+
+
+class Node:
+    """
+    解析后的节点
+
+    parse_node 的结果会被缓存并在各处共享，不要修改实例字段。
+    """
+
+    __slots__ = (
+        "protocol",  # 协议（vmess/vless/trojan/ss/ssr/hysteria/hysteria2/tuic/socks5）
+        "host",  # 服务器地址
+        "port",  # 端口
+        "credential",  # UUID或密码
+        "method",  # 加密方式（ss/ssr的cipher、vmess的scy）
+        "network",  # 传输方式（tcp/ws/grpc/h2...）
+        "path",  # 传输路径（ws路径、grpc服务名）
+        "host_header",  # 传输层Host头
+        "security",  # 传输层安全（""/tls/reality）
+        "sni",  # TLS服务器名
+        "remark",  # 备注（节点名称）
+        "params",  # 其余协议参数
+        "uri",  # 原始URI
+        "_canonical",  # 规范URI缓存
+    )
+
+    def __init__(
+        self,
+        protocol: str,
+        host: str,
+        port: int,
+        credential: str = "",
+        method: str = "",
+        network: str = "tcp",
+        path: str = "",
+        host_header: str = "",
+        security: str = "",
+        sni: str = "",
+        remark: str = "",
+        params: Optional[Dict[str, str]] = None,
+        uri: str = "",
+    ):
+        self.protocol = protocol
+        self.host = host.strip().strip("[]").lower()
+        self.port = port
+        self.credential = credential
+        self.method = method
+        self.network = network or "tcp"
+        self.path = path
+        self.host_header = host_header
+        self.security = "" if security == "none" else security
+        self.sni = sni
+        self.remark = remark
+        self.params = params or {}
+        self.uri = uri
+        self._canonical = None
+
+    def __repr__(self) -> str:
+        return f"Node({self.protocol}://{self.endpoint} {self.remark!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.to_uri() == other.to_uri()
+
+    def __hash__(self) -> int:
+        return hash(self.to_uri())
+
+    @property
+    def endpoint(self) -> str:
+        """server:port"""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def tls(self) -> bool:
+        """是否启用TLS（含reality）"""
+        return self.security in ("tls", "reality")
+
+    def to_uri(self) -> str:
+        """
+        序列化为规范URI
+
+        协议名小写、查询参数按名称排序、备注只编码空白和URI分隔字符，
+        相同配置的节点无论原始写法如何都得到相同的URI。
+        """
+        if self._canonical is None:
+            if self.protocol == "vmess":
+                self._canonical = self._vmess_uri()
+            elif self.protocol == "ss":
+                self._canonical = self._ss_uri()
+            elif self.protocol == "ssr":
+                self._canonical = self._ssr_uri()
+            else:
+                self._canonical = self._standard_uri()
+        return self._canonical
+
+    def _query(self) -> Dict[str, str]:
+        """合并通用字段和其余参数"""
+        query = dict(self.params)
+        if self.network != "tcp" or self.protocol == "vless":
+            query["type"] = self.network
+        if self.security:
+            query["security"] = self.security
+        if self.sni:
+            query["sni"] = self.sni
+        if self.host_header:
+            query["host"] = self.host_header
+        if self.path:
+            query["path"] = self.path
+        return dict(sorted(query.items()))
+
+    def _suffix(self, query: Dict[str, str]) -> str:
+        """查询参数和备注部分"""
+        suffix = ""
+        if query:
+            suffix += "?" + urlencode(query, quote_via=quote, safe="/:@,;")
+        if self.remark:
+            suffix += "#" + _quote_remark(self.remark)
+        return suffix
+
+    def _standard_uri(self) -> str:
+        userinfo = f"{quote(self.credential, safe=':')}@" if self.credential else ""
+        return (
+            f"{self.protocol}://{userinfo}{_format_host(self.host)}:{self.port}"
+            + self._suffix(self._query())
+        )
+
+    def _vmess_uri(self) -> str:
+        config = {
+            "v": "2",
+            "ps": self.remark,
+            "add": self.host,
+            "port": str(self.port),
+            "id": self.credential,
+            "aid": self.params.get("aid", "0"),
+            "scy": self.method or "auto",
+            "net": self.network,
+            "type": self.params.get("type", "none"),
+            "host": self.host_header,
+            "path": self.path,
+            "tls": self.security,
+            "sni": self.sni,
+        }
+        for key, value in sorted(self.params.items()):
+            config.setdefault(key, value)
+        payload = json.dumps(config, ensure_ascii=False, separators=(",", ":"))
+        return "vmess://" + base64.b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _ss_uri(self) -> str:
+        userinfo = _b64encode(f"{self.method}:{self.credential}")
+        return f"ss://{userinfo}@{_format_host(self.host)}:{self.port}" + self._suffix(
+            self._query()
+        )
+
+    def _ssr_uri(self) -> str:
+        params = dict(self.params)
+        protocol = params.pop("protocol", "origin")
+        obfs = params.pop("obfs", "plain")
+        query = {key: _b64encode(value) for key, value in sorted(params.items())}
+        if self.remark:
+            query["remarks"] = _b64encode(self.remark)
+        body = (
+            f"{self.host}:{self.port}:{protocol}:{self.method}:{obfs}:"
+            f"{_b64encode(self.credential)}"
+        )
+        if query:
+            body += "/?" + "&".join(f"{key}={value}" for key, value in query.items())
+        return "ssr://" + _b64encode(body)
+
+    @classmethod
+    def from_clash(cls, proxy: Dict[str, Any]) -> Optional["Node"]:
+        """
+        从Clash代理配置创建节点
+
+        Returns:
+            节点，类型不支持或缺少必要字段时返回None
+        """
+        protocol = PROTOCOL_ALIASES.get(
+            str(proxy.get("type", "")).lower(), str(proxy.get("type", "")).lower()
+        )
+        if protocol not in SUPPORTED_PROTOCOLS:
+            return None
+
+        host = str(proxy.get("server", "")).strip()
+        try:
+            port = int(proxy.get("port", 0))
+        except (TypeError, ValueError):
+            return None
+        if not host or not 0 < port < 65536:
+            return None
+
+        network = proxy.get("network") or "tcp"
+        ws_opts = proxy.get("ws-opts") or {}
+        grpc_opts = proxy.get("grpc-opts") or {}
+        reality_opts = proxy.get("reality-opts") or {}
+
+        path = ws_opts.get("path") or proxy.get("ws-path") or proxy.get("path") or ""
+        host_header = (ws_opts.get("headers") or {}).get("Host", "")
+        if network == "grpc":
+            path = grpc_opts.get("grpc-service-name", "")
+
+        if reality_opts:
+            security = "reality"
+        elif proxy.get("tls") or protocol in ("trojan", "hysteria", "hysteria2", "tuic"):
+            security = "tls"
+        else:
+            security = proxy.get("security", "") or ""
+
+        params: Dict[str, str] = {}
+        credential = str(proxy.get("uuid") or proxy.get("password") or proxy.get("auth") or "")
+        method = ""
+
+        if protocol == "vmess":
+            method = proxy.get("cipher", "auto")
+            params["aid"] = str(proxy.get("alterId", 0))
+        elif protocol in ("ss", "ssr"):
+            method = proxy.get("cipher", proxy.get("method", ""))
+            credential = str(proxy.get("password", ""))
+            if protocol == "ssr":
+                params["protocol"] = proxy.get("protocol", "origin")
+                params["obfs"] = proxy.get("obfs", "plain")
+                if proxy.get("obfs-param"):
+                    params["obfsparam"] = proxy["obfs-param"]
+                if proxy.get("protocol-param"):
+                    params["protoparam"] = proxy["protocol-param"]
+            elif proxy.get("plugin"):
+                plugin_opts = proxy.get("plugin-opts") or ""
+                if isinstance(plugin_opts, dict):
+                    plugin_opts = ";".join(f"{k}={v}" for k, v in plugin_opts.items())
+                params["plugin"] = ";".join(filter(None, [proxy["plugin"], plugin_opts]))
+        elif protocol == "socks5":
+            if proxy.get("username"):
+                credential = f"{proxy['username']}:{proxy.get('password', '')}"
+            else:
+                credential = ""
+        elif protocol == "tuic" and proxy.get("uuid"):
+            credential = f"{proxy['uuid']}:{proxy.get('password', '')}"
+
+        if proxy.get("flow"):
+            params["flow"] = proxy["flow"]
+        fingerprint = proxy.get("client-fingerprint") or proxy.get("fp")
+        if fingerprint:
+            params["fp"] = fingerprint
+        if reality_opts.get("public-key"):
+            params["pbk"] = reality_opts["public-key"]
+        if reality_opts.get("short-id"):
+            params["sid"] = reality_opts["short-id"]
+        if proxy.get("skip-cert-verify"):
+            params["insecure"] = "1"
+        for key in ("obfs", "obfs-password", "alpn"):
+            if protocol in ("hysteria", "hysteria2") and proxy.get(key):
+                value = proxy[key]
+                params[key] = ",".join(value) if isinstance(value, list) else str(value)
+
+        return cls(
+            protocol=protocol,
+            host=host,
+            port=port,
+            credential=credential,
+            method=method,
+            network=network,
+            path=path,
+            host_header=host_header,
+            security=security,
+            sni=proxy.get("servername") or proxy.get("sni") or "",
+            remark=str(proxy.get("name", "")),
+            params=params,
+        )
+
+
+def _parse_standard(protocol: str, body: str, uri: str) -> Node:
+    """解析 协议://凭据@地址:端口?参数#备注 格式"""
+    body, _, fragment = body.partition("#")
+    body, _, query = body.partition("?")
+    userinfo, _, netloc = body.rpartition("@")
+    netloc = netloc.split("/", 1)[0]
+    host, port = _split_host_port(netloc)
+
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    typed = {key: params.pop(key, "") for key in TYPED_PARAMS}
+    credential = unquote(userinfo)
+
+    # socks5 的凭据可能是Base64编码的 user:pass
+    if protocol == "socks5" and credential and ":" not in credential:
+        try:
+            credential = _b64decode(credential)
+        except ValueError:
+            pass
+
+    return Node(
+        protocol=protocol,
+        host=host,
+        port=port,
+        credential=credential,
+        network=typed["type"] or "tcp",
+        path=typed["path"],
+        host_header=typed["host"],
+        security=typed["security"],
+        sni=typed["sni"] or params.pop("peer", ""),
+        remark=unquote(fragment),
+        params=params,
+        uri=uri,
+    )
+
+
+def _parse_vmess(body: str, uri: str) -> Node:
+    """解析 vmess://base64(json) 格式（兼容标准URI格式）"""
+    encoded, _, fragment = body.partition("#")
+    try:
+        config = json.loads(_b64decode(encoded))
+    except ValueError:
+        return _parse_standard("vmess", body, uri)
+    if not isinstance(config, dict):
+        raise ValueError("VMess配置不是JSON对象")
+
+    host = str(config.get("add", "")).strip()
+    port = int(str(config.get("port", "")).strip() or 0)
+    if not host or not 0 < port < 65536:
+        raise ValueError("VMess缺少地址或端口")
+
+    params = {
+        key: str(value)
+        for key, value in config.items()
+        if key not in ("v", "ps", "add", "port", "id", "scy", "net", "host", "path", "tls", "sni")
+        and value not in (None, "")
+    }
+    params.setdefault("aid", "0")
+    return Node(
+        protocol="vmess",
+        host=host,
+        port=port,
+        credential=str(config.get("id", "")),
+        method=str(config.get("scy") or "auto"),
+        network=str(config.get("net") or "tcp"),
+        path=str(config.get("path") or ""),
+        host_header=str(config.get("host") or ""),
+        security=str(config.get("tls") or ""),
+        sni=str(config.get("sni") or ""),
+        remark=str(config.get("ps") or unquote(fragment)),
+        params=params,
+        uri=uri,
+    )
+
+
+def _parse_ss(body: str, uri: str) -> Node:
+    """解析 ss:// 的SIP002、明文凭据和整体Base64三种格式"""
+    body, _, fragment = body.partition("#")
+    remark = unquote(fragment)
+
+    if "@" not in body:
+        # 整体Base64：base64(method:password@host:port) 或 base64(json)
+        encoded, _, query = body.partition("?")
+        decoded = _b64decode(encoded.rstrip("/"))
+        if decoded.lstrip().startswith("{"):
+            config = json.loads(decoded)
+            return Node(
+                protocol="ss",
+                host=str(config.get("add") or config.get("server", "")),
+                port=int(config.get("port", 0)),
+                credential=str(config.get("password", "")),
+                method=str(config.get("method", "aes-256-gcm")),
+                remark=str(config.get("ps") or remark),
+                uri=uri,
+            )
+        body = decoded + (f"?{query}" if query else "")
+
+    node = _parse_standard("ss", body, uri)
+    userinfo = node.credential
+    if ":" in userinfo:
+        method, password = userinfo.split(":", 1)
+    else:
+        try:
+            method, password = _b64decode(userinfo).split(":", 1)
+        except ValueError:
+            # ss://uuid@host:port 的非标准写法
+            if len(userinfo) != 36 or userinfo.count("-") != 4:
+                raise
+            method, password = "aes-256-gcm", userinfo
+
+    node.method = method
+    node.credential = password
+    node.remark = remark
+    return node
+
+
+def _parse_ssr(body: str, uri: str) -> Node:
+    """解析 ssr://base64(host:port:protocol:method:obfs:base64(password)/?params)"""
+    decoded = _b64decode(body.split("#", 1)[0])
+    main, _, query = decoded.partition("/?")
+    host_port, protocol, method, obfs, password = main.rsplit(":", 4)
+    host, port = _split_host_port(host_port)
+
+    params = {"protocol": protocol, "obfs": obfs}
+    remark = ""
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        try:
+            value = _b64decode(value)
+        except ValueError:
+            pass
+        if key == "remarks":
+            remark = value
+        elif key != "group":
+            params[key] = value
+
+    return Node(
+        protocol="ssr",
+        host=host,
+        port=port,
+        credential=_b64decode(password),
+        method=method,
+        remark=remark,
+        params=params,
+        uri=uri,
+    )
+
+
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def parse_node(uri: str) -> Optional[Node]:
+    """
+    解析节点URI（结果按URI缓存，同一节点在流程中只解析一次）
+
+    Args:
+        uri: 节点URI
+
+    Returns:
+        节点，协议不支持或格式无效时返回None
+    """
+    if not uri or "://" not in uri:
+        return None
+
+    scheme, _, body = uri.strip().partition("://")
+    protocol = PROTOCOL_ALIASES.get(scheme.lower(), scheme.lower())
+    if protocol not in SUPPORTED_PROTOCOLS:
+        return None
+
+    try:
+        if protocol == "vmess":
+            return _parse_vmess(body, uri)
+        if protocol == "ss":
+            return _parse_ss(body, uri)
+        if protocol == "ssr":
+            return _parse_ssr(body, uri)
+        return _parse_standard(protocol, body, uri)
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def canonical_uri(uri: str) -> Optional[str]:
+    """获取节点的规范URI，无法解析时返回None"""
+    node = parse_node(uri)
+    return node.to_uri() if node else None
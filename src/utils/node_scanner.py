@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+节点URI扫描器
+一次扫描文本找出所有支持协议的节点链接，结果与按协议逐个 re.findall 完全一致
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+# 可转换为扫描器的节点模式，如 r"(vmess://[^\s\n\r]+)" 或 r'ss://[^\s<>"]+'
+SIMPLE_NODE_PATTERN = re.compile(r"^\(?([A-Za-z][A-Za-z0-9+.-]*)://(\[\^[^\]]*\])\+\)?$")
+
+
+class NodeScanner:
+    """
+    单次扫描的节点提取器
+
+    按协议逐个 findall 时，每个协议独立地从左到右匹配、互不重叠，
+    较短的协议名会在较长的协议名内部被匹配到（如 vmess:// 中的 ss://）。
+    扫描器只遍历一次文本中的 "://"，检查其前面是哪些协议名，
+    再按协议分别模拟 findall 的不重叠规则，输出顺序和内容保持一致：
+    先按协议列表顺序分组，组内按出现位置排序。
+    """
+
+    SEPARATOR = "://"
+
+    def __init__(self, schemes: Sequence[str], body_class: str = r"[^\s\n\r]"):
+        """
+        Args:
+            schemes: 协议名列表（决定输出分组顺序）
+            body_class: 节点内容允许的字符集（正则字符类），遇到集合外字符时节点结束
+        """
+        self.schemes = list(schemes)
+        self.body_class = body_class
+        self._body_re = re.compile(body_class + "+", re.IGNORECASE)
+
+        # 按协议名长度分组，同一长度的协议合并为一个正则，每个协议一个捕获组
+        self._matchers: Dict[int, Tuple[re.Pattern, List[int]]] = {}
+        for length in sorted({len(scheme) for scheme in self.schemes}, reverse=True):
+            indexes = [i for i, scheme in enumerate(self.schemes) if len(scheme) == length]
+            pattern = re.compile(
+                "|".join(f"({re.escape(self.schemes[i])})" for i in indexes),
+                re.IGNORECASE,
+            )
+            self._matchers[length] = (pattern, indexes)
+
+        # "://" 前一个字符 -> 可能以该字符结尾的协议名长度（按忽略大小写规则计算）
+        self._lengths_by_char: Dict[str, List[int]] = {}
+
+    def _lengths_ending_with(self, char: str) -> List[int]:
+        """获取可能以指定字符结尾的协议名长度"""
+        lengths = self._lengths_by_char.get(char)
+        if lengths is None:
+            lengths = [
+                length
+                for length in self._matchers
+                if any(
+                    re.fullmatch(re.escape(self.schemes[i][-1]), char, re.IGNORECASE)
+                    for i in self._matchers[length][1]
+                )
+            ]
+            self._lengths_by_char[char] = lengths
+        return lengths
+
+    @classmethod
+    def from_patterns(cls, patterns: Sequence[str]) -> "NodeScanner":
+        """
+        根据节点模式列表创建扫描器
+
+        Args:
+            patterns: 形如 "协议://[^...]+" 的正则列表，所有模式的字符类必须相同
+
+        Raises:
+            ValueError: 模式不是简单的 "协议://字符类+" 形式，或字符类不一致
+        """
+        schemes = []
+        body_classes = set()
+        for pattern in patterns:
+            match = SIMPLE_NODE_PATTERN.match(pattern)
+            if not match:
+                raise ValueError(f"无法转换为扫描器的节点模式: {pattern}")
+            schemes.append(match.group(1))
+            body_classes.add(match.group(2))
+
+        if len(body_classes) > 1:
+            raise ValueError(f"节点模式的字符类不一致: {sorted(body_classes)}")
+
+        return cls(schemes, body_classes.pop() if body_classes else r"[^\s\n\r]")
+
+    def scan(self, text: str) -> List[str]:
+        """
+        提取文本中的所有节点链接
+
+        Args:
+            text: 页面或订阅内容
+
+        Returns:
+            节点链接列表（与按协议顺序逐个 findall 后拼接的结果相同，未去重）
+        """
+        groups: List[List[str]] = [[] for _ in self.schemes]
+        last_end = [0] * len(self.schemes)
+        match_body = self._body_re.match
+        find = text.find
+        separator = self.SEPARATOR
+
+        position = find(separator)
+        while position != -1:
+            lengths = self._lengths_ending_with(text[position - 1]) if position else []
+            body = None
+            for length in lengths:
+                start = position - length
+                if start < 0:
+                    continue
+                pattern, indexes = self._matchers[length]
+                scheme_match = pattern.fullmatch(text, start, position)
+                if scheme_match is None:
+                    continue
+
+                index = indexes[scheme_match.lastindex - 1]
+                # findall 从上一个匹配的结尾继续查找，重叠的位置不会再次匹配
+                if start < last_end[index]:
+                    continue
+
+                if body is None:
+                    body = match_body(text, position + len(separator)) or False
+                if not body:
+                    break
+
+                groups[index].append(text[start : body.end()])
+                last_end[index] = body.end()
+
+            position = find(separator, position + 1)
+
+        return [node for group in groups for node in group]
@@ -5,9 +5,8 @@
 """
 
 import re
-import base64
-import json
 from .logger import get_logger
+from .node import parse_node
 
 class RegionDetector:
     """节点地区识别器"""
@@ -99,102 +98,15 @@ class RegionDetector:
     
     def extract_host_from_node(self, node):
         """从节点中提取主机名"""
-        try:
-            if node.startswith('vmess://'):
-                return self.extract_vmess_host(node)
-            elif node.startswith('vless://'):
-                return self.extract_vless_host(node)
-            elif node.startswith('trojan://'):
-                return self.extract_trojan_host(node)
-            elif node.startswith('hysteria2://') or node.startswith('hysteria://'):
-                return self.extract_hysteria_host(node)
-            elif node.startswith('ss://'):
-                return self.extract_ss_host(node)
-            else:
-                return None
-        except Exception as e:
-            self.logger.warning(f"提取主机名失败: {str(e)}")
-            return None
-    
-    def extract_vmess_host(self, node):
-        """从VMess节点提取主机名"""
-        try:
-            data = node[8:]  # 去掉 vmess://
-            decoded = json.loads(base64.b64decode(data + '==').decode('utf-8'))
-            return decoded.get('add', '')
-        except:
-            return ''
-    
-    def extract_vless_host(self, node):
-        """从VLESS节点提取主机名"""
-        try:
-            pattern = r'vless://([^@]+)@([^:]+):'
-            match = re.search(pattern, node)
-            return match.group(2) if match else ''
-        except:
-            return ''
-    
-    def extract_trojan_host(self, node):
-        """从Trojan节点提取主机名"""
-        try:
-            pattern = r'trojan://([^@]+)@([^:]+):'
-            match = re.search(pattern, node)
-            return match.group(2) if match else ''
-        except:
-            return ''
-    
-    def extract_hysteria_host(self, node):
-        """从Hysteria节点提取主机名"""
-        try:
-            pattern = r'hysteria2?://[^@]*@([^:]+):'
-            match = re.search(pattern, node)
-            return match.group(1) if match else ''
-        except:
-            return ''
-    
-    def extract_ss_host(self, node):
-        """从Shadowsocks节点提取主机名"""
-        try:
-            data = node[5:]  # 去掉 ss://
-            decoded = base64.b64decode(data).decode('utf-8')
-            parts = decoded.split('@')
-            if len(parts) >= 2:
-                host_port = parts[1].split(':')[0]
-                if ':' in host_port:
-                    host = host_port.rsplit(':', 1)[0]
-                    return host
-        except:
-            pass
-        
-        # 备用方法：正则提取
-        try:
-            pattern = r'ss://[^@]*@([^:]+):'
-            match = re.search(pattern, node)
-            return match.group(1) if match else ''
-        except:
-            return ''
+        parsed = parse_node(node)
+        return parsed.host if parsed else None
     
     def extract_remarks_from_node(self, node):
         """从节点中提取备注信息"""
-        try:
-            if node.startswith('vmess://'):
-                data = node[8:]  # 去掉 vmess://
-                decoded = json.loads(base64.b64decode(data + '==').decode('utf-8'))
-                return decoded.get('ps', '')
-            elif node.startswith('vless://'):
-                # VLESS格式: vless://uuid@host:port?name=remarks&...
-                pattern = r'name=([^&]+)'
-                match = re.search(pattern, node)
-                return match.group(1) if match else ''
-            elif node.startswith('trojan://'):
-                # Trojan格式: trojan://password@host:port?name=remarks&...
-                pattern = r'name=([^&]+)'
-                match = re.search(pattern, node)
-                return match.group(1) if match else ''
-            else:
-                return ''
-        except:
+        parsed = parse_node(node)
+        if not parsed:
             return ''
+        return parsed.remark or parsed.params.get('name', '')
     
     def contains_hk_keywords(self, text):
         """检查文本是否包含香港关键词"""
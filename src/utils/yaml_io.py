@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YAML读写
+统一使用 libyaml 实现的 CSafeLoader/CSafeDumper（不可用时回退到纯Python实现），
+并提供分块写出超大代理列表的流式写入，避免在内存中生成整份文档
+"""
+
+import os
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Optional
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+# 与项目中原有 yaml.dump 调用保持一致的输出格式
+DUMP_OPTIONS = {"allow_unicode": True, "default_flow_style": False}
+
+# 流式写入时每次序列化的代理数量
+STREAM_CHUNK_SIZE = 500
+
+
+def load(stream) -> Any:
+    """
+    解析YAML（字符串或文件对象）
+
+    Raises:
+        yaml.YAMLError: 内容不是有效的YAML
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_file(path: str) -> Any:
+    """读取YAML文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        return load(f)
+
+
+def dump(data: Any, stream: Optional[IO] = None, **kwargs) -> Optional[str]:
+    """
+    序列化为YAML
+
+    Args:
+        data: 数据
+        stream: 输出文件对象，为None时返回字符串
+        **kwargs: 覆盖默认的 yaml.dump 参数
+    """
+    options = dict(DUMP_OPTIONS, **kwargs)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **options)
+
+
+def dump_file(data: Any, path: str, **kwargs):
+    """写入YAML文件（自动创建目录）"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        dump(data, f, **kwargs)
+
+
+def dump_clash_config(
+    config: Dict[str, Any],
+    stream: IO,
+    proxies: Optional[Iterable[Dict[str, Any]]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+):
+    """
+    流式写出Clash配置
+
+    代理列表按块序列化后直接写入文件，输出与 dump(config) 完全一致（键按字母排序）。
+
+    Args:
+        config: Clash配置（可以不包含 proxies）
+        stream: 输出文件对象
+        proxies: 代理列表或迭代器，为None时使用 config["proxies"]
+        chunk_size: 每次序列化的代理数量
+    """
+    if proxies is None:
+        proxies = config.get("proxies", [])
+
+    keys = sorted(set(config) | {"proxies"})
+    for key in keys:
+        if key != "proxies":
+            dump({key: config[key]}, stream)
+            continue
+
+        iterator = iter(proxies)
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            dump({"proxies": []}, stream)
+            continue
+
+        stream.write("proxies:\n")
+        while chunk:
+            dump(chunk, stream)
+            chunk = list(islice(iterator, chunk_size))
+
+
+def dump_clash_config_file(
+    config: Dict[str, Any],
+    path: str,
+    proxies: Optional[Iterable[Dict[str, Any]]] = None,
+):
+    """流式写出Clash配置文件（自动创建目录）"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        dump_clash_config(config, f, proxies)